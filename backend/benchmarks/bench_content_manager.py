@@ -0,0 +1,85 @@
+"""
+Benchmark: Day3 lesson store, eager json.load vs. lazy memory-mapped index.
+
+Run from backend/:
+    uv run python benchmarks/bench_content_manager.py
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from Day3.content_manager import ContentManager, Lesson
+
+SIZES = [1_000, 20_000]
+LOOKUPS = 1_000
+
+
+def write_curriculum(path, size):
+    lessons = [{
+        "id": f"lesson_{i}",
+        "title": f"Lesson {i}",
+        "summary": f"Lesson {i} explains one idea in a few friendly sentences. " * 8,
+        "sample_question": f"Can you explain lesson {i} in your own words?",
+    } for i in range(size)]
+    path.write_text(json.dumps(lessons, indent=2))
+
+
+def eager_load(path):
+    """The original ContentManager.__init__, kept here as the baseline."""
+    with open(path) as f:
+        return {item["id"]: Lesson(**item) for item in json.load(f)}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def retained_kib(fn):
+    """Memory still allocated by whatever fn() returns (timed separately)."""
+    tracemalloc.start()
+    result = fn()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return retained / 1024
+
+
+def lazy_indexed(path):
+    content = ContentManager(str(path))
+    content.get_all_topics()
+    return content
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in SIZES:
+            path = Path(workdir) / f"lessons_{size}.json"
+            write_curriculum(path, size)
+            ids = [f"lesson_{(i * 7919) % size}" for i in range(LOOKUPS)]
+            print(f"{size} lessons ({path.stat().st_size / 1e6:.1f} MB)")
+
+            _, ms = timed(lambda path=path: eager_load(path))
+            print(f"  eager load:           {ms:8.1f} ms   {retained_kib(lambda path=path: eager_load(path)):7.0f} KiB retained")
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                content, construct_ms = timed(lambda path=path: ContentManager(str(path)))
+                _, index_ms = timed(content.get_all_topics)
+                kib = retained_kib(lambda path=path: lazy_indexed(path))
+            print(f"  lazy construct:       {construct_ms:8.3f} ms")
+            print(f"  lazy index (1st use): {index_ms:8.1f} ms   {kib:7.0f} KiB retained")
+
+            start = time.perf_counter()
+            for lesson_id in ids:
+                content.get_lesson(lesson_id)
+            print(f"  lazy get_lesson:      {(time.perf_counter() - start) / LOOKUPS * 1e6:8.1f} us/lookup")
+            content.close()
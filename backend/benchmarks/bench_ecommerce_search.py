@@ -0,0 +1,124 @@
+"""
+Benchmark: Day8 search_products, per-query linear scan vs. the preprocessed
+CatalogSearchIndex, on synthetic catalogs up to 100k products.
+
+Each query is a mix of keywords and category / color / price filters like
+the ones the voice agent sends. Results are checked against the scan: the
+index may only drop the scan's mid-word hits ("mug" inside "Ujxamug").
+
+Run from backend/:
+    uv run python benchmarks/bench_ecommerce_search.py
+"""
+
+import random
+import string
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from Day8.catalog_index import CatalogSearchIndex
+
+SIZES = [1_000, 10_000, 100_000]
+QUERIES = 200
+CATEGORIES = ["mug", "t-shirt", "hoodie", "cap", "tote bag", "water bottle", "notebook", "sticker"]
+COLORS = ["white", "black", "navy blue", "red", "grey", "green", "charcoal", "transparent"]
+
+
+def normalize(text):
+    return text.lower().replace("-", " ").replace(",", " ") if text else ""
+
+
+def linear_search(catalog, query="", category="", color="", max_price=None):
+    """The original search_products scan, kept here as the baseline."""
+    query_text, category_text, color_text = normalize(query), normalize(category), normalize(color)
+    keywords = query_text.split()
+    results = []
+    for product in catalog:
+        if category_text:
+            prod_cat = normalize(product.get("category", ""))
+            if category_text not in prod_cat and prod_cat not in category_text:
+                continue
+        if max_price is not None and product.get("price", 0) > max_price:
+            continue
+        if color_text and color_text not in normalize(product.get("color", "")):
+            continue
+        if keywords:
+            prod_text = normalize(f"{product.get('name', '')} {product.get('description', '')} "
+                                  f"{product.get('category', '')}")
+            if not all((w[:-1] if w.endswith("s") and len(w) > 3 else w) in prod_text for w in keywords):
+                continue
+        results.append(product)
+    return results
+
+
+def make_catalog(size, rng):
+    # Ending in a plain consonant, so "<word>s" is always a regular plural
+    vocab = ["".join(rng.choices(string.ascii_lowercase, k=6)) + rng.choice("bdgklmnprt")
+             for _ in range(max(50, size // 20))]
+    catalog = []
+    for i in range(size):
+        category = rng.choice(CATEGORIES)
+        words = rng.sample(vocab, 6)
+        catalog.append({
+            "id": f"p{i:06d}",
+            "name": f"{words[0].title()} {words[1].title()} {category.title()}",
+            "description": " ".join(words[2:]),
+            "price": rng.randrange(200, 5000, 50),
+            "category": category,
+            "color": rng.choice(COLORS),
+            "stock": 10,
+        })
+    return catalog, vocab
+
+
+def make_queries(vocab, rng):
+    queries = []
+    for _ in range(QUERIES):
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append({"query": f"{rng.choice(vocab)}s"})
+        elif kind < 0.7:
+            queries.append({"query": f"{rng.choice(vocab)} {rng.choice(CATEGORIES)}", "max_price": 2500})
+        else:
+            queries.append({"category": rng.choice(CATEGORIES), "color": rng.choice(COLORS),
+                            "query": rng.choice(vocab)})
+    return queries
+
+
+def time_per_query(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(**q)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'products':>10} {'linear ms/q':>12} {'index ms/q':>11} {'speedup':>8} {'build s':>8} {'index MB':>9} {'mid-word':>9}")
+    for size in SIZES:
+        catalog, vocab = make_catalog(size, rng)
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = CatalogSearchIndex(catalog)
+        build_s = time.perf_counter() - start
+        index_mb = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+
+        queries = make_queries(vocab, rng)
+        mid_word = 0
+        for q in queries[:30]:
+            found, scanned = index.search(**q), linear_search(catalog, **q)
+            assert {p["id"] for p in found} <= {p["id"] for p in scanned}, q
+            mid_word += len(scanned) - len(found)
+
+        linear_ms = time_per_query(lambda catalog=catalog, **q: linear_search(catalog, **q), queries)
+        index_ms = time_per_query(index.search, queries)
+        print(f"{size:>10} {linear_ms:>12.2f} {index_ms:>11.3f} {linear_ms / index_ms:>7.0f}x "
+              f"{build_s:>8.2f} {index_mb:>9.1f} {mid_word:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: Day4 FAQ lookup, first-substring scan vs. BM25 index.
+
+Run from backend/:
+    uv run python benchmarks/bench_faq_search.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from Day4.nykaa_database import FAQ_DATA, search_faq
+
+QUERIES = [
+    "how do I track my order",
+    "what are the delivery times",
+    "is there a free trial",
+    "do you have stores near me",
+    "I'm a makeup artist, how do I join PRO",
+    "are the products genuine",
+    "any discount coupons right now",
+    "skincare for acne",
+]
+ROUNDS = 5_000
+
+
+def substring_scan(question):
+    """The original find_faq_answer, kept here as the baseline."""
+    question = question.lower()
+    for faq in FAQ_DATA:
+        for keyword in faq.keywords:
+            if keyword in question:
+                return faq.answer
+    return None
+
+
+def bench(fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for query in QUERIES:
+            fn(query)
+    return (time.perf_counter() - start) / (ROUNDS * len(QUERIES)) * 1e6
+
+
+if __name__ == "__main__":
+    print(f"{len(FAQ_DATA)} FAQs, {len(QUERIES)} queries x {ROUNDS} rounds")
+    print(f"  substring scan: {bench(substring_scan):7.2f} us/query")
+    print(f"  BM25 top-3:     {bench(search_faq):7.2f} us/query")
+    print()
+    for query in QUERIES:
+        faq, score = search_faq(query, 1)[0]
+        old = substring_scan(query)
+        changed = "" if old == faq.answer else "   (substring scan picked a different FAQ)"
+        print(f"  {query!r:45} -> {faq.question} [{score:.2f}]{changed}")
@@ -0,0 +1,83 @@
+"""
+Benchmark: Day6 grocery search, linear scan vs. n-gram inverted index.
+
+Builds synthetic catalogs of increasing size where each query matches about
+the same number of products, then times both search paths.
+
+Run from backend/:
+    uv run python benchmarks/bench_grocery_search.py
+"""
+
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from Day6.catalog_index import ProductSearchIndex
+from Day6.grocery_database import ProductItem
+
+SIZES = [1_000, 10_000, 50_000]
+QUERIES = 200
+
+
+def linear_search(catalog, query):
+    """The original search_products scan, kept here as the baseline."""
+    query_lower = query.lower()
+    return [
+        p for p in catalog
+        if (query_lower in p.name.lower() or
+            query_lower in p.brand.lower() or
+            query_lower in p.category.lower() or
+            any(query_lower in tag.lower() for tag in p.tags) or
+            any(query_lower in kw.lower() for kw in p.keywords))
+    ]
+
+
+def make_catalog(size, rng):
+    vocab = ["".join(rng.choices(string.ascii_lowercase, k=7)) for _ in range(size // 2)]
+    catalog = []
+    for i in range(size):
+        a, b = rng.sample(vocab, 2)
+        catalog.append(ProductItem(
+            id=f"x{i:06d}",
+            name=f"{a.title()} {b.title()}",
+            category=rng.choice(["groceries", "snacks", "prepared_food"]),
+            price=round(rng.uniform(1, 20), 2),
+            brand=rng.choice(vocab).title(),
+            size="1 unit",
+            tags=[rng.choice(["vegan", "vegetarian", "dairy", "protein"])],
+            keywords=[a, b],
+        ))
+    return catalog, vocab
+
+
+def time_per_query(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'products':>10} {'linear us/q':>12} {'index us/q':>12} {'build s':>8}")
+    for size in SIZES:
+        catalog, vocab = make_catalog(size, rng)
+        start = time.perf_counter()
+        index = ProductSearchIndex(catalog)
+        build_s = time.perf_counter() - start
+
+        queries = rng.sample(vocab, QUERIES)
+        for q in queries[:20]:
+            assert {p.id for p in index.search(q)} == {p.id for p in linear_search(catalog, q)}
+
+        linear_us = time_per_query(lambda q, catalog=catalog: linear_search(catalog, q), queries)
+        index_us = time_per_query(index.search, queries)
+        print(f"{size:>10} {linear_us:>12.1f} {index_us:>12.1f} {build_s:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Load test: Day8 inventory reservations under thousands of concurrent buyers.
+
+Several processes share one inventory database (like LiveKit job
+processes on a worker). Each runs hundreds of simulated buyers as asyncio
+tasks, all going after a handful of scarce SKUs: reserve 1-3 units, "think",
+then confirm (commit), change their mind (release) or hang up without a word
+(the hold expires). Other tasks keep reading stock levels meanwhile.
+
+Afterwards every SKU must satisfy
+    final on-hand == initial stock - units committed across all processes
+with nothing left held, i.e. no unit was sold twice and none went missing.
+
+Run from backend/:
+    uv run python benchmarks/bench_inventory.py
+    uv run python benchmarks/bench_inventory.py --processes 8 --buyers 1000
+"""
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from Day8.inventory import InventoryService
+
+SKUS = {f"sku-{i}": 40 for i in range(8)}  # scarce on purpose: demand far exceeds stock
+HOLD_TTL = 0.2
+ARRIVAL_WINDOW = 1.0  # buyers show up spread over this many seconds
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000 if values else 0.0
+
+
+async def buyer(inventory, rng, owner, stats):
+    sku = rng.choice(list(SKUS))
+    quantity = rng.randint(1, 3)
+    await asyncio.sleep(rng.uniform(0, ARRIVAL_WINDOW))
+    start = time.perf_counter()
+    hold = await asyncio.to_thread(inventory.reserve, sku, quantity, owner, HOLD_TTL)
+    stats["reserve_s"].append(time.perf_counter() - start)
+    if hold is None:
+        stats["sold_out"] += 1
+        return
+
+    await asyncio.sleep(rng.uniform(0, HOLD_TTL * 1.5))  # some think for longer than the hold lasts
+    choice = rng.random()
+    if choice < 0.7:
+        if await asyncio.to_thread(inventory.commit, hold.hold_id):
+            stats["committed"][sku] += quantity
+        else:
+            stats["expired_before_commit"] += 1
+    elif choice < 0.9:
+        await asyncio.to_thread(inventory.release, hold.hold_id)
+    # else: hung up; the hold just expires
+
+
+async def reader(inventory, stop, stats):
+    while not stop.is_set():
+        start = time.perf_counter()
+        inventory.available_many(SKUS)
+        stats["read_s"].append(time.perf_counter() - start)
+        await asyncio.sleep(0.001)
+
+
+async def run_process(db_path, buyers, seed):
+    inventory = InventoryService(db_path, hold_ttl=HOLD_TTL)
+    rng = random.Random(seed)
+    stats = {"reserve_s": [], "read_s": [], "sold_out": 0, "expired_before_commit": 0, "committed": Counter()}
+    stop = asyncio.Event()
+    readers = [asyncio.create_task(reader(inventory, stop, stats)) for _ in range(4)]
+    start = time.perf_counter()
+    await asyncio.gather(*(buyer(inventory, rng, f"{seed}-{n}", stats) for n in range(buyers)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(*readers)
+    inventory.close()
+    stats["elapsed"] = elapsed
+    return stats
+
+
+def process_main(db_path, buyers, seed, results):
+    results.put(asyncio.run(run_process(db_path, buyers, seed)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--buyers", type=int, default=500, help="buyers per process")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "inventory.db")
+        setup = InventoryService(db_path)
+        setup.seed({"id": sku, "stock": stock} for sku, stock in SKUS.items())
+
+        results = mp.Queue()
+        procs = [mp.Process(target=process_main, args=(db_path, args.buyers, seed, results))
+                 for seed in range(args.processes)]
+        for proc in procs:
+            proc.start()
+        runs = [results.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+
+        setup.expire()
+        committed = sum((run["committed"] for run in runs), Counter())
+        reserve_s = [s for run in runs for s in run["reserve_s"]]
+        read_s = [s for run in runs for s in run["read_s"]]
+        wall = max(run["elapsed"] for run in runs)
+        total = args.processes * args.buyers
+
+        print(f"{total} buyers in {args.processes} processes, {wall:.2f}s, {total / wall:,.0f} buyers/s")
+        print(f"  reserve: p50 {pct(reserve_s, 0.5):.2f} ms, p99 {pct(reserve_s, 0.99):.2f} ms")
+        print(f"  stock read ({len(SKUS)} SKUs): p50 {pct(read_s, 0.5):.3f} ms, p99 {pct(read_s, 0.99):.3f} ms "
+              f"({len(read_s):,} reads)")
+        print(f"  sold out: {sum(r['sold_out'] for r in runs)}, "
+              f"hold expired before commit: {sum(r['expired_before_commit'] for r in runs)}")
+        print(f"\n{'sku':>8} {'initial':>8} {'sold':>6} {'on hand':>8} {'held':>5}")
+        for sku, initial in SKUS.items():
+            on_hand, held = setup._conn.execute("SELECT on_hand, held FROM stock WHERE sku = ?", (sku,)).fetchone()
+            print(f"{sku:>8} {initial:>8} {committed[sku]:>6} {on_hand:>8} {held:>5}")
+            assert on_hand == initial - committed[sku] and on_hand >= 0, f"{sku}: stock does not add up"
+            assert held == 0, f"{sku}: units still held after expiry"
+        assert not setup.holds()
+        setup.close()
+        print("\nno oversell: every SKU's sales match its stock")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: Day4 lead scoring, one LeadData at a time vs. columnar batch.
+
+Run from backend/:
+    uv run python benchmarks/bench_lead_scoring.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from Day4.nykaa_order import LeadColumns, LeadData, LeadQualification
+
+SIZES = [10_000, 100_000]
+USE_CASES = [
+    "Corporate Diwali gifting for the team", "Stocking my salon with professional hair colour",
+    "Personal skincare shopping", "Reselling makeup in my small store", "Wedding makeup artist kit",
+    "Gifts for my family", "Buying supplements for myself", "Bulk wholesale order for an academy",
+]
+
+
+def make_records(size, rng):
+    return [{
+        "lead_id": str(i), "name": "Lead", "email": f"lead{i}@example.com",
+        "company": rng.choice(["Not Specified", "Self-Employed", "Glow Studio", "Tech Flow"]),
+        # A few free-text variations on common themes, like a real backlog
+        "use_case": rng.choice(USE_CASES) + rng.choice(["", " asap", " next month", f" #{rng.randint(0, 50)}"]),
+        "team_size": rng.choice(["Not Specified", "1", "5-10", "50"]),
+        "timeline": rng.choice(["now", "soon", "later"]),
+        "call_summary": "",
+    } for i in range(size)]
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    for size in SIZES:
+        records = make_records(size, rng)
+        leads = [LeadData(**r) for r in records]
+        columns = LeadColumns.from_records(records)
+
+        start = time.perf_counter()
+        expected = [LeadQualification.score_lead(lead) for lead in leads]
+        per_lead = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = LeadQualification.score_leads(columns)
+        batched = time.perf_counter() - start
+
+        assert batch == expected
+        print(f"{size:>7} leads: per-lead {per_lead * 1000:8.1f} ms   batch {batched * 1000:7.1f} ms   "
+              f"({per_lead / batched:.1f}x, identical scores)")
@@ -0,0 +1,79 @@
+"""
+Benchmark: order ID throughput and uniqueness across processes.
+
+Starts several processes that each draw IDs from the shared generator as
+fast as they can (all released at once), then checks every ID is unique,
+each process's IDs strictly increase, and reports aggregate IDs/s. The old
+timestamp IDs (ORD-%Y%m%d%H%M%S) are generated the same way as a baseline.
+
+Run from backend/:
+    uv run python benchmarks/bench_order_ids.py
+    uv run python benchmarks/bench_order_ids.py --processes 8 --ids 500000 --start-method spawn
+"""
+
+import argparse
+import multiprocessing as mp
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from common.order_ids import decode_order_id, new_order_id, order_ids
+
+TARGET_IDS_PER_SECOND = 100_000
+
+
+def generate(barrier, count, results):
+    worker_id = order_ids.worker_id  # claim before the clock starts
+    barrier.wait()
+    start = time.perf_counter()
+    ids = [new_order_id() for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    results.put((worker_id, start, elapsed, ids))
+
+
+def legacy_unique(count):
+    return len({f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}" for _ in range(count)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--ids", type=int, default=250_000, help="IDs per process")
+    parser.add_argument("--start-method", default=None, choices=mp.get_all_start_methods())
+    args = parser.parse_args()
+
+    ctx = mp.get_context(args.start_method)
+    barrier = ctx.Barrier(args.processes)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=generate, args=(barrier, args.ids, results)) for _ in range(args.processes)]
+    for proc in procs:
+        proc.start()
+    runs = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+
+    all_ids = [order_id for *_, ids in runs for order_id in ids]
+    worker_ids = {worker_id for worker_id, *_ in runs}
+    wall = max(start + elapsed for _, start, elapsed, _ in runs) - min(start for _, start, _, _ in runs)
+    rate = len(all_ids) / wall
+
+    print(f"{'process':>8} {'worker':>7} {'ids/s':>12} {'monotonic':>10}")
+    for n, (worker_id, _, elapsed, ids) in enumerate(runs):
+        monotonic = all(a < b for a, b in zip(ids, ids[1:]))
+        assert all(decode_order_id(i)[1] == worker_id for i in ids[:100])
+        print(f"{n:>8} {worker_id:>7} {len(ids) / elapsed:>12,.0f} {str(monotonic):>10}")
+
+    unique = len(set(all_ids))
+    print(f"\n{len(all_ids):,} IDs from {args.processes} processes ({len(worker_ids)} worker ids) in {wall:.2f}s")
+    print(f"aggregate: {rate:,.0f} IDs/s (target {TARGET_IDS_PER_SECOND:,}), duplicates: {len(all_ids) - unique}")
+    print(f"old timestamp IDs, {args.ids:,} in one process: {legacy_unique(args.ids):,} unique")
+
+    assert unique == len(all_ids), "duplicate order IDs"
+    assert len(worker_ids) == args.processes, "processes shared a worker id"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: Day6 checkout write cost, per-order file + order_history.json
+rewrite vs. the sharded append-only OrderStore.
+
+For each history size, pre-fills both layouts, then times further checkouts
+and a first page of history.
+
+Run from backend/:
+    uv run python benchmarks/bench_order_store.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from common.order_ids import OrderIdGenerator
+from Day6.order_store import OrderStore
+
+SIZES = [100, 1_000, 5_000]
+CHECKOUTS = 100
+ITEMS = [{"item_id": "g001", "name": "Whole Wheat Bread", "brand": "Nature's Best", "size": "500g",
+          "quantity": 2, "price": 3.99, "total_price": 7.98, "category": "groceries"}] * 3
+
+
+def make_order(ids, n):
+    return {"order_id": ids.next_id("ORD"), "timestamp": "2026-10-17T12:00:00", "customer_name": f"Customer {n % 50}",
+            "delivery_address": "12 MG Road", "phone": "Not Provided", "items": ITEMS,
+            "total_amount": 23.94, "status": "placed", "special_instructions": ""}
+
+
+def legacy_save(root, order):
+    """The original save_order_to_json, kept here as the baseline."""
+    with open(os.path.join(root, f"{order['order_id']}.json"), "w") as f:
+        json.dump(order, f, indent=2)
+    history_file = os.path.join(root, "order_history.json")
+    history = []
+    if os.path.exists(history_file):
+        with open(history_file) as f:
+            history = json.load(f)
+    history.append(order)
+    with open(history_file, "w") as f:
+        json.dump(history, f, indent=2)
+
+
+def main():
+    ids = OrderIdGenerator(worker_id=1)
+    print(f"{'history':>8} {'legacy ms/checkout':>19} {'sharded ms/checkout':>20} {'page of 20 ms':>14}")
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_root = os.path.join(tmp, "legacy")
+            os.makedirs(legacy_root)
+            store = OrderStore(root=os.path.join(tmp, "orders"))
+
+            # Pre-fill: the legacy history file is written once, not per order
+            prefill = [make_order(ids, n) for n in range(size)]
+            with open(os.path.join(legacy_root, "order_history.json"), "w") as f:
+                json.dump(prefill, f, indent=2)
+            for order in prefill:
+                store.append(order)
+
+            start = time.perf_counter()
+            for n in range(CHECKOUTS):
+                legacy_save(legacy_root, make_order(ids, n))
+            legacy_ms = (time.perf_counter() - start) / CHECKOUTS * 1000
+
+            start = time.perf_counter()
+            for n in range(CHECKOUTS):
+                store.append(make_order(ids, n))
+            store.sync()
+            sharded_ms = (time.perf_counter() - start) / CHECKOUTS * 1000
+
+            start = time.perf_counter()
+            page = store.history(limit=20)
+            page_ms = (time.perf_counter() - start) * 1000
+            assert len(page) == 20
+            store.close()
+
+        print(f"{size:>8} {legacy_ms:>19.2f} {sharded_ms:>20.3f} {page_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
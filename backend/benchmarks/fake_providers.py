@@ -0,0 +1,156 @@
+"""
+Local stand-ins for the hosted model providers, used by the load test.
+
+ScriptedLLM answers each user turn with the tool calls its script lists for
+that exact text, then replies with a short canned message once the tool
+outputs are back. No network, no API keys; an optional delay simulates
+provider latency so sessions overlap the way they do in production.
+
+FakeMurfServer speaks enough of Murf's streaming TTS websocket for the
+real murf.TTS plugin to connect to it on localhost.
+"""
+
+import asyncio
+import base64
+import itertools
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import WSMsgType, web
+from livekit.agents import llm
+from livekit.agents.llm import ChatChunk, ChoiceDelta, FunctionToolCall
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, NOT_GIVEN
+
+ToolCall = Tuple[str, Dict[str, Any]]
+
+_call_ids = itertools.count()
+
+
+@dataclass
+class Turn:
+    """One scripted user utterance and the tool calls the "LLM" makes for it."""
+    user: str
+    calls: List[ToolCall] = field(default_factory=list)
+
+
+class ScriptedLLMStream(llm.LLMStream):
+    def __init__(self, fake_llm: "ScriptedLLM", *, calls: List[ToolCall], text: str, delay: float,
+                 chat_ctx: llm.ChatContext, tools: list, conn_options) -> None:
+        super().__init__(fake_llm, chat_ctx=chat_ctx, tools=tools, conn_options=conn_options)
+        self._calls = calls
+        self._text = text
+        self._delay = delay
+
+    async def _run(self) -> None:
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        request_id = f"fake-{next(_call_ids)}"
+        if self._calls:
+            tool_calls = [
+                FunctionToolCall(name=name, arguments=json.dumps(args), call_id=f"call_{next(_call_ids)}")
+                for name, args in self._calls
+            ]
+            delta = ChoiceDelta(role="assistant", tool_calls=tool_calls)
+        else:
+            delta = ChoiceDelta(role="assistant", content=self._text)
+        self._event_ch.send_nowait(ChatChunk(id=request_id, delta=delta))
+
+
+class ScriptedLLM(llm.LLM):
+    """Fake LLM that replays scripted tool calls keyed by the user's text."""
+
+    def __init__(self, turns: List[Turn], *, delay: float = 0.0, reply: str = "Done.",
+                 record: bool = False) -> None:
+        super().__init__()
+        self._calls = {turn.user: turn.calls for turn in turns}
+        self._delay = delay
+        self._reply = reply
+        self._record = record
+        # (chat context, tools) of every request, when record=True
+        self.requests: List[Tuple[llm.ChatContext, list]] = []
+
+    @property
+    def model(self) -> str:
+        return "scripted"
+
+    @property
+    def provider(self) -> str:
+        return "local"
+
+    def chat(self, *, chat_ctx: llm.ChatContext, tools: Optional[list] = None,
+             conn_options=DEFAULT_API_CONNECT_OPTIONS, parallel_tool_calls=NOT_GIVEN,
+             tool_choice=NOT_GIVEN, extra_kwargs=NOT_GIVEN) -> ScriptedLLMStream:
+        if self._record:
+            self.requests.append((chat_ctx.copy(), list(tools or [])))
+        last = chat_ctx.items[-1] if chat_ctx.items else None
+        calls: List[ToolCall] = []
+        # Tool calls answer a fresh user message; after the tool outputs
+        # (or a handoff) the model just wraps up the turn
+        if last is not None and last.type == "message" and last.role == "user":
+            calls = self._calls.get(last.text_content or "", [])
+        return ScriptedLLMStream(self, calls=calls, text=self._reply, delay=self._delay,
+                                 chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options)
+
+
+class FakeMurfServer:
+    """
+    Local Murf /v1/speech/stream-input websocket. Each text packet gets one
+    chunk of silent PCM back, the end packet gets the final marker.
+    POST /v1/speech/stream (synthesize) answers with silent PCM.
+    handshake_delay simulates connection setup, so cold vs. warm shows up
+    in time-to-first-audio.
+    """
+
+    def __init__(self, *, handshake_delay: float = 0.0, audio_delay: float = 0.0) -> None:
+        self.handshake_delay = handshake_delay
+        self.audio_delay = audio_delay
+        self.connections = 0
+        self.open_connections = 0
+        self.requests = 0  # HTTP synthesize calls
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> str:
+        """Start listening on a free localhost port; returns the base_url for murf.TTS."""
+        app = web.Application()
+        app.router.add_get("/v1/speech/stream-input", self._handle)
+        app.router.add_post("/v1/speech/stream", self._handle_http)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        await asyncio.sleep(self.handshake_delay)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        self.open_connections += 1
+        silence = base64.b64encode(b"\0\0" * 480).decode()
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                packet = json.loads(msg.data)
+                context_id = packet.get("context_id")
+                if packet.get("end"):
+                    await ws.send_json({"context_id": context_id, "final": True})
+                elif packet.get("text"):
+                    if self.audio_delay:
+                        await asyncio.sleep(self.audio_delay)
+                    await ws.send_json({"context_id": context_id, "audio": silence})
+        finally:
+            self.open_connections -= 1
+        return ws
+
+    async def _handle_http(self, request: web.Request) -> web.StreamResponse:
+        await request.json()
+        self.requests += 1
+        if self.audio_delay:
+            await asyncio.sleep(self.audio_delay)
+        return web.Response(body=b"\0\0" * 4800, content_type="audio/pcm")
+
+    async def aclose(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
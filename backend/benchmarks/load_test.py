@@ -0,0 +1,321 @@
+"""
+Load test: hundreds of concurrent AgentSessions per Day agent, no live providers.
+
+Every session runs the real agent class and its real function tools, but
+turns are driven as text (session.run(user_input=...), the same path the
+evals in tests/test_agent.py use) and the LLM is a local ScriptedLLM that
+emits scripted tool calls. The JSON/SQLite stores are written for real,
+into a throwaway working directory.
+
+Reported per scenario:
+  - tool latency percentiles (tool call issued -> tool output recorded)
+  - event-loop lag while the sessions run
+  - memory allocated per live session
+  - persistence writer throughput (jobs/s, mean job time)
+
+Run from backend/:
+    uv run python benchmarks/load_test.py --sessions 200
+    uv run python benchmarks/load_test.py --days day1,day6 --llm-delay 0.05
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# Day3 builds its Murf voices at import; nothing is synthesized in text mode
+os.environ.setdefault("MURF_API_KEY", "load-test")
+
+from livekit.agents import Agent, AgentSession
+
+from fake_providers import ScriptedLLM, Turn
+
+LOOP_LAG_INTERVAL = 0.01  # seconds between event-loop lag probes
+
+
+# --- SCENARIOS ---
+@dataclass
+class Scenario:
+    name: str
+    setup: Callable[[], Tuple[Agent, object]]  # -> (agent, userdata) for one session
+    turns: List[Turn]
+
+
+async def _setup_day1():
+    from Day1.agent_barista import CoffeeShopAgent, new_userdata
+    userdata = await new_userdata()
+    return CoffeeShopAgent(userdata=userdata), userdata
+
+
+async def _setup_day2():
+    from Day2.agent_wellness import Userdata, WellnessAgent
+    userdata = Userdata(last_session_summary="")
+    return WellnessAgent(userdata=userdata), userdata
+
+
+async def _setup_day3():
+    from Day3.agent_tutor import RouterAgent, TutorSession
+    userdata = TutorSession()
+    return RouterAgent(), userdata
+
+
+async def _setup_day4():
+    from Day4.Nykaa_sdr import NykaaSDRAgent, new_userdata
+    userdata = new_userdata()
+    return NykaaSDRAgent(userdata=userdata), userdata
+
+
+async def _setup_day5():
+    from Day5.agent_fraud import FraudAlertAgent, FraudContext
+    userdata = FraudContext()
+    return FraudAlertAgent(userdata=userdata), userdata
+
+
+async def _setup_day6():
+    from Day6.agent_grocery import GroceryAgent, UserContext, build_catalog_info
+    from Day6.grocery_database import current_catalog
+    from Day6.grocery_order import CartState, OrderState
+    catalog = current_catalog()
+    userdata = UserContext(store_name=catalog.store_name, catalog_info=build_catalog_info(catalog),
+                           cart=CartState(), order_state=OrderState())
+    return GroceryAgent(userdata=userdata), userdata
+
+
+async def _setup_day7():
+    from Day7.zathura_agent import GAME_RULES, STORY_SETTING, GameContext, ZathuraGMAgent
+    userdata = GameContext(story_setting=STORY_SETTING, game_rules=GAME_RULES)
+    return ZathuraGMAgent(userdata=userdata), userdata
+
+
+async def _setup_day8():
+    from Day8.ecommerce_agent import EcommerceAgent, EcommerceContext
+    from Day8.ecommerce_catalog import PRODUCTS
+    userdata = EcommerceContext(catalog=PRODUCTS)
+    return EcommerceAgent(userdata=userdata), userdata
+
+
+async def _setup_day9():
+    from Day9.squidgame import ImprovisationContext, SquidGameImprovisationAgent
+    userdata = ImprovisationContext()
+    return SquidGameImprovisationAgent(userdata=userdata), userdata
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "day1": Scenario("Day1 barista", _setup_day1, [
+        Turn("A large latte with oat milk", [("order_drink_tool", {"drink_id": "latte", "size": "l", "milk_id": "oat_milk"})]),
+        Turn("And two mochas for my friends", [("order_drinks_tool", {"drinks": [
+            {"drink_id": "mocha", "extra_ids": ["whip"]}, {"drink_id": "mocha", "size": "s"}]})]),
+        Turn("What do I have so far?", [("confirm_order_tool", {})]),
+        Turn("That is all", [("finalize_order_tool", {})]),
+    ]),
+    "day2": Scenario("Day2 wellness", _setup_day2, [
+        Turn("I'm feeling great today", []),
+        Turn("Save my check-in", [("save_daily_checkin", {
+            "mood": "great, energetic", "goals": ["run 5k", "drink water"], "summary": "Upbeat day."})]),
+        Turn("How was my week?", [("analyze_weekly_trends", {})]),
+        Turn("Show my recent history", [("show_recent_history", {"days": 3})]),
+    ]),
+    "day3": Scenario("Day3 tutor", _setup_day3, [
+        Turn("Hi there", []),
+        Turn("Teach me loops", [("switch_mode_tool", {"mode": "learn", "topic": "loops"})]),
+        Turn("Can you explain that again?", []),
+        Turn("Quiz me on loops", [("switch_mode_tool", {"mode": "quiz", "topic": "loops"})]),
+        # Back to the pooled Learn agent
+        Turn("Go back to the lesson", [("switch_mode_tool", {"mode": "learn", "topic": "loops"})]),
+    ]),
+    "day4": Scenario("Day4 Nykaa SDR", _setup_day4, [
+        Turn("What is Nykaa PRO?", [("search_faq", {"query": "What is Nykaa PRO?"})]),
+        Turn("That's all, thanks", [("save_lead_to_database", {
+            "name": "Asha Rao", "email": "asha@example.com", "company": "Glow Studio", "role": "Owner",
+            "use_case": "salon supplies", "team_size": "5-10", "timeline": "soon",
+            "call_summary": "Salon owner looking at Nykaa PRO."})]),
+    ]),
+    "day5": Scenario("Day5 fraud alert", _setup_day5, [
+        Turn("I'm John Doe, my answer is fluffy", [("verify_customer", {"username": "John Doe", "security_answer": "fluffy"})]),
+        Turn("What was the transaction?", [("get_transaction_details", {})]),
+        Turn("Yes, that was me", [("save_fraud_case", {"decision": "safe", "customer_response": "Customer confirmed."})]),
+    ]),
+    "day6": Scenario("Day6 grocery", _setup_day6, [
+        Turn("Do you have bread?", [("search_items", {"query": "bread"})]),
+        Turn("I need ingredients for pasta for four", [("add_recipe_to_cart", {"recipe_name": "pasta", "servings": 4})]),
+        Turn("Add two milks", [("add_to_cart", {"item_id": "g003", "quantity": 2})]),
+        Turn("Two milks, a bread and just one eggs", [("apply_cart_changes", {"changes": [
+            {"action": "add", "item_id": "g004", "quantity": 2}, {"action": "add", "item_id": "g001"},
+            {"action": "set", "item_id": "g003", "quantity": 1}]})]),
+        Turn("What's in my cart?", [("view_cart", {})]),
+        Turn("Place the order", [("place_order", {"customer_name": "Asha Rao", "delivery_address": "12 MG Road"})]),
+    ]),
+    "day7": Scenario("Day7 Zathura", _setup_day7, [
+        Turn("I hide in the kitchen", [("log_checkpoint", {
+            "player": "Danny", "location": "Kitchen", "status": "Healthy", "inventory": "Flashlight"})]),
+        Turn("I run to the basement", [("log_checkpoint", {
+            "player": "Danny", "location": "Basement", "status": "Injured", "inventory": "Flashlight, Card"})]),
+    ]),
+    "day8": Scenario("Day8 e-commerce", _setup_day8, [
+        Turn("Show me mugs", [("search_products", {"args": {"query": "mug"}})]),
+        Turn("I'll take the first one", [("reserve_item", {"args": {"product_index": 1, "quantity": 1}})]),
+        Turn("Yes, confirm it", [("place_order", {"args": {"product_index": 1, "quantity": 1}})]),
+        Turn("What did I just buy?", [("get_last_order", {})]),
+    ]),
+    "day9": Scenario("Day9 improv", _setup_day9, [
+        Turn("I'm Asha, let's play", [("start_improv_game", {"args": {"player_name": "Asha"}})]),
+        Turn("Give me a scene", [("present_scenario", {"args": {"round_number": 1}})]),
+        Turn("I'd like to stop now", [("handle_early_exit", {})]),
+    ]),
+}
+
+
+# --- MEASUREMENT ---
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _monitor_loop_lag(samples: List[float], stop: asyncio.Event) -> None:
+    """Record how late the loop wakes up a LOOP_LAG_INTERVAL sleep."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        samples.append(time.perf_counter() - started - LOOP_LAG_INTERVAL)
+
+
+def _tool_latencies(events, latencies: Dict[str, List[float]], errors: Dict[str, int]) -> None:
+    calls = {}
+    for event in events:
+        if event.type == "function_call":
+            calls[event.item.call_id] = event.item
+        elif event.type == "function_call_output":
+            call = calls.get(event.item.call_id)
+            if call is None:
+                continue
+            latencies[call.name].append(event.item.created_at - call.created_at)
+            if event.item.is_error:
+                errors[call.name] += 1
+
+
+async def run_scenario(scenario: Scenario, sessions: int, llm_delay: float) -> dict:
+    from common.persistence import persistence
+
+    # --- Start every session, measuring what each one keeps alive ---
+    await scenario.setup()  # imports and cached prompts shouldn't count as per-session memory
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    live = []
+    for _ in range(sessions):
+        agent, userdata = await scenario.setup()
+        fake_llm = ScriptedLLM(scenario.turns, delay=llm_delay)
+        session = AgentSession(llm=fake_llm, userdata=userdata) if userdata is not None else AgentSession(llm=fake_llm)
+        await session.start(agent)
+        live.append((session, fake_llm))
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # --- Drive the scripted conversations concurrently ---
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lag_samples: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_loop_lag(lag_samples, stop))
+
+    jobs_before, busy_before = persistence.completed, persistence.busy_seconds
+
+    async def converse(session: AgentSession) -> None:
+        for turn in scenario.turns:
+            result = await session.run(user_input=turn.user)
+            _tool_latencies(result.events, latencies, errors)
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(converse(s) for s, _ in live), return_exceptions=True)
+    await asyncio.get_running_loop().run_in_executor(None, persistence.flush)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+    for session, fake_llm in live:
+        await session.aclose()
+        await fake_llm.aclose()
+
+    jobs = persistence.completed - jobs_before
+    busy = persistence.busy_seconds - busy_before
+    failed = [o for o in outcomes if isinstance(o, BaseException)]
+    return {
+        "name": scenario.name,
+        "sessions": sessions,
+        "failed": len(failed),
+        "first_error": repr(failed[0]) if failed else "",
+        "elapsed": elapsed,
+        "turns_per_s": sessions * len(scenario.turns) / elapsed,
+        "tools": {name: (values, errors[name]) for name, values in latencies.items()},
+        "lag": lag_samples,
+        "memory_per_session": (allocated - baseline) / sessions,
+        "store_jobs": jobs,
+        "store_jobs_per_s": jobs / elapsed,
+        "store_job_ms": busy / jobs * 1000 if jobs else 0.0,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n=== {report['name']}: {report['sessions']} sessions, "
+          f"{report['elapsed']:.2f}s, {report['turns_per_s']:.0f} turns/s ===")
+    if report["failed"]:
+        print(f"  !! {report['failed']} sessions failed, e.g. {report['first_error']}")
+
+    print(f"  {'tool':<26}{'calls':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, (values, errors) in sorted(report["tools"].items()):
+        ms = [v * 1000 for v in values]
+        print(f"  {name:<26}{len(ms):>7}{errors:>8}{percentile(ms, 50):>10.2f}"
+              f"{percentile(ms, 95):>10.2f}{percentile(ms, 99):>10.2f}{max(ms):>10.2f}")
+
+    lag = [v * 1000 for v in report["lag"]]
+    if lag:
+        print(f"  event-loop lag: p50 {percentile(lag, 50):.2f} ms, p99 {percentile(lag, 99):.2f} ms, "
+              f"max {max(lag):.2f} ms ({len(lag)} probes)")
+    print(f"  memory per session: {report['memory_per_session'] / 1024:.1f} KiB")
+    print(f"  store writer: {report['store_jobs']} jobs, {report['store_jobs_per_s']:.0f} jobs/s, "
+          f"{report['store_job_ms']:.2f} ms/job")
+
+
+async def main(args: argparse.Namespace) -> None:
+    names = [n.strip() for n in args.days.split(",")] if args.days else list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(unknown)}. Choose from {', '.join(SCENARIOS)}")
+
+    for name in names:
+        if name == "day5":
+            from Day5.fraud_database import initialize_fraud_database
+            initialize_fraud_database()
+        print_report(await run_scenario(SCENARIOS[name], args.sessions, args.llm_delay))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200, help="concurrent sessions per scenario")
+    parser.add_argument("--days", default="", help="comma-separated scenarios (default: all)")
+    parser.add_argument("--llm-delay", type=float, default=0.0, help="simulated LLM latency in seconds")
+    parser.add_argument("--workdir", default="", help="where the agents write their stores (default: temp dir)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.disable(logging.INFO)  # some agents pin their own loggers to INFO
+    # Tool errors are counted in the report; keep provider noise out of it
+    logging.getLogger("livekit.agents").setLevel(logging.ERROR)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="agent-load-test-")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)  # every store in the agents uses paths relative to the cwd
+    print(f"Writing agent stores under {workdir}")
+    asyncio.run(main(args))
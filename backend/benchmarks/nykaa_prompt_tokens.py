@@ -0,0 +1,123 @@
+"""
+Token report: Nykaa SDR prompt modes on the same conversation.
+
+"full" inlines the company context and every FAQ answer in the system
+prompt; "rag" keeps a topic index there and fetches answers with
+search_faq. Both modes run the same visitor script through a real
+AgentSession with the scripted fake LLM, and every LLM request (system
+prompt, history, tool calls/outputs and tool schemas) is counted.
+
+Uses tiktoken's cl100k_base when it is installed (`uv sync --group bench`),
+else ~4 chars/token.
+
+Run from backend/:
+    uv run python benchmarks/nykaa_prompt_tokens.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from livekit.agents import AgentSession
+from livekit.agents.llm.utils import build_legacy_openai_schema
+
+from Day4.Nykaa_sdr import NykaaSDRAgent, new_userdata
+from fake_providers import ScriptedLLM, Turn
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+    TOKENIZER = "tiktoken cl100k_base"
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+except Exception:  # not installed, or no network for the encoding file
+    TOKENIZER = "estimate (4 chars/token)"
+
+    def count_tokens(text: str) -> int:
+        return (len(text) + 3) // 4
+
+# The visitor says the same thing in both modes
+SCRIPT = [
+    "Hi, I run a small salon in Pune",
+    "What is Nykaa PRO?",
+    "How do I become a PRO member?",
+    "How long does delivery take?",
+    "Are your products genuine?",
+    "Great, I'm Asha Rao, asha@glowstudio.in, we're a team of 6 and want to start soon. That's all!",
+]
+
+LEAD = {
+    "name": "Asha Rao", "email": "asha@glowstudio.in", "company": "Glow Studio", "role": "Owner",
+    "use_case": "salon supplies via Nykaa PRO", "team_size": "6", "timeline": "soon",
+    "call_summary": "Salon owner in Pune interested in Nykaa PRO.",
+}
+
+
+def turns_for(mode: str):
+    turns = [Turn(SCRIPT[0])]
+    for question in SCRIPT[1:-1]:
+        # Only the retrieval mode has to fetch the answer
+        calls = [("search_faq", {"query": question})] if mode == "rag" else []
+        turns.append(Turn(question, calls))
+    turns.append(Turn(SCRIPT[-1], [("save_lead_to_database", LEAD)]))
+    return turns
+
+
+def request_tokens(chat_ctx, tools) -> int:
+    parts = []
+    for item in chat_ctx.items:
+        if item.type == "message":
+            parts.append(item.text_content or "")
+        elif item.type == "function_call":
+            parts.append(item.name + item.arguments)
+        elif item.type == "function_call_output":
+            parts.append(item.output)
+    parts += [json.dumps(build_legacy_openai_schema(tool)) for tool in tools]
+    return count_tokens("\n".join(parts))
+
+
+async def run_mode(mode: str) -> dict:
+    userdata = new_userdata(mode)
+    agent = NykaaSDRAgent(userdata=userdata)
+    fake_llm = ScriptedLLM(turns_for(mode), record=True)
+    async with fake_llm, AgentSession(llm=fake_llm, userdata=userdata) as session:
+        await session.start(agent)
+        for text in SCRIPT:
+            await session.run(user_input=text)
+
+    per_request = [request_tokens(ctx, tools) for ctx, tools in fake_llm.requests]
+    return {
+        "mode": mode,
+        "system_prompt": count_tokens(agent.instructions),
+        "requests": len(per_request),
+        "first_request": per_request[0],
+        "mean_request": sum(per_request) / len(per_request),
+        "total": sum(per_request),
+    }
+
+
+async def main() -> None:
+    results = [await run_mode("full"), await run_mode("rag")]
+    print(f"Nykaa SDR prompt modes, {len(SCRIPT)} user turns, tokens by {TOKENIZER}\n")
+    print(f"  {'mode':<6}{'system prompt':>15}{'LLM requests':>14}{'1st request':>13}"
+          f"{'mean request':>14}{'total input':>13}")
+    for r in results:
+        print(f"  {r['mode']:<6}{r['system_prompt']:>15}{r['requests']:>14}{r['first_request']:>13}"
+              f"{r['mean_request']:>14.0f}{r['total']:>13}")
+    full, rag = results
+    print(f"\n  per request (what time-to-first-token scales with): "
+          f"{1 - rag['mean_request'] / full['mean_request']:.0%} fewer tokens in rag mode")
+    print(f"  whole conversation: {rag['total'] / full['total'] - 1:+.0%} tokens in rag mode "
+          f"({rag['requests'] - full['requests']:+d} requests for the search_faq round-trips)")
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp(prefix="nykaa-tokens-"))  # save_lead_to_database writes here
+    asyncio.run(main())
@@ -1,9 +1,7 @@
 import logging
-import os
 import sys
-import json  # <--- Required for JSON
 from datetime import datetime
-from typing import Annotated, Literal, List
+from typing import Annotated, Literal, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -16,30 +14,30 @@ from livekit.agents import (
     cli,
     function_tool,
 )
-from livekit.plugins import google, deepgram, silero, murf
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
-from pydantic import Field
+from livekit.plugins import google, deepgram, murf
+from pydantic import BaseModel, Field
 from dataclasses import dataclass
 
 # Import your existing coffee modules
 # (Make sure database.py and order.py are in the same folder)
 from Day1.database import (
     COMMON_INSTRUCTIONS,
-    FakeDB,
-    MenuItem,
-    find_items_by_id,
+    MenuIndex,
+    menu_index,
     menu_instructions,
 )
 from Day1.order import OrderedDrink, OrderState
+from Day1.order_journal import order_journal
+from common.persistence import persistence
+from common.prompt_cache import prompt_cache
+from common.prewarm import get_turn_detector, get_vad, prewarm
 
 load_dotenv()
 logger = logging.getLogger("coffee-barista")
 
 # --- JSON SAVING LOGIC ---
-JSON_FILE = "coffee_orders.json"
-
 def save_order_to_json(order_items: list):
-    """Saves the completed order list to a JSON file."""
+    """Appends the completed order to the order journal."""
     
     # Convert the order objects into a clean dictionary format
     items_data = []
@@ -58,46 +56,77 @@ def save_order_to_json(order_items: list):
         "items": items_data
     }
     
-    # Read existing file or create new list
-    history = []
-    if os.path.exists(JSON_FILE):
-        try:
-            with open(JSON_FILE, "r") as f:
-                history = json.load(f)
-        except json.JSONDecodeError:
-            history = []
-            
-    history.append(entry)
-    
-    # Write back to file
-    with open(JSON_FILE, "w") as f:
-        json.dump(history, f, indent=4)
-    
-    return entry
+    # One line appended per order; run order_journal.compact() to fold
+    # the journal back into coffee_orders.json
+    return order_journal.append(entry)
 
 @dataclass
 class Userdata:
     order: OrderState
-    drink_items: list[MenuItem]
-    milk_items: list[MenuItem]
-    extra_items: list[MenuItem]
+    menu: MenuIndex  # every menu lookup and the prompt go through the shared index
+
+# --- ORDER BUILDING ---
+Size = Literal["s", "m", "l", "xl"]
+
+class DrinkRequest(BaseModel):
+    """One drink in a batch order."""
+    drink_id: str = Field(description="The ID of the drink (e.g., 'latte', 'cappuccino').")
+    size: Size = Field(default="m", description="The size of the drink.")
+    milk_id: Optional[str] = Field(default=None, description="Optional ID for milk preference (e.g., 'oat_milk').")
+    extra_ids: List[str] = Field(default_factory=list, description="Optional IDs for syrups or extras (e.g., 'vanilla').")
+
+def build_drink(
+    menu: MenuIndex,
+    drink_id: str,
+    size: str = "m",
+    milk_id: Optional[str] = None,
+    extra_ids: Optional[List[str]] = None,
+) -> Tuple[OrderedDrink, str]:
+    """Validate a drink against the menu. Returns the order item and a short description."""
+    drink = menu.find("drink", drink_id)
+    if not drink:
+        raise ToolError(f"Drink '{drink_id}' not found on menu.")
+    if milk_id and not menu.find("milk", milk_id):
+        raise ToolError(f"Milk type '{milk_id}' not found.")
+    extras = list(extra_ids or [])
+    for extra_id in extras:
+        if not menu.find("extra", extra_id):
+            raise ToolError(f"Extra '{extra_id}' not found.")
+
+    item = OrderedDrink(drink_id=drink_id, size=size, milk_id=milk_id, syrup_ids=extras)
+
+    description = f"{size.upper()} {drink.name}"
+    if milk_id: description += f" with {milk_id.replace('_', ' ')}"
+    if extras: description += " and " + ", ".join(e.replace('_', ' ') for e in extras)
+    return item, description
+
+def build_instructions(menu: MenuIndex) -> str:
+    return (
+        COMMON_INSTRUCTIONS
+        + "\n\n"
+        + menu_instructions("drinks", menu.items("drink"))
+        + "\n\n"
+        + menu_instructions("milks", menu.items("milk"))
+        + "\n\n"
+        + menu_instructions("extras/syrups", menu.items("extra"))
+        + "\n\n"
+        + "Available sizes: Small (s), Medium (m), Large (l), Extra Large (xl)."
+        + "\n\n"
+        + "When the user orders several drinks at once, add them all with one 'order_drinks_tool' call."
+        + "\n\n"
+        + "IMPORTANT: When the user is done ordering (says 'that is all', 'checkout', or 'finalize'), "
+        + "you MUST use the 'finalize_order_tool' to save their order to the system."
+    )
 
 class CoffeeShopAgent(Agent):
     def __init__(self, *, userdata: Userdata) -> None:
-        instructions = (
-            COMMON_INSTRUCTIONS
-            + "\n\n"
-            + menu_instructions("drinks", userdata.drink_items)
-            + "\n\n"
-            + menu_instructions("milks", userdata.milk_items)
-            + "\n\n"
-            + menu_instructions("extras/syrups", userdata.extra_items)
-            + "\n\n"
-            + "Available sizes: Small (s), Medium (m), Large (l), Extra Large (xl)."
-            + "\n\n"
-            + "IMPORTANT: When the user is done ordering (says 'that is all', 'checkout', or 'finalize'), "
-            + "you MUST use the 'finalize_order_tool' to save their order to the system."
+        # Rendered once per menu version and shared by every session; built
+        # only from the session's menu index, which carries that version
+        prompt = prompt_cache.render(
+            "barista.instructions", userdata.menu.version, lambda: build_instructions(userdata.menu)
         )
+        self.prompt_hash = prompt.sha256
+        instructions = prompt.text
 
         super().__init__(
             instructions=instructions,
@@ -127,36 +156,42 @@ class CoffeeShopAgent(Agent):
         """
         Use this tool when the user wants to ADD a drink to their order.
         """
-        valid_drink = find_items_by_id(ctx.userdata.drink_items, drink_id)
-        if not valid_drink:
-            raise ToolError(f"Drink '{drink_id}' not found on menu.")
-
-        if milk_id:
-            valid_milk = find_items_by_id(ctx.userdata.milk_items, milk_id)
-            if not valid_milk:
-                raise ToolError(f"Milk type '{milk_id}' not found.")
-        
-        extras = []
-        if extra_id:
-            valid_extra = find_items_by_id(ctx.userdata.extra_items, extra_id)
-            if not valid_extra:
-                raise ToolError(f"Extra '{extra_id}' not found.")
-            extras.append(extra_id)
-
-        item = OrderedDrink(
-            drink_id=drink_id,
-            size=size,
-            milk_id=milk_id,
-            syrup_ids=extras
+        item, description = build_drink(
+            ctx.userdata.menu, drink_id, size, milk_id, [extra_id] if extra_id else None
         )
-        
         await ctx.userdata.order.add(item)
-        
-        description = f"Added {size.upper()} {valid_drink.name}"
-        if milk_id: description += f" with {milk_id.replace('_', ' ')}"
-        if extra_id: description += f" and {extra_id.replace('_', ' ')}"
-        
-        return description
+        return f"Added {description}"
+
+    @function_tool
+    async def order_drinks_tool(
+        self,
+        ctx: RunContext[Userdata],
+        drinks: Annotated[
+            List[DrinkRequest],
+            Field(description="Every drink the user wants to add, one entry per drink.", min_length=1),
+        ],
+    ) -> str:
+        """
+        Use this tool when the user orders SEVERAL drinks at once (e.g. for a whole table).
+        All drinks are checked against the menu first; if any is invalid, nothing is added.
+        """
+        built = []
+        errors = []
+        for n, request in enumerate(drinks, start=1):
+            try:
+                built.append(build_drink(
+                    ctx.userdata.menu, request.drink_id, request.size, request.milk_id, request.extra_ids
+                ))
+            except ToolError as e:
+                errors.append(f"Drink {n}: {e.message}")
+        if errors:
+            raise ToolError("Nothing was added. " + " ".join(errors))
+
+        for item, _ in built:
+            await ctx.userdata.order.add(item)
+        return f"Added {len(built)} drinks: " + "; ".join(
+            f"{description} [ID: {item.order_id}]" for item, description in built
+        )
 
     @function_tool
     async def remove_item_tool(
@@ -193,8 +228,8 @@ class CoffeeShopAgent(Agent):
         if not items:
             return "You haven't ordered anything yet."
         
-        # Save to JSON
-        save_order_to_json(items)
+        # Save to JSON (off the event loop)
+        await persistence.run(save_order_to_json, items)
         
         # Clear the memory
         ctx.userdata.order.clear()
@@ -202,15 +237,9 @@ class CoffeeShopAgent(Agent):
         return "Order finalized and saved to coffee_orders.json! Thank you!"
 
 async def new_userdata() -> Userdata:
-    fake_db = FakeDB()
-    return Userdata(
-        order=OrderState(),
-        drink_items=await fake_db.list_drinks(),
-        milk_items=await fake_db.list_milks(),
-        extra_items=await fake_db.list_extras(),
-    )
+    return Userdata(order=OrderState(), menu=menu_index())
 
-server = AgentServer()
+server = AgentServer(setup_fnc=prewarm)
 
 @server.rtc_session
 async def main(ctx: JobContext) -> None:
@@ -221,8 +250,8 @@ async def main(ctx: JobContext) -> None:
         stt=deepgram.STT(model="nova-3"),
         llm=google.LLM(model="gemini-2.5-pro"),
         tts=murf.TTS(model="en-US-falcon"),
-        turn_detection=MultilingualModel(),
-        vad=silero.VAD.load(),
+        turn_detection=get_turn_detector(ctx),
+        vad=get_vad(ctx),
     )
 
     await session.start(agent=CoffeeShopAgent(userdata=userdata), room=ctx.room)
@@ -1,6 +1,5 @@
 # database.py
-from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 # --- Configuration ---
 COMMON_INSTRUCTIONS = """
@@ -10,12 +9,27 @@ You should always confirm the size of the drink.
 If they don't specify milk or syrup, assume they don't want any, but you can suggest it.
 """
 
-@dataclass
 class MenuItem:
-    id: str
-    name: str
-    category: str  # drink, milk, syrup, size
-    price: float = 0.0
+    """One menu entry. Slotted: instances are shared by every session on the worker."""
+    __slots__ = ("category", "id", "name", "price")
+
+    def __init__(self, item_id: str, name: str, category: str, price: float = 0.0):
+        self.id = item_id
+        self.name = name
+        self.category = category  # drink, milk, extra, size
+        self.price = price
+
+    def __repr__(self) -> str:
+        return f"MenuItem(id={self.id!r}, name={self.name!r}, category={self.category!r}, price={self.price!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MenuItem):
+            return NotImplemented
+        return (self.id, self.name, self.category, self.price) == (
+            other.id, other.name, other.category, other.price)
+
+    def __hash__(self) -> int:
+        return hash((self.id, self.category))
 
 # --- Data ---
 # We convert your dict into a list of objects so the agent can filter them
@@ -57,17 +71,68 @@ raw_data = [
     MenuItem("whip", "Whipped Cream", "extra"),
 ]
 
+# Bumped whenever raw_data changes; the menu index and cached prompts key on it
+MENU_VERSION = 1
+
+
+class MenuIndex:
+    """id -> item maps per category, built once per menu version."""
+    __slots__ = ("_by_category", "_lists", "version")
+
+    def __init__(self, items: Iterable[MenuItem], version: int = 0):
+        self.version = version
+        self._by_category: Dict[str, Dict[str, MenuItem]] = {}
+        for item in items:
+            self._by_category.setdefault(item.category, {})[item.id] = item
+        self._lists: Dict[str, List[MenuItem]] = {
+            category: list(by_id.values()) for category, by_id in self._by_category.items()
+        }
+
+    def find(self, category: str, item_id: str) -> Optional[MenuItem]:
+        category_items = self._by_category.get(category)
+        return category_items.get(item_id) if category_items else None
+
+    def items(self, category: str) -> List[MenuItem]:
+        """Items of one category in menu order. Shared list, treat as read-only."""
+        return self._lists.get(category, [])
+
+
+_index: Optional[MenuIndex] = None
+
+
+def menu_index() -> MenuIndex:
+    """The index for the current menu, rebuilt lazily after set_menu()."""
+    global _index
+    if _index is None or _index.version != MENU_VERSION:
+        _index = MenuIndex(raw_data, MENU_VERSION)
+    return _index
+
+
+def set_menu(items: List[MenuItem]) -> int:
+    """Replace the menu and invalidate everything derived from it."""
+    global MENU_VERSION
+    raw_data[:] = items
+    MENU_VERSION += 1
+    return MENU_VERSION
+
+
+def items_in_category(category: str) -> List[MenuItem]:
+    """Menu items of one category, filtered once per menu version."""
+    return menu_index().items(category)
+
+
 class FakeDB:
+    # The returned lists are shared between sessions; treat them as read-only
     async def list_drinks(self) -> List[MenuItem]:
-        return [i for i in raw_data if i.category == "drink"]
+        return items_in_category("drink")
 
     async def list_milks(self) -> List[MenuItem]:
-        return [i for i in raw_data if i.category == "milk"]
+        return items_in_category("milk")
     
     async def list_extras(self) -> List[MenuItem]:
-        return [i for i in raw_data if i.category == "extra"]
+        return items_in_category("extra")
 
-# Helper to find items
+# Helper to find items in a plain list; prefer menu_index().find() for menu lookups
 def find_items_by_id(items: List[MenuItem], item_id: str) -> Optional[MenuItem]:
     for item in items:
         if item.id == item_id:
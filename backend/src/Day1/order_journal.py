@@ -0,0 +1,191 @@
+# order_journal.py
+import atexit
+import json
+import os
+import threading
+import time
+from typing import List, Optional
+
+from common.order_ids import new_order_id
+
+try:
+    import fcntl  # POSIX only, used to keep appends and compaction apart
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# --- Configuration ---
+SNAPSHOT_FILE = "coffee_orders.json"
+JOURNAL_FILE = "coffee_orders.jsonl"
+FSYNC_EVERY = 16        # fsync after this many appends...
+FSYNC_INTERVAL = 1.0    # ...or after this many seconds, whichever comes first
+
+
+def _lock(fd: int, exclusive: bool) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class OrderJournal:
+    """
+    Append-only order log.
+
+    Each finalized order is written as one JSON line to the journal, so a
+    checkout costs the same no matter how many orders came before it.
+    `compact()` folds the journal into the snapshot file, which keeps the
+    original list-of-dicts format of coffee_orders.json.
+
+    Every entry gets an order_id, and journal entries whose ID is already
+    in the snapshot are skipped on load. A crash after the snapshot is
+    swapped in but before the journal is truncated leaves no duplicates,
+    and the next compaction clears them out.
+    """
+
+    def __init__(self, snapshot_path: str = SNAPSHOT_FILE, journal_path: str = JOURNAL_FILE,
+                 fsync_every: int = FSYNC_EVERY, fsync_interval: float = FSYNC_INTERVAL):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+
+    # --- Writing ---
+    def _open(self) -> int:
+        if self._fd is None:
+            # O_APPEND makes every write land at the current end of file,
+            # even when several worker processes share the journal.
+            self._fd = os.open(self.journal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        return self._fd
+
+    def append(self, entry: dict) -> dict:
+        """Append one order to the journal, giving it an order_id. Returns the entry."""
+        entry.setdefault("order_id", new_order_id("COF-"))
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+
+        with self._lock:
+            fd = self._open()
+            _lock(fd, exclusive=False)
+            try:
+                os.write(fd, line)
+            finally:
+                _unlock(fd)
+
+            self._pending += 1
+            if (self._pending >= self.fsync_every or
+                    time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync_locked()
+            elif self._timer is None:
+                # Quiet periods: the last batch still reaches disk within fsync_interval
+                self._timer = threading.Timer(self.fsync_interval, self._sync_due)
+                self._timer.daemon = True
+                self._timer.start()
+
+        return entry
+
+    def _sync_due(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._fd is not None and self._pending:
+            os.fsync(self._fd)
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """Force any batched appends to disk."""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        """Flush batched appends and release the journal file."""
+        with self._lock:
+            self._sync_locked()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    # --- Reading ---
+    def _read_snapshot(self) -> List[dict]:
+        if not os.path.exists(self.snapshot_path):
+            return []
+        try:
+            with open(self.snapshot_path) as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            return []
+        return data if isinstance(data, list) else []
+
+    def _read_journal(self) -> List[dict]:
+        if not os.path.exists(self.journal_path):
+            return []
+        entries = []
+        with open(self.journal_path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-write; skip it
+                    continue
+        return entries
+
+    def load_all(self) -> List[dict]:
+        """Return every order, oldest first, as a list of dicts."""
+        snapshot = self._read_snapshot()
+        # Entries an interrupted compaction already folded into the snapshot
+        folded = {entry.get("order_id") for entry in snapshot if isinstance(entry, dict)}
+        folded.discard(None)
+        return snapshot + [entry for entry in self._read_journal() if entry.get("order_id") not in folded]
+
+    # --- Compaction ---
+    def compact(self) -> int:
+        """
+        Fold the journal into the snapshot and truncate the journal.
+        Returns the number of orders in the new snapshot.
+        """
+        with self._lock:
+            self._sync_locked()
+            fd = os.open(self.journal_path, os.O_RDWR | os.O_CREAT, 0o644)
+            _lock(fd, exclusive=True)
+            try:
+                history = self.load_all()
+
+                tmp_path = self.snapshot_path + ".tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(history, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.snapshot_path)
+
+                os.ftruncate(fd, 0)
+                os.fsync(fd)
+            finally:
+                _unlock(fd)
+                os.close(fd)
+
+        return len(history)
+
+
+# Shared journal for the barista agent
+order_journal = OrderJournal()
+atexit.register(order_journal.close)
+
+
+def load_order_history() -> List[dict]:
+    """Read all saved coffee orders (snapshot + journal)."""
+    return order_journal.load_all()
@@ -1,5 +1,4 @@
 import logging
-import json
 import os
 from datetime import datetime
 from typing import Annotated
@@ -14,34 +13,28 @@ from livekit.agents import (
     cli,
     function_tool,
 )
-from livekit.plugins import google, deepgram, silero, murf
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from livekit.plugins import google, deepgram, murf
 from pydantic import Field
 from dataclasses import dataclass
-from todoist_api_python.api import TodoistAPI
+
+from Day2.todoist_client import todoist_pool
+from Day2.wellness_store import wellness_store
+from common.persistence import persistence
+from common.prewarm import get_turn_detector, get_vad, prewarm
 
 load_dotenv()
 logger = logging.getLogger("wellness-companion")
 
 # --- JSON HELPER FUNCTIONS ---
-JSON_FILE = "wellness_log.json"
-
 def get_last_checkin():
-    """Reads the JSON file and returns the last entry if it exists."""
-    if not os.path.exists(JSON_FILE):
-        return None
-    
+    """Returns the most recent check-in, reading only the tail of the log."""
     try:
-        with open(JSON_FILE, "r") as f:
-            data = json.load(f)
-            if data:
-                return data[-1] # Return the last item in the list
+        return wellness_store.last()
     except Exception:
         return None
-    return None
 
 def save_checkin_to_json(mood: str, goals: list, summary: str):
-    """Saves the current check-in to the JSON file."""
+    """Appends the current check-in to the log and updates the daily aggregates."""
     entry = {
         "timestamp": datetime.now().isoformat(),
         "mood": mood,
@@ -49,23 +42,7 @@ def save_checkin_to_json(mood: str, goals: list, summary: str):
         "summary": summary
     }
     
-    # Load existing data or create new list
-    if os.path.exists(JSON_FILE):
-        with open(JSON_FILE, "r") as f:
-            try:
-                history = json.load(f)
-            except json.JSONDecodeError:
-                history = []
-    else:
-        history = []
-        
-    history.append(entry)
-    
-    # Write back to file
-    with open(JSON_FILE, "w") as f:
-        json.dump(history, f, indent=4)
-    
-    return entry
+    return wellness_store.append(entry)
 
 @dataclass
 class Userdata:
@@ -120,8 +97,8 @@ class WellnessAgent(Agent):
         """
         Call this tool at the END of the conversation to save the user's data to the JSON file.
         """
-        save_checkin_to_json(mood, goals, summary)
-        return "Check-in saved successfully to wellness_log.json."
+        await persistence.run(save_checkin_to_json, mood, goals, summary)
+        return "Check-in saved successfully to your wellness log."
 
     @function_tool
     async def create_todoist_tasks(
@@ -137,18 +114,25 @@ class WellnessAgent(Agent):
         if not api_token:
             return "Sorry, Todoist integration is not configured. Please set your TODOIST_API_TOKEN."
         
-        api = TodoistAPI(api_token)
+        # Tasks are created concurrently over the shared, pooled client
+        results = await todoist_pool.add_tasks(api_token, tasks)
         created_tasks = []
-        try:
-            for task_desc in tasks:
-                task = api.add_task(content=task_desc)
-                created_tasks.append(f"'{task_desc}' (ID: {task.id})")
-                logger.info(f"Created Todoist task: {task_desc} with ID {task.id}")
-            
-            return f"Successfully created {len(tasks)} tasks in Todoist: {', '.join(created_tasks)}. You can manage them in your Todoist app."
-        except Exception as e:
-            logger.error(f"Error creating Todoist tasks: {e}")
+        failed_tasks = []
+        for task_desc, result in zip(tasks, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error creating Todoist task '{task_desc}': {result}")
+                failed_tasks.append(task_desc)
+            else:
+                created_tasks.append(f"'{task_desc}' (ID: {result.id})")
+                logger.info(f"Created Todoist task: {task_desc} with ID {result.id}")
+        
+        if not created_tasks:
             return "Sorry, I couldn't create the tasks right now. Please check your Todoist API token and try again."
+        
+        response = f"Successfully created {len(created_tasks)} tasks in Todoist: {', '.join(created_tasks)}. You can manage them in your Todoist app."
+        if failed_tasks:
+            response += f" I couldn't create: {', '.join(failed_tasks)}."
+        return response
 
     @function_tool
     async def analyze_weekly_trends(
@@ -159,34 +143,21 @@ class WellnessAgent(Agent):
         Analyze the last 7 days of wellness data to provide insights on mood and goal completion.
         """
         try:
-            if not os.path.exists(JSON_FILE):
+            # Per-day counters for the last 7 days with check-ins
+            recent_days = await persistence.run(wellness_store.recent_days, 7)
+            if not recent_days:
                 return "No wellness history available yet. Let's start with today's check-in!"
             
-            with open(JSON_FILE, "r") as f:
-                history = json.load(f)
-            
-            # Get last 7 entries
-            recent_entries = history[-7:] if len(history) >= 7 else history
-            
-            if not recent_entries:
-                return "No recent data to analyze."
-            
-            # Analyze mood trends
-            moods = [entry.get('mood', '').lower() for entry in recent_entries]
-            positive_words = ['good', 'great', 'excellent', 'energetic', 'happy', 'positive']
-            negative_words = ['tired', 'low', 'stressed', 'sad', 'anxious', 'bad']
-            
-            positive_count = sum(1 for mood in moods if any(word in mood for word in positive_words))
-            negative_count = sum(1 for mood in moods if any(word in mood for word in negative_words))
-            
-            # Analyze goals
-            total_goals = sum(len(entry.get('goals', [])) for entry in recent_entries)
-            avg_goals = total_goals / len(recent_entries) if recent_entries else 0
+            checkins = sum(day["checkins"] for _, day in recent_days)
+            positive_count = sum(day["positive"] for _, day in recent_days)
+            negative_count = sum(day["negative"] for _, day in recent_days)
+            total_goals = sum(day["goals"] for _, day in recent_days)
+            avg_goals = total_goals / checkins if checkins else 0
             
             analysis = f"""
-Over the last {len(recent_entries)} days:
-- Mood trends: {positive_count} days with positive energy, {negative_count} days with lower energy
-- Average goals per day: {avg_goals:.1f}
+Over the last {len(recent_days)} days ({checkins} check-ins):
+- Mood trends: {positive_count} check-ins with positive energy, {negative_count} with lower energy
+- Average goals per check-in: {avg_goals:.1f}
 - Total goals set: {total_goals}
 
 You're showing consistent commitment to your wellness journey! Keep up the great work.
@@ -212,11 +183,10 @@ You're showing consistent commitment to your wellness journey! Keep up the great
         if not api_token:
             return "Sorry, Todoist integration is not configured. Please set your TODOIST_API_TOKEN."
         
-        api = TodoistAPI(api_token)
         try:
             # Create a task with due date
             task_content = f"Reminder: {activity}"
-            task = api.add_task(content=task_content, due_string=time)
+            task = await todoist_pool.add_task(api_token, task_content, due_string=time)
             logger.info(f"Created Todoist reminder: {task_content} at {time} with ID {task.id}")
             
             return f"✅ Reminder created in Todoist! I'll help you remember to {activity} at {time}. Check your Todoist app for the task."
@@ -234,16 +204,9 @@ You're showing consistent commitment to your wellness journey! Keep up the great
         Show the user's recent wellness check-ins to help them see their progress.
         """
         try:
-            if not os.path.exists(JSON_FILE):
-                return "No wellness history available yet. Let's create your first check-in!"
-            
-            with open(JSON_FILE, "r") as f:
-                history = json.load(f)
-            
-            recent_entries = history[-days:] if len(history) >= days else history
-            
+            recent_entries = await persistence.run(wellness_store.tail, days)
             if not recent_entries:
-                return "No recent entries found."
+                return "No wellness history available yet. Let's create your first check-in!"
             
             summary = "Here are your recent check-ins:\n\n"
             for i, entry in enumerate(reversed(recent_entries), 1):
@@ -259,25 +222,16 @@ You're showing consistent commitment to your wellness journey! Keep up the great
             return "I couldn't retrieve your history right now."
 
 
-server = AgentServer()
+server = AgentServer(setup_fnc=prewarm)
 
 @server.rtc_session
 async def main(ctx: JobContext) -> None:
-    # 1. Read JSON history before starting
-    last_entry = get_last_checkin()
+    # 1. Read only the latest check-in before starting
+    last_entry = await persistence.run(get_last_checkin)
     history_summary = ""
     if last_entry:
         history_summary = f"Last check-in: {last_entry['timestamp'][:10]}, Mood: {last_entry['mood']}, Goals: {', '.join(last_entry['goals'])}"
     
-    # Load full history for advanced analysis
-    full_history = []
-    if os.path.exists(JSON_FILE):
-        try:
-            with open(JSON_FILE, "r") as f:
-                full_history = json.load(f)
-        except:
-            full_history = []
-    
     userdata = Userdata(last_session_summary=history_summary)
     
     session = AgentSession[Userdata](
@@ -285,8 +239,8 @@ async def main(ctx: JobContext) -> None:
         stt=deepgram.STT(model="nova-3"),
         llm=google.LLM(model="gemini-2.5-flash-lite"),
         tts=murf.TTS(voice="Alicia", model="Murf Falcon"),
-        turn_detection=MultilingualModel(),
-        vad=silero.VAD.load(),
+        turn_detection=get_turn_detector(ctx),
+        vad=get_vad(ctx),
     )
 
     await session.start(agent=WellnessAgent(userdata=userdata), room=ctx.room)
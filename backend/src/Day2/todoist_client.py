@@ -0,0 +1,124 @@
+# todoist_client.py
+import asyncio
+import logging
+import os
+import random
+from typing import Dict, List, Optional, Union
+
+import httpx
+from todoist_api_python.api_async import TodoistAPIAsync
+from todoist_api_python.models import Task
+
+logger = logging.getLogger("todoist-client")
+
+# --- Configuration ---
+MAX_CONNECTIONS = 10   # keep-alive connections shared by every session on the worker
+MAX_CONCURRENCY = 4    # in-flight add_task calls per batch
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.25    # seconds; doubles on every retry, plus jitter
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class _BaseURLTransport(httpx.AsyncBaseTransport):
+    """Sends every request to `api_url` instead of api.todoist.com (stub servers, proxies)."""
+
+    def __init__(self, api_url: str, inner: httpx.AsyncBaseTransport):
+        self._target = httpx.URL(api_url)
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Keep the /api/v1/... path, swap scheme/host/port
+        request.url = request.url.copy_with(
+            scheme=self._target.scheme, host=self._target.host, port=self._target.port
+        )
+        request.headers["host"] = request.url.netloc.decode("ascii")
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUS
+    return isinstance(error, httpx.TransportError)
+
+
+class TodoistClientPool:
+    """
+    Long-lived Todoist clients for one worker process.
+
+    All tokens share a single keep-alive HTTP connection pool, calls are
+    async so the voice pipeline keeps running while Todoist answers, and
+    batches are sent concurrently (bounded) with retry and backoff.
+
+    Without an explicit api_url, TODOIST_API_URL is read when the first
+    request is made, so a .env loaded after import still applies.
+    """
+
+    def __init__(self, api_url: Optional[str] = None, max_connections: int = MAX_CONNECTIONS,
+                 max_concurrency: int = MAX_CONCURRENCY, max_retries: int = MAX_RETRIES,
+                 backoff_base: float = BACKOFF_BASE):
+        self.api_url = api_url
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._http: Optional[httpx.AsyncClient] = None
+        self._clients: Dict[str, TodoistAPIAsync] = {}
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(limits=limits)
+            api_url = self.api_url or os.getenv("TODOIST_API_URL")
+            if api_url:
+                transport = _BaseURLTransport(api_url, transport)
+            self._http = httpx.AsyncClient(transport=transport)
+        return self._http
+
+    def client(self, token: str) -> TodoistAPIAsync:
+        """Cached API client for `token`, backed by the shared connection pool."""
+        api = self._clients.get(token)
+        if api is None:
+            api = TodoistAPIAsync(token, client=self._http_client())
+            self._clients[token] = api
+        return api
+
+    async def add_task(self, token: str, content: str, **kwargs) -> Task:
+        """Create one task, retrying rate limits, 5xx and connection errors."""
+        api = self.client(token)
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await api.add_task(content=content, **kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                delay = self.backoff_base * (2 ** attempt) * (1 + random.random())
+                logger.warning(f"Todoist add_task failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def add_tasks(self, token: str, contents: List[str], **kwargs) -> List[Union[Task, Exception]]:
+        """
+        Create several tasks concurrently. Results come back in the same order
+        as `contents`; a task that still failed after retries is returned as
+        its exception instead of failing the whole batch.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _add(content: str) -> Task:
+            async with semaphore:
+                return await self.add_task(token, content, **kwargs)
+
+        return await asyncio.gather(*(_add(c) for c in contents), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        self._clients.clear()
+
+
+# Shared pool for the wellness agent; TODOIST_API_URL points it at a stub server
+todoist_pool = TodoistClientPool()
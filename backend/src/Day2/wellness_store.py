@@ -0,0 +1,220 @@
+# wellness_store.py
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl  # POSIX only, serializes aggregate updates across workers
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# --- Configuration ---
+SNAPSHOT_FILE = "wellness_log.json"         # legacy list-of-dicts history
+JOURNAL_FILE = "wellness_log.jsonl"         # one check-in per line, append-only
+AGGREGATES_DIR = "wellness_aggregates"      # one day -> counts file per month
+TAIL_BLOCK_SIZE = 8192
+
+POSITIVE_WORDS = ['good', 'great', 'excellent', 'energetic', 'happy', 'positive']
+NEGATIVE_WORDS = ['tired', 'low', 'stressed', 'sad', 'anxious', 'bad']
+
+
+def mood_polarity(mood: str) -> Tuple[bool, bool]:
+    """Returns (is_positive, is_negative) for a free-text mood."""
+    mood = mood.lower()
+    return (any(word in mood for word in POSITIVE_WORDS),
+            any(word in mood for word in NEGATIVE_WORDS))
+
+
+def _parse_lines(lines) -> List[dict]:
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue  # torn line from an interrupted write
+    return entries
+
+
+def _empty_day() -> Dict[str, int]:
+    return {"checkins": 0, "positive": 0, "negative": 0, "goals": 0}
+
+
+def _add_to_day(day: Dict[str, int], entry: dict) -> None:
+    positive, negative = mood_polarity(entry.get("mood", ""))
+    day["checkins"] += 1
+    day["positive"] += int(positive)
+    day["negative"] += int(negative)
+    day["goals"] += len(entry.get("goals", []))
+
+
+class WellnessStore:
+    """
+    Check-in history plus per-day aggregates.
+
+    New check-ins are appended to a JSONL journal and folded into that
+    month's small day -> counts file (wellness_aggregates/2025-11.json), so
+    a check-in rewrites at most a month of counters, trend questions read
+    the newest month files or two, and "recent history" reads only the last
+    few lines of the journal.
+    """
+
+    def __init__(self, snapshot_path: str = SNAPSHOT_FILE, journal_path: str = JOURNAL_FILE,
+                 aggregates_dir: str = AGGREGATES_DIR):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.aggregates_dir = aggregates_dir
+
+    # --- Legacy snapshot ---
+    def _read_snapshot(self) -> List[dict]:
+        if not os.path.exists(self.snapshot_path):
+            return []
+        try:
+            with open(self.snapshot_path) as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            return []
+        return data if isinstance(data, list) else []
+
+    # --- Aggregates ---
+    @staticmethod
+    def _read_month(path: str) -> Dict[str, Dict[str, int]]:
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_month(path: str, days: Dict[str, Dict[str, int]]) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(days, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _month_path(self, month: str, root: Optional[str] = None) -> str:
+        return os.path.join(root or self.aggregates_dir, f"{month}.json")
+
+    def _months(self) -> List[str]:
+        """Months with check-ins, newest first."""
+        return sorted((name[:-len(".json")] for name in os.listdir(self.aggregates_dir)
+                       if name.endswith(".json")), reverse=True)
+
+    @contextmanager
+    def _aggregates_lock(self) -> Iterator[None]:
+        """Exclusive across threads and worker processes while the aggregates change."""
+        lock_fd = os.open(self.aggregates_dir + ".lock", os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(lock_fd)  # also releases the flock
+
+    def rebuild_aggregates(self) -> Dict[str, Dict[str, int]]:
+        """Recompute the per-day counts from the full history (one-off migration)."""
+        with self._aggregates_lock():
+            return self._rebuild_locked()
+
+    def _rebuild_locked(self) -> Dict[str, Dict[str, int]]:
+        days: Dict[str, Dict[str, int]] = {}
+        for entry in self._read_snapshot() + self._read_journal():
+            day = entry.get("timestamp", "")[:10]
+            if day:
+                _add_to_day(days.setdefault(day, _empty_day()), entry)
+
+        months: Dict[str, Dict[str, Dict[str, int]]] = {}
+        for day, counts in days.items():
+            months.setdefault(day[:7], {})[day] = counts
+
+        # Build aside and move into place, so readers never see a half-built set
+        tmp_dir = self.aggregates_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for month, month_days in months.items():
+            self._write_month(self._month_path(month, tmp_dir), month_days)
+        shutil.rmtree(self.aggregates_dir, ignore_errors=True)
+        os.replace(tmp_dir, self.aggregates_dir)
+        return days
+
+    def _ensure_aggregates(self) -> None:
+        if os.path.isdir(self.aggregates_dir):
+            return
+        with self._aggregates_lock():
+            # Another worker may have built them while we waited
+            if not os.path.isdir(self.aggregates_dir):
+                self._rebuild_locked()
+
+    # --- Writes ---
+    def append(self, entry: dict) -> dict:
+        """Append a check-in and bump its day's counters (one month file rewritten)."""
+        with self._aggregates_lock():
+            if not os.path.isdir(self.aggregates_dir):
+                self._rebuild_locked()
+
+            line = (json.dumps(entry) + "\n").encode("utf-8")
+            fd = os.open(self.journal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+            month_path = self._month_path(entry["timestamp"][:7])
+            days = self._read_month(month_path)
+            _add_to_day(days.setdefault(entry["timestamp"][:10], _empty_day()), entry)
+            self._write_month(month_path, days)
+        return entry
+
+    # --- Reads ---
+    def _read_journal(self) -> List[dict]:
+        if not os.path.exists(self.journal_path):
+            return []
+        with open(self.journal_path) as f:
+            return _parse_lines(line for line in f if line.strip())
+
+    def _tail_journal(self, n: int) -> List[dict]:
+        """Last `n` journal entries, reading backwards from the end of the file."""
+        if n <= 0 or not os.path.exists(self.journal_path):
+            return []
+        with open(self.journal_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            buffer = b""
+            lines: List[bytes] = []
+            while pos > 0 and len(lines) <= n:
+                read_size = min(TAIL_BLOCK_SIZE, pos)
+                pos -= read_size
+                f.seek(pos)
+                buffer = f.read(read_size) + buffer
+                lines = [line for line in buffer.split(b"\n") if line.strip()]
+        # The first line may be partial unless we reached the start of the file
+        if pos > 0:
+            lines = lines[1:]
+        return _parse_lines(lines)[-n:]
+
+    def tail(self, n: int) -> List[dict]:
+        """The last `n` check-ins, oldest first."""
+        entries = self._tail_journal(n)
+        missing = n - len(entries)
+        if missing > 0:
+            # Only older, pre-journal history lives in the snapshot
+            entries = self._read_snapshot()[-missing:] + entries
+        return entries
+
+    def last(self) -> Optional[dict]:
+        entries = self.tail(1)
+        return entries[-1] if entries else None
+
+    def recent_days(self, days: int = 7) -> List[Tuple[str, Dict[str, int]]]:
+        """Counters for the most recent `days` days that have check-ins, oldest first."""
+        self._ensure_aggregates()
+        recent: List[Tuple[str, Dict[str, int]]] = []
+        for month in self._months():
+            recent = sorted(self._read_month(self._month_path(month)).items()) + recent
+            if len(recent) >= days:
+                break
+        return recent[-days:] if days > 0 else []
+
+
+# Shared store for the wellness agent
+wellness_store = WellnessStore()
@@ -1,5 +1,6 @@
 import logging
-from typing import Annotated, Literal, Optional
+from dataclasses import dataclass, field
+from typing import Annotated, Dict, Literal, Optional, Tuple
 
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -12,25 +13,84 @@ from livekit.agents import (
     cli,
     function_tool,
 )
-from livekit.plugins import google, deepgram, silero, murf
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from livekit.plugins import google, deepgram
 from pydantic import Field
 
 from Day3.content_manager import ContentManager
+from Day3.tutor_history import SharedHistory
+from Day3.voice_pool import VoicePool
+from common.prewarm import get_turn_detector, get_vad, prewarm
 
 load_dotenv()
 logger = logging.getLogger("tutor-agent")
 content_db = ContentManager()
 
-# --- CONFIGURING THE 3 VOICES ---
-# Note: Ensure you have these Voice IDs in Murf, or use "en-US-falcon" for all if testing.
-TTS_MATTHEW = murf.TTS(model="en-US-falcon", voice="Matthew")
-TTS_ALICIA = murf.TTS(model="en-US-falcon", voice="Alicia")
-TTS_KEN = murf.TTS(model="en-US-falcon", voice="Ken")
-TTS_ROUTER = TTS_MATTHEW 
+# Murf voices are built on first use and kept warm (see voice_pool.py)
+voice_pool = VoicePool()
+
+MODE_LABELS = {"learn": "Learn", "quiz": "Quiz", "teach_back": "Teach-Back"}
+MODE_VOICES = {"router": "matthew", "learn": "matthew", "quiz": "alicia", "teach_back": "ken"}
+
+# Where each mode usually hands off next (Learn suggests a quiz, and so on)
+LIKELY_NEXT_MODES = {
+    "router": ("learn", "quiz", "teach_back"),
+    "learn": ("quiz",),
+    "quiz": ("learn", "teach_back"),
+    "teach_back": ("quiz",),
+}
+
+@dataclass
+class TutorSession:
+    """Per-session state: the shared history and one agent per (mode, topic)."""
+    history: SharedHistory = field(default_factory=SharedHistory)
+    agents: Dict[Tuple[str, str], "TutorAgent"] = field(default_factory=dict)
+
+# --- 0. SHARED BASE: MODE SWITCHING ---
+class TutorAgent(Agent):
+    mode = "router"
+
+    def __init__(self, instructions: str, tts, chat_ctx: Optional[ChatContext] = None):
+        super().__init__(instructions=instructions, chat_ctx=chat_ctx, tts=tts)
+        self.history_version = -1  # SharedHistory.version this agent's context was built from
+
+    async def on_enter(self) -> None:
+        # Warm the likely next voices so their first line doesn't pay a handshake
+        if self.session.output.audio is not None:
+            voice_pool.warm(*{MODE_VOICES[mode] for mode in LIKELY_NEXT_MODES[self.mode]})
+
+    async def resume(self, history: SharedHistory) -> None:
+        """Bring a pooled agent's context up to date before it takes over."""
+        if self.history_version != history.version:
+            await self.update_chat_ctx(history.chat_ctx())
+            self.history_version = history.version
+
+    @function_tool
+    async def switch_mode_tool(
+        self,
+        ctx: RunContext[TutorSession],
+        mode: Annotated[Literal["learn", "quiz", "teach_back"], Field(description="The learning mode.")],
+        topic: Annotated[Literal["variables", "loops", "functions"], Field(description="The topic ID.")]
+    ):
+        """Switch the agent's personality and mode based on the user's request."""
+        logger.info(f"Transferring to {mode} for {topic}")
+        tutor = ctx.userdata
+
+        # Hand over the turns since the last switch, then reuse this session's
+        # agent for the mode/topic (built once) with the windowed history
+        tutor.history.absorb(self.chat_ctx)
+        agent = tutor.agents.get((mode, topic))
+        if agent is self:
+            return f"Already in {MODE_LABELS[mode]} Mode for {topic}"
+        if agent is None:
+            agent = MODE_AGENTS[mode](topic)
+            tutor.agents[(mode, topic)] = agent
+        await agent.resume(tutor.history)
+        return agent, f"Switching to {MODE_LABELS[mode]} Mode for {topic}"
 
 # --- 1. THE TEACHER AGENT (Matthew) ---
-class LearnAgent(Agent):
+class LearnAgent(TutorAgent):
+    mode = "learn"
+
     def __init__(self, topic_id: str, chat_ctx: Optional[ChatContext] = None):
         lesson = content_db.get_lesson(topic_id)
         topic_name = lesson.title if lesson else topic_id
@@ -48,11 +108,13 @@ class LearnAgent(Agent):
             3. If yes, suggest switching to QUIZ mode.
             """,
             chat_ctx=chat_ctx,
-            tts=TTS_MATTHEW 
+            tts=voice_pool.get(MODE_VOICES[self.mode]),
         )
 
 # --- 2. THE QUIZ AGENT (Alicia) ---
-class QuizAgent(Agent):
+class QuizAgent(TutorAgent):
+    mode = "quiz"
+
     def __init__(self, topic_id: str, chat_ctx: Optional[ChatContext] = None):
         lesson = content_db.get_lesson(topic_id)
         topic_name = lesson.title if lesson else topic_id
@@ -71,11 +133,13 @@ class QuizAgent(Agent):
             4. If wrong, CORRECT them.
             """,
             chat_ctx=chat_ctx,
-            tts=TTS_ALICIA 
+            tts=voice_pool.get(MODE_VOICES[self.mode]),
         )
 
 # --- 3. THE STUDENT AGENT (Ken) ---
-class TeachBackAgent(Agent):
+class TeachBackAgent(TutorAgent):
+    mode = "teach_back"
+
     def __init__(self, topic_id: str, chat_ctx: Optional[ChatContext] = None):
         lesson = content_db.get_lesson(topic_id)
         topic_name = lesson.title if lesson else topic_id
@@ -93,11 +157,13 @@ class TeachBackAgent(Agent):
                - If they are wrong, politely correct them.
             """,
             chat_ctx=chat_ctx,
-            tts=TTS_KEN 
+            tts=voice_pool.get(MODE_VOICES[self.mode]),
         )
 
 # --- 4. THE ROUTER AGENT ---
-class RouterAgent(Agent):
+class RouterAgent(TutorAgent):
+    mode = "router"
+
     def __init__(self, chat_ctx: Optional[ChatContext] = None):
         topics = content_db.get_all_topics()
         super().__init__(
@@ -112,54 +178,33 @@ class RouterAgent(Agent):
             3. Use the 'switch_mode_tool' to transfer them to a specialist.
             """,
             chat_ctx=chat_ctx,
-            tts=TTS_ROUTER 
+            tts=voice_pool.get(MODE_VOICES[self.mode]),
         )
 
-    @function_tool
-    async def switch_mode_tool(
-        self,
-        ctx: RunContext,
-        mode: Annotated[Literal["learn", "quiz", "teach_back"], Field(description="The learning mode.")],
-        topic: Annotated[Literal["variables", "loops", "functions"], Field(description="The topic ID.")]
-    ):
-        """Switch the agent's personality and mode based on the user's request."""
-        
-        logger.info(f"Transferring to {mode} for {topic}")
-        
-        # --- THE FIX IS HERE ---
-        # We access chat_ctx from 'self' (the current Agent), not the session.
-        current_history = self.chat_ctx.copy()
-
-        if mode == "learn":
-            return LearnAgent(topic, chat_ctx=current_history), f"Switching to Learn Mode for {topic}"
-        elif mode == "quiz":
-            return QuizAgent(topic, chat_ctx=current_history), f"Switching to Quiz Mode for {topic}"
-        elif mode == "teach_back":
-            return TeachBackAgent(topic, chat_ctx=current_history), f"Switching to Teach-Back Mode for {topic}"
-        
-        return self, "Stay"
+MODE_AGENTS = {"learn": LearnAgent, "quiz": QuizAgent, "teach_back": TeachBackAgent}
 
-server = AgentServer()
+server = AgentServer(setup_fnc=prewarm)
 
 @server.rtc_session
 async def main(ctx: JobContext) -> None:
-    # Start with the Router
+    # Start with the Router; every agent can switch modes (TutorAgent)
     agent = RouterAgent()
-    
-    # Enable the tools
-    agent.tools.append(agent.switch_mode_tool)
-    LearnAgent.tools = [agent.switch_mode_tool]
-    QuizAgent.tools = [agent.switch_mode_tool]
-    TeachBackAgent.tools = [agent.switch_mode_tool]
 
     session = AgentSession(
+        userdata=TutorSession(),
         stt=deepgram.STT(model="nova-3"),
         llm=google.LLM(model="gemini-2.5-pro"),
-        tts=TTS_ROUTER, 
-        turn_detection=MultilingualModel(),
-        vad=silero.VAD.load(),
+        tts=voice_pool.get(MODE_VOICES["router"]),
+        turn_detection=get_turn_detector(ctx),
+        vad=get_vad(ctx),
     )
 
+    async def log_voice_report() -> None:
+        logger.info(f"Voice report: {voice_pool.report()}")
+
+    ctx.add_shutdown_callback(log_voice_report)
+    # Router voice first; on_enter warms the likely next ones
+    voice_pool.warm(MODE_VOICES["router"])
     await session.start(agent=agent, room=ctx.room)
 
 if __name__ == "__main__":
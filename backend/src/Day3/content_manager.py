@@ -1,7 +1,10 @@
 import json
+import mmap
 import os
-from dataclasses import dataclass
-from typing import Optional
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Tuple
 
 @dataclass
 class Lesson:
@@ -10,27 +13,157 @@ class Lesson:
     summary: str
     sample_question: str
 
+# This magic line finds the JSON file in the SAME folder as this script
+# No matter where you run the command from, this will work.
+CONTENT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tutor_content.json")
+
+# Parsed lessons kept around after a get_lesson (the rest stay on disk)
+LESSON_CACHE_SIZE = 32
+
+# Whitespace and commas between lessons
+_SEPARATOR_RE = re.compile(rb'[\s,]*')
+# Bytes that matter to a lesson's structure, and one whole JSON string (escapes included)
+_STRUCTURE_RE = re.compile(rb'["{}\[\],]')
+_STRING_RE = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+
+_LESSON_FIELDS = {f.name for f in fields(Lesson)}
+
+def _scan_lesson(data, pos: int) -> Tuple[int, Dict[str, str]]:
+    """
+    Walk the lesson object starting at `pos` without parsing it: returns
+    the offset just past its closing brace and its top-level string fields
+    id and title. Braces inside strings are skipped with the string.
+    """
+    depth = 0
+    expect_key = False
+    key = None
+    found: Dict[str, str] = {}
+    index = pos
+    while True:
+        match = _STRUCTURE_RE.search(data, index)
+        if match is None:
+            raise ValueError(f"unterminated lesson at byte {pos}")
+        char = match.group()
+        if char == b'"':
+            string = _STRING_RE.match(data, match.start())
+            if string is None:
+                raise ValueError(f"unterminated string at byte {match.start()}")
+            index = string.end()
+            if depth == 1:
+                if expect_key:
+                    key, expect_key = json.loads(string.group()), False
+                elif key in ("id", "title"):
+                    found[key] = json.loads(string.group())
+            continue
+        index = match.end()
+        if char in b"{[":
+            depth += 1
+            expect_key = depth == 1
+        elif char in b"}]":
+            depth -= 1
+            if depth == 0:
+                return index, found
+        elif depth == 1:  # a comma between two top-level fields
+            expect_key, key = True, None
+
+
+def _scan(data) -> Tuple[Dict[str, Tuple[int, int]], Dict[str, str]]:
+    """One pass over the file: each lesson's byte span, id and title."""
+    offsets: Dict[str, Tuple[int, int]] = {}
+    titles: Dict[str, str] = {}
+    pos = _SEPARATOR_RE.match(data, 0).end()
+    if data[pos:pos + 1] != b"[":
+        raise ValueError("expected a JSON list of lessons")
+    pos += 1
+    while True:
+        pos = _SEPARATOR_RE.match(data, pos).end()
+        if data[pos:pos + 1] == b"]":
+            return offsets, titles
+        if data[pos:pos + 1] != b"{":
+            raise ValueError(f"expected a lesson object at byte {pos}")
+        end, found = _scan_lesson(data, pos)
+        if "id" not in found:
+            raise ValueError(f"lesson without a string id at byte {pos}")
+        offsets[found["id"]] = (pos, end)
+        titles[found["id"]] = found.get("title", "")
+        pos = end
+
 class ContentManager:
-    def __init__(self):
-        self.lessons = {}
-        
-        # This magic line finds the JSON file in the SAME folder as this script
-        # No matter where you run the command from, this will work.
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        path = os.path.join(current_dir, "tutor_content.json")
-        
+    """
+    Lesson store over a memory-mapped tutor_content.json.
+
+    Nothing is read until first use. The first lookup scans the file once
+    to index lesson id -> (start, end) byte offsets and collect titles;
+    get_lesson then parses only the requested lesson's bytes.
+    """
+
+    def __init__(self, path: str = CONTENT_FILE):
+        self.path = path
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._offsets: Optional[Dict[str, Tuple[int, int]]] = None
+        self._titles: Dict[str, str] = {}
+        self._topics: str = ""
+        self._cache: "OrderedDict[str, Lesson]" = OrderedDict()
+
+    # --- Index ---
+    def _ensure_index(self) -> Dict[str, Tuple[int, int]]:
+        """The lesson index, built on first use. A missing or broken file is retried next time."""
+        if self._offsets is not None:
+            return self._offsets
+        file, data = None, None
         try:
-            with open(path, "r") as f:
-                data = json.load(f)
-                for item in data:
-                    self.lessons[item['id']] = Lesson(**item)
-            print(f"SUCCESS: Loaded {len(self.lessons)} lessons from {path}")
+            file = open(self.path, "rb")
+            if os.fstat(file.fileno()).st_size:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                offsets, titles = _scan(data)
+            else:
+                offsets, titles = {}, {}
         except Exception as e:
-            print(f"ERROR: Could not load content from {path}")
+            print(f"ERROR: Could not load content from {self.path}")
             print(f"Details: {e}")
+            if data is not None:
+                data.close()
+            if file is not None:
+                file.close()
+            return {}
+        print(f"SUCCESS: Indexed {len(offsets)} lessons from {self.path}")
+        self._file, self._map, self._offsets, self._titles = file, data, offsets, titles
+        self._topics = ", ".join(titles.values())
+        return offsets
 
+    # --- Lookups ---
     def get_lesson(self, topic_id: str) -> Optional[Lesson]:
-        return self.lessons.get(topic_id)
+        lesson = self._cache.get(topic_id)
+        if lesson is not None:
+            self._cache.move_to_end(topic_id)
+            return lesson
+        span = self._ensure_index().get(topic_id)
+        if span is None:
+            return None
+        item = json.loads(self._map[span[0]:span[1]])
+        # Lessons may carry extra keys (tags, order, ...) the agent doesn't use
+        lesson = Lesson(**{key: value for key, value in item.items() if key in _LESSON_FIELDS})
+        self._cache[topic_id] = lesson
+        if len(self._cache) > LESSON_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return lesson
 
     def get_all_topics(self) -> str:
-        return ", ".join([l.title for l in self.lessons.values()])
\ No newline at end of file
+        self._ensure_index()
+        return self._topics
+
+    def lesson_ids(self) -> List[str]:
+        return list(self._ensure_index())
+
+    def __len__(self) -> int:
+        return len(self._ensure_index())
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self._map = self._file = self._offsets = None
+        self._titles, self._topics = {}, ""
+        self._cache.clear()
@@ -0,0 +1,75 @@
+# tutor_history.py
+import os
+from typing import List, Tuple
+
+from livekit.agents import ChatContext
+from livekit.agents.llm import ChatMessage
+
+# Recent messages handed to the next agent word for word
+HISTORY_WINDOW = int(os.getenv("TUTOR_HISTORY_WINDOW", "12"))
+
+# Older messages survive as one short line each, newest lines kept
+SUMMARY_MAX_LINES = 20
+SUMMARY_LINE_CHARS = 160
+
+
+class SharedHistory:
+    """
+    One conversation history shared by every tutor agent in a session.
+
+    User/assistant messages live in an immutable tuple: agents are handed
+    the same message objects, and absorbing new turns builds a new tuple
+    (copy on write) rather than copying the history into each agent.
+    Messages that slide out of the recent window are folded into a running
+    summary, so a handoff passes on a bounded context however long the
+    session runs.
+    """
+
+    def __init__(self, window: int = HISTORY_WINDOW):
+        self.window = window
+        self.version = 0
+        self._messages: Tuple[ChatMessage, ...] = ()
+        self._summary: List[str] = []
+        self._watermark = 0.0  # created_at of the newest absorbed message
+
+    @property
+    def messages(self) -> Tuple[ChatMessage, ...]:
+        return self._messages
+
+    @property
+    def summary(self) -> str:
+        return "\n".join(self._summary)
+
+    def absorb(self, chat_ctx: ChatContext) -> int:
+        """
+        Take in the messages an agent added since the last handoff and apply
+        the window. Tool calls and system messages stay with that agent.
+        Returns how many messages were new.
+        """
+        new = [
+            item for item in chat_ctx.items
+            if item.type == "message" and item.role in ("user", "assistant")
+            and item.created_at > self._watermark and item.text_content
+        ]
+        if not new:
+            return 0
+        self._watermark = max(item.created_at for item in new)
+
+        messages = self._messages + tuple(new)
+        overflow = len(messages) - self.window
+        if overflow > 0:
+            for message in messages[:overflow]:
+                self._summary.append(f"{message.role}: {message.text_content[:SUMMARY_LINE_CHARS]}")
+            del self._summary[:-SUMMARY_MAX_LINES]
+            messages = messages[overflow:]
+        self._messages = messages
+        self.version += 1
+        return len(new)
+
+    def chat_ctx(self) -> ChatContext:
+        """Context for the agent taking over: the summary, if any, then the recent window."""
+        ctx = ChatContext.empty()
+        if self._summary:
+            ctx.add_message(role="system", content=f"Earlier in this session:\n{self.summary}")
+        ctx.items.extend(self._messages)
+        return ctx
@@ -0,0 +1,296 @@
+# voice_pool.py
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Callable, Deque, Dict, List, Optional, Set, Union
+
+from livekit.agents import APIConnectOptions, tts, utils
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS
+from livekit.plugins import murf
+
+logger = logging.getLogger("tutor-voices")
+
+# --- CONFIGURING THE 3 VOICES ---
+# Note: Ensure you have these Voice IDs in Murf, or use "en-US-falcon" for all if testing.
+TTS_MODEL = "en-US-falcon"
+VOICES = {"matthew": "Matthew", "alicia": "Alicia", "ken": "Ken"}
+
+# Seconds without audio before a voice's open sockets are closed
+VOICE_IDLE_TIMEOUT = float(os.getenv("TUTOR_VOICE_IDLE_TIMEOUT", "120"))
+TTFA_SAMPLES = 200
+
+
+@dataclass
+class VoiceStats:
+    streams: int = 0
+    warmups: int = 0
+    idle_closes: int = 0
+    active: int = 0  # streams not yet closed; a voice in use is never reaped
+    connected: bool = False  # a socket may be open (used or warmed since the last idle close)
+    last_used: float = 0.0
+    ttfa: Deque[float] = field(default_factory=lambda: deque(maxlen=TTFA_SAMPLES))
+
+
+class _TimedStream(tts.SynthesizeStream):
+    """
+    Forwards text to a murf stream and its audio back out, recording
+    time-to-first-audio (first text pushed -> first audio out).
+    """
+
+    def __init__(self, *, tts: "PooledTTS", murf_tts: murf.TTS, conn_options: APIConnectOptions):
+        super().__init__(tts=tts, conn_options=conn_options)
+        self._pooled = tts
+        self._murf_tts = murf_tts
+        self._text_at: Optional[float] = None
+        self._reported = False
+
+    def push_text(self, token: str) -> None:
+        if self._text_at is None:
+            self._text_at = time.perf_counter()
+        super().push_text(token)
+
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        output_emitter.initialize(
+            request_id=utils.shortuuid(),
+            sample_rate=self._pooled.sample_rate,
+            num_channels=self._pooled.num_channels,
+            mime_type="audio/pcm",
+            stream=True,
+        )
+        output_emitter.start_segment(segment_id=utils.shortuuid())
+
+        # This stream already retries; the inner one shouldn't retry as well
+        stream = self._murf_tts.stream(conn_options=replace(self._conn_options, max_retry=0))
+
+        async def forward_input() -> None:
+            try:
+                async for data in self._input_ch:
+                    if isinstance(data, str):
+                        stream.push_text(data)
+                    elif isinstance(data, self._FlushSentinel):
+                        stream.flush()
+            finally:
+                stream.end_input()
+
+        input_task = asyncio.create_task(forward_input())
+        try:
+            async with stream:
+                async for audio in stream:
+                    self._pooled.touch()
+                    if not self._reported and self._text_at is not None:
+                        self._reported = True
+                        self._pooled.stats.ttfa.append(time.perf_counter() - self._text_at)
+                    output_emitter.push_frame(audio.frame)
+        finally:
+            await utils.aio.cancel_and_wait(input_task)
+
+    async def aclose(self) -> None:
+        try:
+            await super().aclose()
+        finally:
+            self._pooled._release(self)
+
+
+class _TimedChunkedStream(tts.ChunkedStream):
+    """
+    One synthesize() request through the murf TTS, recording
+    time-to-first-audio. The voice counts it as in use until it finishes.
+    """
+
+    def __init__(self, *, tts: "PooledTTS", murf_tts: murf.TTS, input_text: str,
+                 conn_options: APIConnectOptions):
+        super().__init__(tts=tts, input_text=input_text, conn_options=conn_options)
+        self._pooled = tts
+        self._murf_tts = murf_tts
+        # Finished, failed or cancelled by aclose(): the voice is free again
+        self._synthesize_task.add_done_callback(lambda _: tts._release(self))
+
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        output_emitter.initialize(
+            request_id=utils.shortuuid(),
+            sample_rate=self._pooled.sample_rate,
+            num_channels=self._pooled.num_channels,
+            mime_type="audio/pcm",
+        )
+        started, reported = time.perf_counter(), False
+        # This stream already retries; the inner one shouldn't retry as well
+        async with self._murf_tts.synthesize(
+            self._input_text, conn_options=replace(self._conn_options, max_retry=0)
+        ) as stream:
+            async for audio in stream:
+                self._pooled.touch()
+                if not reported:
+                    reported = True
+                    self._pooled.stats.ttfa.append(time.perf_counter() - started)
+                output_emitter.push_frame(audio.frame)
+
+
+class PooledTTS(tts.TTS):
+    """
+    One tutor voice: wraps a murf.TTS through its public API only
+    (stream / prewarm / aclose), tracks use and TTFA, and can drop its idle
+    sockets by closing the murf TTS; the next stream opens a fresh one.
+    """
+
+    def __init__(self, *, stats: VoiceStats, on_use: Callable[[], None], **murf_options):
+        self._murf_options = murf_options
+        self._murf: Optional[murf.TTS] = murf.TTS(**murf_options)
+        super().__init__(
+            capabilities=tts.TTSCapabilities(streaming=True),
+            sample_rate=self._murf.sample_rate,
+            num_channels=self._murf.num_channels,
+        )
+        self.stats = stats
+        self._on_use = on_use
+        self._model, self._provider = self._murf.model, self._murf.provider
+        self._open_streams: Set[Union[_TimedStream, _TimedChunkedStream]] = set()
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def provider(self) -> str:
+        return self._provider
+
+    def _murf_tts(self) -> murf.TTS:
+        if self._murf is None:
+            self._murf = murf.TTS(**self._murf_options)
+        return self._murf
+
+    def touch(self) -> None:
+        self.stats.last_used = time.monotonic()
+        self.stats.connected = True
+
+    def synthesize(self, text: str, *,
+                   conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> tts.ChunkedStream:
+        self.touch()
+        self._on_use()
+        stream = _TimedChunkedStream(tts=self, murf_tts=self._murf_tts(), input_text=text,
+                                     conn_options=conn_options)
+        self._track(stream)
+        return stream
+
+    def stream(self, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> tts.SynthesizeStream:
+        self.touch()
+        self.stats.streams += 1
+        self._on_use()
+        stream = _TimedStream(tts=self, murf_tts=self._murf_tts(), conn_options=conn_options)
+        self._track(stream)
+        return stream
+
+    def _track(self, stream: Union[_TimedStream, _TimedChunkedStream]) -> None:
+        self._open_streams.add(stream)
+        self.stats.active = len(self._open_streams)
+
+    def _release(self, stream: Union[_TimedStream, _TimedChunkedStream]) -> None:
+        if stream in self._open_streams:
+            self._open_streams.discard(stream)
+            self.stats.active = len(self._open_streams)
+            self.touch()
+
+    def prewarm(self) -> None:
+        self.touch()
+        self.stats.warmups += 1
+        self._on_use()
+        self._murf_tts().prewarm()
+
+    async def close_connections(self) -> None:
+        """Close the murf TTS (and its sockets); the next stream or warm-up opens a new one."""
+        murf_tts, self._murf = self._murf, None
+        if murf_tts is not None:
+            await murf_tts.aclose()
+        self.stats.connected = False
+
+    async def aclose(self) -> None:
+        for stream in list(self._open_streams):
+            await stream.aclose()
+        await self.close_connections()
+
+
+class VoicePool:
+    """
+    One PooledTTS per tutor voice, shared by every room in the worker.
+
+    A voice's TTS is built on first use. warm() opens its connection
+    ahead of the first utterance (at session start, or when a handoff to
+    that voice is likely); voices with no audio for idle_timeout seconds
+    have their sockets closed by a background reaper.
+    """
+
+    def __init__(self, voices: Optional[Dict[str, str]] = None, *,
+                 idle_timeout: float = VOICE_IDLE_TIMEOUT, **tts_options):
+        self.voices = dict(voices or VOICES)
+        self.idle_timeout = idle_timeout
+        self._tts_options = {"model": TTS_MODEL, **tts_options}
+        self._tts: Dict[str, PooledTTS] = {}
+        self.stats: Dict[str, VoiceStats] = {name: VoiceStats() for name in self.voices}
+        self._reaper: Optional[asyncio.Task] = None
+
+    def get(self, name: str) -> PooledTTS:
+        voice = self._tts.get(name)
+        if voice is None:
+            voice = PooledTTS(stats=self.stats[name], on_use=self._ensure_reaper,
+                              voice=self.voices[name], **self._tts_options)
+            self._tts[name] = voice
+        return voice
+
+    def warm(self, *names: str) -> None:
+        """Start opening a connection for each voice in the background."""
+        for name in names:
+            self.get(name).prewarm()
+
+    # --- Idle connections ---
+    def _ensure_reaper(self) -> None:
+        if self._reaper is not None and not self._reaper.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._reaper = loop.create_task(self._reap_idle())
+
+    async def _reap_idle(self) -> None:
+        while True:
+            await asyncio.sleep(self.idle_timeout / 2)
+            await self.close_idle()
+
+    async def close_idle(self) -> List[str]:
+        """Close the sockets of every voice idle for idle_timeout. Returns their names."""
+        now = time.monotonic()
+        closed = []
+        for name, voice in self._tts.items():
+            stats = self.stats[name]
+            if stats.connected and not stats.active and now - stats.last_used >= self.idle_timeout:
+                await voice.close_connections()
+                stats.idle_closes += 1
+                closed.append(name)
+        if closed:
+            logger.info(f"Closed idle voice connections: {', '.join(closed)}")
+        return closed
+
+    # --- Metrics ---
+    def report(self) -> Dict[str, dict]:
+        """Per-voice stream counts and time-to-first-audio percentiles (ms)."""
+        report = {}
+        for name in self._tts:
+            stats = self.stats[name]
+            ttfa = sorted(stats.ttfa)
+            report[name] = {
+                "streams": stats.streams,
+                "warmups": stats.warmups,
+                "idle_closes": stats.idle_closes,
+                "ttfa_p50_ms": round(ttfa[len(ttfa) // 2] * 1000, 1) if ttfa else None,
+                "ttfa_p95_ms": round(ttfa[min(len(ttfa) - 1, int(len(ttfa) * 0.95))] * 1000, 1) if ttfa else None,
+            }
+        return report
+
+    async def aclose(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for voice in self._tts.values():
+            await voice.aclose()
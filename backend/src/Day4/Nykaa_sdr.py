@@ -1,7 +1,5 @@
 import logging
-import json
 import os
-from datetime import datetime
 from typing import Annotated, Optional
 
 from dotenv import load_dotenv
@@ -14,83 +12,161 @@ from livekit.agents import (
     cli,
     function_tool,
 )
-from livekit.plugins import google, deepgram, silero, murf
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from livekit.plugins import google, deepgram, murf
 from pydantic import Field
 from dataclasses import dataclass
 
-from Day4.nykaa_database import FAQ_DATA, find_faq_answer
+from Day4 import nykaa_database
+from Day4.nykaa_database import FAQ_DATA, faq_topic_index, find_faq_answer
+from Day4.lead_repository import get_lead_repository
 from Day4.nykaa_order import LeadData
+from common.persistence import persistence
+from common.prompt_cache import content_version, prompt_cache
+from common.prewarm import get_turn_detector, get_vad, prewarm
 
 load_dotenv()
 logger = logging.getLogger("Nykaa_sdr")
 
-# --- JSON HELPER FUNCTIONS ---
-LEADS_FILE = "nykaa_leads.json"
+# --- LEAD STORE HELPERS ---
+def get_last_lead() -> Optional[dict]:
+    """Returns the most recently saved lead, if any."""
+    return get_lead_repository().last()
 
-def get_last_lead():
-    """Reads the JSON file and returns the last lead if it exists."""
-    if not os.path.exists(LEADS_FILE):
-        return None
-    
-    try:
-        with open(LEADS_FILE, "r") as f:
-            data = json.load(f)
-            if data:
-                return data[-1]
-    except Exception:
-        return None
-    return None
-
-def save_lead_to_json(lead_data: LeadData) -> dict:
-    """Saves the current lead to the JSON file."""
-    entry = {
-        "lead_id": lead_data.lead_id,
-        "timestamp": datetime.now().isoformat(),
-        "name": lead_data.name,
-        "email": lead_data.email,
-        "company": lead_data.company,
-        "role": lead_data.role,
-        "use_case": lead_data.use_case,
-        "team_size": lead_data.team_size,
-        "timeline": lead_data.timeline,
-        "call_summary": lead_data.call_summary
-    }
-    
-    # Load existing data or create new list
-    if os.path.exists(LEADS_FILE):
-        with open(LEADS_FILE, "r") as f:
-            try:
-                history = json.load(f)
-            except json.JSONDecodeError:
-                history = []
-    else:
-        history = []
-        
-    history.append(entry)
-    
-    # Write back to file
-    with open(LEADS_FILE, "w") as f:
-        json.dump(history, f, indent=4)
-    
+def find_lead_by_email(email: str) -> Optional[dict]:
+    return get_lead_repository().get_by_email(email)
+
+def save_lead(lead_data: LeadData) -> dict:
+    """
+    Upserts the lead into the lead store, one record per email.
+    Repeat callers update their existing lead (entry["calls"] counts them).
+    """
+    entry, _ = get_lead_repository().upsert(lead_data)
     return entry
 
+# --- PROMPT CONTEXT ---
+# "full" inlines the company context and every FAQ answer (the default, as
+# before); "rag" keeps only a company summary and a topic index in the system
+# prompt and fetches FAQ answers through search_faq, for a much shorter prompt
+PROMPT_MODE = os.getenv("NYKAA_PROMPT_MODE", "full")
+
+# search_faq drops results scoring under this fraction of the best match
+FAQ_RELATIVE_CUTOFF = 0.6
+
+COMPANY_SUMMARY = """
+ABOUT NYKAA:
+India's leading omnichannel beauty, wellness and fashion platform (founded 2012 by Falguni Nayar, listed on NSE/BSE).
+2400+ brands online and in 100+ stores. Nykaa PRO is the membership program for beauty professionals.
+"""
+
+COMPANY_CONTEXT = """
+ABOUT NYKAA:
+Nykaa is India's leading omnichannel beauty, wellness, and fashion platform.
+- Founded in 2012 by Falguni Nayar
+- First Indian unicorn startup headed by a woman
+- Listed on NSE and BSE (November 2021)
+- 100+ physical stores + online presence
+- Over 1 lakh beauty products from 2400+ brands
+- Headquarters: Mumbai
+
+WHAT WE OFFER:
+✓ Makeup & Cosmetics (lipsticks, foundations, eyeshadow, mascaras, etc)
+✓ Skincare (creams, masks, serums, cleansers)
+✓ Haircare & Styling
+✓ Fragrances & Perfumes
+✓ Bath & Body Products
+✓ Wellness Products
+✓ Fashion & Accessories
+✓ Beauty Appliances
+✓ Men's Grooming (Nykaa Man)
+✓ Luxury Brands (MAC, Dior, HUDA Beauty, Charlotte Tilbury)
+
+NYKAA PRO (Professional Program):
+- Exclusive membership for salons, makeup artists, beauticians, hair stylists, academies
+- 100+ professional-relevant brands
+- Exclusive offers and GST benefits
+- 100% genuine products sourced directly from brands
+- Masterclasses and educational content
+"""
+
+FAQ_CONTEXT = """
+NYKAA FAQ & KEY INFORMATION:
+
+Q: What does Nykaa do?
+A: Nykaa is an omnichannel beauty, wellness, and fashion retailer. We offer makeup, skincare, haircare, fragrances, wellness products, and fashion items from 2400+ brands. Shop online at Nykaa.com or visit one of our 100+ stores.
+
+Q: Is there a free tier or trial?
+A: For personal shoppers, you can browse and shop on Nykaa.com without membership. For professionals, we offer Nykaa PRO membership - apply at nykaa.com/pro-intro with business proof.
+
+Q: Who is Nykaa for?
+A: Everyone! Personal beauty shoppers (men, women), professionals (makeup artists, beauticians, hair stylists, salon owners), fashion enthusiasts, and wellness seekers.
+
+Q: What brands are available?
+A: We carry 2400+ brands including luxury (MAC, Dior, HUDA Beauty), popular Indian brands (Lakme, Nykaa Cosmetics, Naturals), and international brands (L'Oreal, Charlotte Tilbury, Maybelline).
+
+Q: What is Nykaa PRO?
+A: Professional membership program for beauty professionals offering exclusive deals on 100+ professional brands, GST benefits, masterclasses, and priority support.
+
+Q: How do I become a Nykaa PRO member?
+A: Visit nykaa.com/pro-intro, sign up with your professional proof (business card, salon license, etc), and we verify within 72 hours.
+
+Q: What are delivery times?
+A: Typically 3 days delivery. Free shipping on most orders. Cash on delivery available.
+
+Q: Do you have physical stores?
+A: Yes! 100+ Nykaa stores across India. Store formats include Nykaa Luxe (luxury brands), Nykaa On Trend (popular items), and Beauty Kiosks.
+
+Q: What about returns and exchanges?
+A: We accept returns/exchanges within our policy. Details available on Nykaa.com or call customer service.
+
+Q: Is everything on Nykaa authentic?
+A: Yes! 100% genuine products sourced directly from brands. We have strict quality checks and authentication processes.
+
+Q: Do you have men's products?
+A: Yes! Nykaa Man specializes in men's grooming - shaving creams, beard trimmers, hair care, and wellness products.
+
+Q: What about wellness products?
+A: We have a full wellness range including supplements, skincare focused on wellness, bath products, and health-focused items.
+"""
+
 @dataclass
 class UserContext:
     company_context: str
     faq_context: str
+    retrieval: bool = False  # faq_context is a topic index, answers come from search_faq
+    prompt_version: str = ""  # derived from the contexts when not given
+
+    def __post_init__(self):
+        if not self.prompt_version:
+            self.prompt_version = content_version(self.company_context, self.faq_context, str(self.retrieval))
+
+def new_userdata(mode: str = PROMPT_MODE) -> UserContext:
+    if mode == "full":
+        return UserContext(company_context=COMPANY_CONTEXT, faq_context=FAQ_CONTEXT, prompt_version="full")
+    if mode == "rag":
+        return UserContext(company_context=COMPANY_SUMMARY, faq_context=faq_topic_index(), retrieval=True,
+                           prompt_version="rag")
+    raise ValueError(f"Unknown Nykaa prompt mode '{mode}' (expected 'rag' or 'full')")
+
+def build_instructions(userdata: UserContext) -> str:
+    # Build dynamic context
+    if userdata.retrieval:
+        context_str = f"""
+{userdata.company_context}
 
-class NykaaSDRAgent(Agent):
-    def __init__(self, *, userdata: UserContext) -> None:
-        # Build dynamic context
+FAQ Topics (call search_faq to get the answer before replying):
+{userdata.faq_context}
+"""
+        faq_guideline = "- ALWAYS call search_faq before answering a product/company/pricing question, and answer only from what it returns"
+    else:
         context_str = f"""
 {userdata.company_context}
 
 FAQ Knowledge Base:
 {userdata.faq_context}
 """
+        faq_guideline = "- Use the search_faq tool to pull the exact FAQ answers relevant to a question"
 
-        instructions = f"""
+    return f"""
 You are a professional Sales Development Representative (SDR) for Nykaa, India's leading online beauty and wellness platform.
 
 COMPANY CONTEXT:
@@ -101,7 +177,8 @@ YOUR ROLE:
 2. Ask what brought them here and what they're working on
 3. Answer product/company/pricing questions using the FAQ knowledge base provided
 4. Understand their specific needs and use case
-5. Naturally collect key lead information during the conversation:
+5. Naturally collect key lead information during the conversation (once you have their email,
+   use check_returning_prospect and welcome them back if they've spoken with us before):
    - Name, Email, Company
    - Job Role
    - Use Case (what they want to use Nykaa for)
@@ -115,11 +192,23 @@ YOUR ROLE:
 IMPORTANT GUIDELINES:
 - Be warm, professional, and genuinely interested in their needs
 - Only answer questions using the FAQ data provided - don't make up details
+{faq_guideline}
 - If asked something not in the FAQ, say "That's a great question! Let me note that down for our team"
 - Keep track of what you learn about them naturally - don't make it feel like a rigid form
 - When saving the lead, summarize their key needs and interests in 1-2 sentences
 """
 
+class NykaaSDRAgent(Agent):
+    def __init__(self, *, userdata: UserContext) -> None:
+        # Same context for every session, so this renders once per worker
+        prompt = prompt_cache.render(
+            "nykaa.instructions",
+            userdata.prompt_version,
+            lambda: build_instructions(userdata),
+        )
+        self.prompt_hash = prompt.sha256
+        instructions = prompt.text
+
         super().__init__(
             instructions=instructions,
             tools=[
@@ -127,6 +216,25 @@ IMPORTANT GUIDELINES:
             ],
         )
 
+    @function_tool
+    async def search_faq(
+        self,
+        ctx: RunContext[UserContext],
+        query: Annotated[str, Field(description="The visitor's question, in their own words")],
+        top_k: Annotated[int, Field(description="How many FAQ entries to return (1-5)", ge=1, le=5)] = 3,
+    ) -> str:
+        """
+        Look up the most relevant Nykaa FAQ entries for a question.
+        Use this before answering product, pricing, delivery or policy questions.
+        """
+        # Only answers close to the best match; every result stays in the chat history
+        results = nykaa_database.search_faq(query, top_k, min_relative_score=FAQ_RELATIVE_CUTOFF)
+        if not results:
+            return "No FAQ entry covers that. Tell the visitor you'll note it down for the team."
+        return "\n\n".join(
+            f"Q: {faq.question}\nA: {faq.answer}\n(relevance {score:.2f})" for faq, score in results
+        )
+
     @function_tool
     async def save_lead_to_database(
         self,
@@ -154,97 +262,41 @@ IMPORTANT GUIDELINES:
             timeline=timeline,
             call_summary=call_summary
         )
-        save_lead_to_json(lead_data)
+        entry = await persistence.run(save_lead, lead_data)
+        if entry["calls"] > 1:
+            return f"Lead updated! {name}'s existing record now has today's details (conversation #{entry['calls']})."
         return f"Lead saved successfully! {name} from {lead_data.company} has been added to our pipeline."
 
+    @function_tool
+    async def check_returning_prospect(
+        self,
+        ctx: RunContext[UserContext],
+        email: Annotated[str, Field(description="The visitor's email address")],
+    ) -> str:
+        """
+        Check whether this visitor has spoken with Nykaa before.
+        Call it as soon as you learn their email, so you can welcome them back.
+        """
+        lead = await persistence.run(find_lead_by_email, email)
+        if not lead:
+            return "New prospect - no previous conversations on record."
+        return (f"Returning prospect: {lead['name']} ({lead['company']}), last spoke on {lead['timestamp'][:10]} "
+                f"about '{lead['use_case']}' with timeline '{lead['timeline']}'. Previous notes: {lead['call_summary']}")
 
-server = AgentServer()
+
+server = AgentServer(setup_fnc=prewarm)
 
 @server.rtc_session
 async def main(ctx: JobContext) -> None:
-    # Build context for the agent
-    company_context = """
-ABOUT NYKAA:
-Nykaa is India's leading omnichannel beauty, wellness, and fashion platform.
-- Founded in 2012 by Falguni Nayar
-- First Indian unicorn startup headed by a woman
-- Listed on NSE and BSE (November 2021)
-- 100+ physical stores + online presence
-- Over 1 lakh beauty products from 2400+ brands
-- Headquarters: Mumbai
-
-WHAT WE OFFER:
-✓ Makeup & Cosmetics (lipsticks, foundations, eyeshadow, mascaras, etc)
-✓ Skincare (creams, masks, serums, cleansers)
-✓ Haircare & Styling
-✓ Fragrances & Perfumes
-✓ Bath & Body Products
-✓ Wellness Products
-✓ Fashion & Accessories
-✓ Beauty Appliances
-✓ Men's Grooming (Nykaa Man)
-✓ Luxury Brands (MAC, Dior, HUDA Beauty, Charlotte Tilbury)
-
-NYKAA PRO (Professional Program):
-- Exclusive membership for salons, makeup artists, beauticians, hair stylists, academies
-- 100+ professional-relevant brands
-- Exclusive offers and GST benefits
-- 100% genuine products sourced directly from brands
-- Masterclasses and educational content
-"""
-
-    faq_context = """
-NYKAA FAQ & KEY INFORMATION:
-
-Q: What does Nykaa do?
-A: Nykaa is an omnichannel beauty, wellness, and fashion retailer. We offer makeup, skincare, haircare, fragrances, wellness products, and fashion items from 2400+ brands. Shop online at Nykaa.com or visit one of our 100+ stores.
-
-Q: Is there a free tier or trial?
-A: For personal shoppers, you can browse and shop on Nykaa.com without membership. For professionals, we offer Nykaa PRO membership - apply at nykaa.com/pro-intro with business proof.
-
-Q: Who is Nykaa for?
-A: Everyone! Personal beauty shoppers (men, women), professionals (makeup artists, beauticians, hair stylists, salon owners), fashion enthusiasts, and wellness seekers.
-
-Q: What brands are available?
-A: We carry 2400+ brands including luxury (MAC, Dior, HUDA Beauty), popular Indian brands (Lakme, Nykaa Cosmetics, Naturals), and international brands (L'Oreal, Charlotte Tilbury, Maybelline).
-
-Q: What is Nykaa PRO?
-A: Professional membership program for beauty professionals offering exclusive deals on 100+ professional brands, GST benefits, masterclasses, and priority support.
-
-Q: How do I become a Nykaa PRO member?
-A: Visit nykaa.com/pro-intro, sign up with your professional proof (business card, salon license, etc), and we verify within 72 hours.
-
-Q: What are delivery times?
-A: Typically 3 days delivery. Free shipping on most orders. Cash on delivery available.
-
-Q: Do you have physical stores?
-A: Yes! 100+ Nykaa stores across India. Store formats include Nykaa Luxe (luxury brands), Nykaa On Trend (popular items), and Beauty Kiosks.
-
-Q: What about returns and exchanges?
-A: We accept returns/exchanges within our policy. Details available on Nykaa.com or call customer service.
-
-Q: Is everything on Nykaa authentic?
-A: Yes! 100% genuine products sourced directly from brands. We have strict quality checks and authentication processes.
-
-Q: Do you have men's products?
-A: Yes! Nykaa Man specializes in men's grooming - shaving creams, beard trimmers, hair care, and wellness products.
-
-Q: What about wellness products?
-A: We have a full wellness range including supplements, skincare focused on wellness, bath products, and health-focused items.
-"""
-
-    userdata = UserContext(
-        company_context=company_context,
-        faq_context=faq_context
-    )
+    userdata = new_userdata()
     
     session = AgentSession[UserContext](
         userdata=userdata,
         stt=deepgram.STT(model="nova-3"),
         llm=google.LLM(model="gemini-2.5-pro"),
         tts=murf.TTS(model="en-US-falcon"),
-        turn_detection=MultilingualModel(),
-        vad=silero.VAD.load(),
+        turn_detection=get_turn_detector(ctx),
+        vad=get_vad(ctx),
     )
 
     await session.start(agent=NykaaSDRAgent(userdata=userdata), room=ctx.room)
@@ -0,0 +1,110 @@
+# faq_index.py
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+# --- BM25 SETTINGS ---
+K1 = 1.2
+B = 0.75
+
+# A hit in a keyword or the question says more than a hit in the answer body
+FIELD_WEIGHTS = {
+    "keywords": 3.0,
+    "question": 2.0,
+    "answer": 1.0,
+}
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "am", "be", "do", "does", "did", "i", "me", "my",
+    "you", "your", "we", "our", "it", "its", "to", "of", "for", "and", "or", "in",
+    "on", "at", "with", "can", "any", "there", "this", "that", "what", "how", "about",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _stem(token: str) -> str:
+    """Very light suffix stripping so 'brands'/'brand' and 'tracking'/'track' meet."""
+    if len(token) > 5 and token.endswith("ing"):
+        token = token[:-3]
+        # shipping -> shipp -> ship
+        if len(token) > 2 and token[-1] == token[-2] and token[-1] not in "aeiouls":
+            token = token[:-1]
+        return token
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords, stem."""
+    return [_stem(t) for t in _TOKEN_RE.findall(text.lower().replace("'s", "")) if t not in STOPWORDS]
+
+
+class FAQSearchIndex:
+    """
+    BM25 index over FAQ questions, answers and keywords.
+
+    Field hits are weighted (BM25F-style) into one term frequency per FAQ.
+    Every (term, FAQ) weight is precomputed at build time, so a query is a
+    few dict lookups and additions.
+    """
+
+    def __init__(self, faqs: Iterable):
+        self.faqs = list(faqs)
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.faqs)
+
+    def _build(self) -> None:
+        doc_tfs: List[Dict[str, float]] = []
+        doc_lengths: List[float] = []
+        for faq in self.faqs:
+            tf: Dict[str, float] = defaultdict(float)
+            fields = (
+                ("question", faq.question),
+                ("answer", faq.answer),
+                ("keywords", " ".join(faq.keywords)),
+            )
+            for field_name, text in fields:
+                for token in tokenize(text):
+                    tf[token] += FIELD_WEIGHTS[field_name]
+            doc_tfs.append(tf)
+            doc_lengths.append(sum(tf.values()))
+
+        n_docs = len(self.faqs)
+        avg_length = (sum(doc_lengths) / n_docs) if n_docs else 0.0
+        document_frequency: Dict[str, int] = defaultdict(int)
+        for tf in doc_tfs:
+            for term in tf:
+                document_frequency[term] += 1
+
+        postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for doc_id, tf in enumerate(doc_tfs):
+            norm = K1 * (1 - B + B * doc_lengths[doc_id] / avg_length)
+            for term, freq in tf.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                postings[term].append((doc_id, idf * freq * (K1 + 1) / (freq + norm)))
+        self._postings = dict(postings)
+
+    def search(self, query: str, k: int = 3, min_relative_score: float = 0.0) -> List[Tuple[object, float]]:
+        """
+        Top-`k` (faq, score) pairs for `query`, best first. Empty if nothing
+        matches. Results scoring below `min_relative_score` x the best score
+        are dropped, so weak tail matches don't pad the answer.
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            for doc_id, weight in self._postings.get(term, ()):
+                scores[doc_id] += weight
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        if ranked and min_relative_score:
+            cutoff = ranked[0][1] * min_relative_score
+            ranked = [item for item in ranked if item[1] >= cutoff]
+        return [(self.faqs[doc_id], score) for doc_id, score in ranked]
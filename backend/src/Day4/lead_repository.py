@@ -0,0 +1,203 @@
+# lead_repository.py
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from Day4.nykaa_order import LeadData, LeadQualification
+
+LEADS_FILE = "nykaa_leads.json"        # legacy list-of-dicts file, imported into an empty store
+LEADS_SQLITE_FILE = "nykaa_leads.db"   # the live store
+
+HOT_LEAD_SCORE = 20  # e.g. "now" + a professional or business use case
+
+# Fields as saved in the legacy JSON file, in order
+LEAD_FIELDS = [
+    "lead_id", "timestamp", "name", "email", "company", "role",
+    "use_case", "team_size", "timeline", "call_summary",
+]
+COLUMNS = ["email_key"] + LEAD_FIELDS + ["score", "first_seen", "calls"]
+
+# Optional fields that shouldn't wipe out a value we already know
+_OPTIONAL_FIELDS = ("company", "role", "team_size")
+_NOT_SPECIFIED = "Not Specified"
+
+
+def normalize_email(email: str) -> str:
+    """
+    Dedup key for an email: trimmed, lower-cased, without a mailto: prefix.
+    '+tag' addresses stay distinct; not every provider treats them as aliases.
+    """
+    email = email.strip().lower()
+    if email.startswith("mailto:"):
+        email = email[len("mailto:"):]
+    return email
+
+
+def _is_dedup_key(key: str) -> bool:
+    # "", "not specified" and other placeholders aren't anyone's address
+    return "@" in key
+
+
+class LeadRepository:
+    """
+    Leads stored one row per normalized email in SQLite.
+
+    Saving a lead upserts its row (repeat callers update their existing
+    lead instead of adding a duplicate), and lookups by email, timeline,
+    score or time use SQL indexes, so nothing loads the whole lead list.
+    """
+
+    def __init__(self, db_path: str = LEADS_SQLITE_FILE):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS leads (
+                email_key TEXT PRIMARY KEY,
+                lead_id TEXT, timestamp TEXT, name TEXT, email TEXT, company TEXT, role TEXT,
+                use_case TEXT, team_size TEXT, timeline TEXT, call_summary TEXT,
+                score INTEGER, first_seen TEXT, calls INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS leads_timeline_score ON leads (timeline, score DESC);
+            CREATE INDEX IF NOT EXISTS leads_score ON leads (score DESC, timestamp DESC);
+            CREATE INDEX IF NOT EXISTS leads_timestamp ON leads (timestamp);
+        """)
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[dict]:
+        if row is None:
+            return None
+        entry = dict(row)
+        entry.pop("email_key")
+        return entry
+
+    # --- Writes ---
+    def upsert(self, lead: LeadData, timestamp: Optional[str] = None) -> Tuple[dict, bool]:
+        """
+        Insert a lead, or update the existing lead with the same email.
+        Leads without a usable email are always inserted as new rows.
+        Returns (entry, created).
+        """
+        key = normalize_email(lead.email)
+        now = timestamp or datetime.now().isoformat()
+        with self._lock:
+            existing = None
+            if _is_dedup_key(key):
+                existing = self._to_dict(self._conn.execute(
+                    "SELECT * FROM leads WHERE email_key = ?", (key,)
+                ).fetchone())
+            else:
+                key = f"no-email:{uuid.uuid4().hex}"
+
+            entry = {name: getattr(lead, name) for name in LEAD_FIELDS if name != "timestamp"}
+            entry["timestamp"] = now
+            entry["timeline"] = entry["timeline"].strip().lower()
+            if existing:
+                entry["lead_id"] = existing["lead_id"]
+                for name in _OPTIONAL_FIELDS:
+                    if entry[name] == _NOT_SPECIFIED and existing[name] != _NOT_SPECIFIED:
+                        entry[name] = existing[name]
+                entry["first_seen"] = existing["first_seen"]
+                entry["calls"] = existing["calls"] + 1
+            else:
+                entry["first_seen"] = now
+                entry["calls"] = 1
+            entry["score"] = LeadQualification.score_lead(LeadData(**{
+                name: entry[name] for name in LEAD_FIELDS if name != "timestamp"
+            }))
+
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO leads ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})",
+                [key] + [entry[name] for name in COLUMNS[1:]],
+            )
+            self._conn.commit()
+        return {name: entry[name] for name in COLUMNS[1:]}, existing is None
+
+    def import_records(self, records: List[dict]) -> int:
+        """Upsert legacy JSON records oldest first, so the latest save per email wins."""
+        for record in sorted(records, key=lambda r: r.get("timestamp", "")):
+            fields = {name: record[name] for name in LEAD_FIELDS if name in record and name != "timestamp"}
+            self.upsert(LeadData(**fields), timestamp=record.get("timestamp"))
+        return len(self)
+
+    # --- Reads ---
+    def get_by_email(self, email: str) -> Optional[dict]:
+        key = normalize_email(email)
+        if not _is_dedup_key(key):
+            return None
+        row = self._conn.execute("SELECT * FROM leads WHERE email_key = ?", (key,)).fetchone()
+        return self._to_dict(row)
+
+    def last(self) -> Optional[dict]:
+        """The most recently saved lead."""
+        row = self._conn.execute("SELECT * FROM leads ORDER BY timestamp DESC LIMIT 1").fetchone()
+        return self._to_dict(row)
+
+    def query(self, timeline: Optional[str] = None, min_score: Optional[int] = None,
+              max_score: Optional[int] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, limit: Optional[int] = None) -> List[dict]:
+        """Leads matching every given filter, highest score first, newest first on ties."""
+        clauses, params = [], []
+        if timeline is not None:
+            clauses.append("timeline = ?")
+            params.append(timeline.lower())
+        if min_score is not None:
+            clauses.append("score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("score <= ?")
+            params.append(max_score)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until.isoformat())
+        sql = "SELECT * FROM leads"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY score DESC, timestamp DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._to_dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def hot_leads(self, days: int = 7, min_score: int = HOT_LEAD_SCORE,
+                  now: Optional[datetime] = None) -> List[dict]:
+        """High-scoring leads saved in the last `days` days ("hot leads this week")."""
+        since = (now or datetime.now()) - timedelta(days=days)
+        return self.query(min_score=min_score, since=since)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_repository: Optional[LeadRepository] = None
+
+
+def get_lead_repository() -> LeadRepository:
+    """
+    Process-wide repository, opened on first use. An empty store is seeded
+    from nykaa_leads.json if present (duplicates by email are merged).
+    """
+    global _repository
+    if _repository is None:
+        repo = LeadRepository()
+        if len(repo) == 0 and os.path.exists(LEADS_FILE):
+            try:
+                with open(LEADS_FILE) as f:
+                    repo.import_records(json.load(f))
+            except json.JSONDecodeError:
+                pass
+        _repository = repo
+    return _repository
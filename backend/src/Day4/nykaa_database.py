@@ -1,6 +1,8 @@
 # nykaa_database.py
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+from Day4.faq_index import FAQSearchIndex
 
 # --- COMMON INSTRUCTIONS ---
 COMMON_INSTRUCTIONS = """
@@ -96,20 +98,31 @@ FAQ_DATA = [
     ),
 ]
 
-# --- SEARCH FUNCTION ---
+# --- SEARCH INDEX ---
+# Built once at import; rebuild it if FAQ_DATA changes
+FAQ_INDEX = FAQSearchIndex(FAQ_DATA)
+
+# --- SEARCH FUNCTIONS ---
+def search_faq(query: str, top_k: int = 3, min_relative_score: float = 0.0) -> List[Tuple[FAQItem, float]]:
+    """
+    BM25-ranked FAQ search over questions, answers and keywords.
+    Returns up to top_k (faq, score) pairs, best match first.
+    """
+    return FAQ_INDEX.search(query, top_k, min_relative_score)
+
+def faq_topic_index() -> str:
+    """
+    One line per FAQ question. In retrieval mode this stands in for the
+    full FAQ text in the system prompt; answers come from search_faq.
+    """
+    return "\n".join(f"- {faq.question}" for faq in FAQ_DATA)
+
 def find_faq_answer(user_question: str) -> Optional[str]:
     """
-    Simple keyword-based FAQ search.
-    Returns the answer if a match is found, else None.
+    Returns the answer of the best-ranked FAQ, or None if nothing matches.
     """
-    user_question_lower = user_question.lower()
-    
-    for faq in FAQ_DATA:
-        for keyword in faq.keywords:
-            if keyword in user_question_lower:
-                return faq.answer
-    
-    return None
+    results = search_faq(user_question, top_k=1)
+    return results[0][0].answer if results else None
 
 # --- HELPER CLASS FOR UI/VOICE ---
 class FakeDB:
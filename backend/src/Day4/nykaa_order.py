@@ -1,5 +1,9 @@
 # nykaa_order.py
-from typing import Optional
+import bisect
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
 from pydantic import BaseModel, Field
 import uuid
 
@@ -66,19 +70,22 @@ class LeadQualification:
         "other": 3
     }
     
+    # Checked in this order; the first category with a keyword in the use case wins
+    USE_CASE_KEYWORDS = (
+        ("professional_wholesale", ("salon", "beautician", "makeup artist", "professional", "wholesale")),
+        ("business_reseller", ("resell", "business", "store")),
+        ("personal_shopping", ("personal", "myself", "shopping", "own use")),
+    )
+    
     @staticmethod
     def categorize_use_case(use_case: str) -> str:
         """Categorize the use case."""
         use_case_lower = use_case.lower()
         
-        if any(word in use_case_lower for word in ["salon", "beautician", "makeup artist", "professional", "wholesale"]):
-            return "professional_wholesale"
-        elif any(word in use_case_lower for word in ["resell", "business", "store"]):
-            return "business_reseller"
-        elif any(word in use_case_lower for word in ["personal", "myself", "shopping", "own use"]):
-            return "personal_shopping"
-        else:
-            return "other"
+        for category, words in LeadQualification.USE_CASE_KEYWORDS:
+            if any(word in use_case_lower for word in words):
+                return category
+        return "other"
     
     @staticmethod
     def score_lead(lead: LeadData) -> int:
@@ -104,4 +111,122 @@ class LeadQualification:
         if lead.company != "Not Specified" and lead.company.lower() not in ["self-employed", "freelance"]:
             score += 5
         
-        return min(score, 100)  # Cap at 100
\ No newline at end of file
+        return min(score, 100)  # Cap at 100
+
+    @staticmethod
+    def score_leads(leads: "LeadColumns") -> List[int]:
+        """
+        Score a whole column set of leads at once.
+        Returns the same scores as score_lead, in row order.
+        """
+        return _score_columns(leads)
+
+
+# --- BATCH SCORING ---
+@dataclass
+class LeadColumns:
+    """
+    Leads stored column-wise (one list per field), for bulk re-scoring.
+    Only the fields the scorer reads are kept.
+    """
+    lead_id: List[str] = field(default_factory=list)
+    timeline: List[str] = field(default_factory=list)
+    use_case: List[str] = field(default_factory=list)
+    team_size: List[str] = field(default_factory=list)
+    company: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.lead_id)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "LeadColumns":
+        """Build columns from lead dicts (as saved in nykaa_leads.json), with LeadData defaults."""
+        columns = cls()
+        for record in records:
+            columns.lead_id.append(record.get("lead_id", ""))
+            columns.timeline.append(record["timeline"])
+            columns.use_case.append(record["use_case"])
+            columns.team_size.append(record.get("team_size", "Not Specified"))
+            columns.company.append(record.get("company", "Not Specified"))
+        return columns
+
+    @classmethod
+    def from_json(cls, path: str = "nykaa_leads.json") -> "LeadColumns":
+        with open(path) as f:
+            return cls.from_records(json.load(f))
+
+
+class _UseCaseMatcher:
+    """
+    Every use-case keyword compiled into one pattern, so a whole column is
+    categorized in a single regex pass instead of one `in` scan per keyword
+    per lead.
+
+    The pattern is a zero-width lookahead, so it tries a match at every
+    position and overlapping keywords are not skipped. Alternatives are
+    ordered by category priority, so when two keywords start at the same
+    position the higher-priority one is reported. The best category over
+    all positions is what the sequential checks in categorize_use_case
+    would return.
+    """
+
+    def __init__(self, keyword_groups):
+        self.categories = [category for category, _ in keyword_groups]
+        self.rank: Dict[str, int] = {}
+        ordered = []
+        for rank, (_, words) in enumerate(keyword_groups):
+            for word in words:
+                if word not in self.rank:
+                    self.rank[word] = rank
+                    ordered.append(word)
+        self.pattern = re.compile("(?=(" + "|".join(re.escape(w) for w in ordered) + "))")
+
+    def categorize(self, texts: List[str]) -> List[str]:
+        """Categories for already-lowercased, newline-free texts."""
+        other = len(self.categories)
+        best = [other] * len(texts)
+        # One scan over the joined column; match offsets map back to rows
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        blob = "\n".join(texts)
+        for match in self.pattern.finditer(blob):
+            row = bisect.bisect_right(starts, match.start()) - 1
+            rank = self.rank[match.group(1)]
+            if rank < best[row]:
+                best[row] = rank
+        return [self.categories[r] if r < other else "other" for r in best]
+
+
+_USE_CASE_MATCHER = _UseCaseMatcher(LeadQualification.USE_CASE_KEYWORDS)
+
+
+def _score_columns(leads: LeadColumns) -> List[int]:
+    # Use cases repeat a lot across a backlog; categorize each distinct one once
+    distinct: Dict[str, int] = {}
+    texts: List[str] = []
+    rows: List[int] = []
+    for use_case in leads.use_case:
+        # Newline separates rows in the joined scan; NUL matches no keyword, just like a newline
+        text = use_case.lower().replace("\n", "\0")
+        slot = distinct.get(text)
+        if slot is None:
+            slot = distinct[text] = len(texts)
+            texts.append(text)
+        rows.append(slot)
+    categories = _USE_CASE_MATCHER.categorize(texts)
+    use_case_scores = [LeadQualification.USE_CASE_PRIORITY.get(c, 3) for c in categories]
+
+    timeline_scores = LeadQualification.TIMELINE_SCORES
+    no_company_bonus = {"self-employed", "freelance"}
+    scores = []
+    for timeline, slot, team_size, company in zip(leads.timeline, rows, leads.team_size, leads.company):
+        score = timeline_scores.get(timeline.lower(), 5) + use_case_scores[slot]
+        if team_size != "Not Specified" and team_size != "1":
+            score += 5
+        if company != "Not Specified" and company.lower() not in no_company_bonus:
+            score += 5
+        scores.append(min(score, 100))
+    return scores
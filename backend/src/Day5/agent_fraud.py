@@ -1,6 +1,5 @@
 import logging
 import json
-import os
 import asyncio
 from datetime import datetime
 from typing import Annotated, Optional
@@ -18,78 +17,32 @@ from livekit.agents import (
     function_tool,
     get_job_context,
 )
-from livekit.plugins import google, deepgram, silero, murf
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from livekit.plugins import google, deepgram, murf
 from livekit import api
 from pydantic import Field
 
 from Day5.fraud_case import FraudCase
 from Day5.fraud_database import (
+    FRAUD_SQLITE_FILE,
     initialize_fraud_database,
     find_fraud_case_by_username,
-    update_fraud_case,
-    load_all_fraud_cases
+    save_fraud_case,
 )
+from common.persistence import persistence
+from common.prewarm import get_turn_detector, get_vad, prewarm
 
 load_dotenv()
 logger = logging.getLogger("Fraud_Alert_Agent")
 
-# --- JSON HELPER FUNCTIONS (Like Nykaa Agent) ---
-FRAUD_CASES_FILE = "fraud_cases.json"
-
-def save_fraud_case_to_json(case: FraudCase) -> dict:
+# --- SAVE HELPER (Like Nykaa Agent) ---
+def store_fraud_case(case: FraudCase) -> dict:
     """
-    Saves the fraud case to the JSON file.
-    This mirrors the save_lead_to_json from Nykaa agent.
+    Saves the fraud case to the fraud case store.
+    Only this case's row is written; other cases are left untouched.
     """
-    entry = {
-        "case_id": case.case_id,
-        "userName": case.userName,
-        "securityIdentifier": case.securityIdentifier,
-        "cardEnding": case.cardEnding,
-        "transactionName": case.transactionName,
-        "transactionAmount": case.transactionAmount,
-        "transactionTime": case.transactionTime,
-        "transactionCategory": case.transactionCategory,
-        "transactionSource": case.transactionSource,
-        "merchantLocation": case.merchantLocation,
-        "securityQuestion": case.securityQuestion,
-        "securityAnswer": case.securityAnswer,
-        "status": case.status,
-        "outcome_note": case.outcome_note,
-        "timestamp": case.timestamp
-    }
-    
-    # Load existing data or create new list
-    if os.path.exists(FRAUD_CASES_FILE):
-        with open(FRAUD_CASES_FILE, "r") as f:
-            try:
-                history = json.load(f)
-            except json.JSONDecodeError:
-                history = []
-    else:
-        history = []
-    
-    # Update the case if it exists, otherwise append
-    case_index = -1
-    for i, existing_case in enumerate(history):
-        if existing_case.get("case_id") == case.case_id:
-            case_index = i
-            break
-    
-    if case_index >= 0:
-        history[case_index] = entry
-        logger.info(f"✅ Updated existing case {case.case_id} in JSON")
-    else:
-        history.append(entry)
-        logger.info(f"✅ Added new case {case.case_id} to JSON")
-    
-    # Write back to file
-    with open(FRAUD_CASES_FILE, "w") as f:
-        json.dump(history, f, indent=4)
-    
-    logger.info(f"✅ Fraud case saved to {FRAUD_CASES_FILE}")
-    return entry
+    save_fraud_case(case)
+    logger.info(f"✅ Fraud case {case.case_id} saved to {FRAUD_SQLITE_FILE}")
+    return case.to_dict()
 
 
 @dataclass
@@ -284,13 +237,13 @@ Does this transaction look familiar to you?
         case.outcome_note = note
         case.timestamp = datetime.now().isoformat()
         
-        # Save to JSON file
+        # Save to the fraud case store
         try:
-            saved_entry = save_fraud_case_to_json(case)
+            saved_entry = await persistence.run(store_fraud_case, case)
             logger.info(f"✅ Fraud case {case.case_id} saved with status: {status}")
-            return f"✅ Case {case.case_id} updated successfully! Status: {status}. Data saved to fraud_cases.json"
+            return f"✅ Case {case.case_id} updated successfully! Status: {status}. Data saved to the fraud case database."
         except Exception as e:
-            logger.error(f"❌ Error saving fraud case to JSON: {str(e)}")
+            logger.error(f"❌ Error saving fraud case: {str(e)}")
             return f"Error saving case: {str(e)}"
 
     @function_tool
@@ -326,7 +279,7 @@ async def hangup_call():
     await ctx.api.room.delete_room(api.DeleteRoomRequest(room=ctx.room.name))
 
 
-server = AgentServer()
+server = AgentServer(setup_fnc=prewarm)
 
 
 @server.rtc_session(agent_name="fraud-alert-agent")
@@ -342,17 +295,8 @@ async def main(ctx: JobContext) -> None:
     
     # Initialize fraud database
     logger.info("🔄 Initializing fraud database...")
-    initialize_fraud_database()
-    
-    # Verify fraud_cases.json exists
-    if os.path.exists(FRAUD_CASES_FILE):
-        with open(FRAUD_CASES_FILE, "r") as f:
-            cases = json.load(f)
-            logger.info(f"✅ Fraud database initialized with {len(cases)} cases")
-            for case in cases:
-                logger.info(f"   - {case['case_id']}: {case['userName']} ({case['status']})")
-    else:
-        logger.error("❌ fraud_cases.json not found!")
+    case_count = initialize_fraud_database()
+    logger.info(f"✅ Fraud database initialized with {case_count} cases")
     
     # Detect call type
     dial_info = json.loads(ctx.job.metadata or '{}')
@@ -390,8 +334,8 @@ async def main(ctx: JobContext) -> None:
         stt=deepgram.STT(model="nova-3"),
         llm=google.LLM(model="gemini-2.5-pro"),
         tts=google.TTS(),
-        turn_detection=MultilingualModel(),
-        vad=silero.VAD.load(),
+        turn_detection=get_turn_detector(ctx),
+        vad=get_vad(ctx),
     )
 
     await session.start(agent=FraudAlertAgent(userdata=userdata), room=ctx.room)
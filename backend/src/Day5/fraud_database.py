@@ -4,10 +4,14 @@
 
 import json
 import os
-from typing import Optional, List
+import sqlite3
+import threading
+from dataclasses import fields, replace
+from typing import Dict, Optional, List
 from Day5.fraud_case import FraudCase
 
-FRAUD_DB_FILE = "fraud_cases.json"
+FRAUD_DB_FILE = "fraud_cases.json"     # seed data, read once into an empty store
+FRAUD_SQLITE_FILE = "fraud_cases.db"   # the live store
 
 # Mock fraud cases database
 MOCK_FRAUD_CASES = [
@@ -64,51 +68,154 @@ MOCK_FRAUD_CASES = [
     }
 ]
 
-def initialize_fraud_database():
-    """Initialize the fraud database JSON file with mock data if it doesn't exist"""
-    if not os.path.exists(FRAUD_DB_FILE):
-        with open(FRAUD_DB_FILE, "w") as f:
-            json.dump(MOCK_FRAUD_CASES, f, indent=4)
-    return load_all_fraud_cases()
+# Column order follows the FraudCase dataclass
+CASE_COLUMNS = [f.name for f in fields(FraudCase)]
+
+
+class FraudCaseRepository:
+    """
+    Fraud cases stored one row per case in SQLite.
+
+    Lookups by case_id and by (case-insensitive) userName are served from
+    in-memory dicts, and saving a case writes only that case's row, so
+    verification and status updates cost the same however many cases exist.
+    """
+
+    def __init__(self, db_path: str = FRAUD_SQLITE_FILE):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(
+            f"{name} REAL" if name == "transactionAmount" else f"{name} TEXT"
+            for name in CASE_COLUMNS
+        )
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS fraud_cases ({columns}, PRIMARY KEY (case_id))"
+        )
+        self._conn.commit()
+
+        self._by_id: Dict[str, FraudCase] = {}
+        self._by_username: Dict[str, str] = {}  # lower-cased userName -> case_id
+        self.reload()
+
+    # --- Index maintenance ---
+    def _index(self, case: FraudCase) -> None:
+        self._by_id[case.case_id] = case
+        self._by_username[case.userName.lower()] = case.case_id
+
+    def reload(self) -> None:
+        """Rebuild the in-memory indexes from the database."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(CASE_COLUMNS)} FROM fraud_cases ORDER BY rowid"
+            ).fetchall()
+            self._by_id.clear()
+            self._by_username.clear()
+            for row in rows:
+                self._index(FraudCase(**dict(zip(CASE_COLUMNS, row))))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    # --- Reads ---
+    def get(self, case_id: str) -> Optional[FraudCase]:
+        case = self._by_id.get(case_id)
+        # Hand out copies so callers can edit a case before saving it
+        return replace(case) if case else None
+
+    def find_by_username(self, username: str) -> Optional[FraudCase]:
+        case_id = self._by_username.get(username.lower())
+        return self.get(case_id) if case_id else None
+
+    def all(self) -> List[FraudCase]:
+        return [replace(case) for case in self._by_id.values()]
+
+    # --- Writes ---
+    def save(self, case: FraudCase) -> FraudCase:
+        """Insert or update a single case."""
+        placeholders = ", ".join("?" for _ in CASE_COLUMNS)
+        values = [getattr(case, name) for name in CASE_COLUMNS]
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO fraud_cases ({', '.join(CASE_COLUMNS)}) VALUES ({placeholders})",
+                values,
+            )
+            self._conn.commit()
+            old = self._by_id.get(case.case_id)
+            if old and old.userName.lower() != case.userName.lower():
+                self._by_username.pop(old.userName.lower(), None)
+            self._index(replace(case))
+        return case
+
+    def save_many(self, cases: List[FraudCase]) -> None:
+        for case in cases:
+            self.save(case)
+
+    def update_status(self, case_id: str, status: str, outcome_note: str) -> bool:
+        """Change one case's status and note. Returns False if the case doesn't exist."""
+        with self._lock:
+            case = self._by_id.get(case_id)
+            if case is None:
+                return False
+            self._conn.execute(
+                "UPDATE fraud_cases SET status = ?, outcome_note = ? WHERE case_id = ?",
+                (status, outcome_note, case_id),
+            )
+            self._conn.commit()
+            case.status = status
+            case.outcome_note = outcome_note
+        return True
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_repository: Optional[FraudCaseRepository] = None
+
+
+def get_fraud_repository() -> FraudCaseRepository:
+    """Process-wide repository, opened on first use."""
+    global _repository
+    if _repository is None:
+        _repository = FraudCaseRepository()
+    return _repository
+
+
+def initialize_fraud_database() -> int:
+    """
+    Make sure the fraud store has data. An empty store is seeded from
+    fraud_cases.json if present, otherwise from the mock cases.
+    Returns the number of cases in the store.
+    """
+    repo = get_fraud_repository()
+    if len(repo) == 0:
+        seed = MOCK_FRAUD_CASES
+        if os.path.exists(FRAUD_DB_FILE):
+            try:
+                with open(FRAUD_DB_FILE, "r") as f:
+                    seed = json.load(f)
+            except json.JSONDecodeError:
+                pass
+        repo.save_many([FraudCase.from_dict(case) for case in seed])
+    return len(repo)
 
 def load_all_fraud_cases() -> List[FraudCase]:
     """Load all fraud cases from database"""
-    try:
-        with open(FRAUD_DB_FILE, "r") as f:
-            data = json.load(f)
-            return [FraudCase.from_dict(case) for case in data]
-    except Exception as e:
-        print(f"Error loading fraud cases: {e}")
-        return []
+    return get_fraud_repository().all()
 
 def find_fraud_case_by_username(username: str) -> Optional[FraudCase]:
     """Find a fraud case by username"""
-    cases = load_all_fraud_cases()
-    for case in cases:
-        if case.userName.lower() == username.lower():
-            return case
-    return None
+    return get_fraud_repository().find_by_username(username)
 
 def update_fraud_case(case_id: str, status: str, outcome_note: str) -> bool:
     """Update a fraud case status and outcome note"""
-    cases = load_all_fraud_cases()
-    
-    for case in cases:
-        if case.case_id == case_id:
-            case.status = status
-            case.outcome_note = outcome_note
-            
-            # Save back to file
-            with open(FRAUD_DB_FILE, "w") as f:
-                json.dump([c.to_dict() for c in cases], f, indent=4)
-            return True
-    
-    return False
+    return get_fraud_repository().update_status(case_id, status, outcome_note)
+
+def save_fraud_case(case: FraudCase) -> FraudCase:
+    """Insert or update a whole fraud case"""
+    return get_fraud_repository().save(case)
 
 def get_fraud_case_by_id(case_id: str) -> Optional[FraudCase]:
     """Get a specific fraud case by ID"""
-    cases = load_all_fraud_cases()
-    for case in cases:
-        if case.case_id == case_id:
-            return case
-    return None
+    return get_fraud_repository().get(case_id)
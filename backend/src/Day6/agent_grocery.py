@@ -1,8 +1,5 @@
 import logging
-import json
-import os
-from datetime import datetime
-from typing import Annotated, Optional
+from typing import Annotated, List, Optional
 
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -14,33 +11,27 @@ from livekit.agents import (
     cli,
     function_tool,
 )
-from livekit.plugins import google, deepgram, silero, murf
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from livekit.plugins import google, deepgram, murf
 from pydantic import Field
 from dataclasses import dataclass
 
+from Day6 import grocery_database
 from Day6.grocery_database import (
-    PRODUCT_CATALOG, RECIPE_CATALOG, GroceryDB,
-    search_products, find_product_by_id, find_recipe
+    CatalogSnapshot, GroceryDB, current_catalog,
+    search_products, find_product_by_id, recipe_ingredients, resolve_recipe_request
 )
-from Day6.grocery_order import CartState, OrderState, OrderData, format_order_summary
+from Day6.grocery_order import CartChange, CartState, OrderState, OrderData, format_order_summary
+from Day6.order_store import order_store
+from common.persistence import persistence
+from common.prompt_cache import content_version, prompt_cache
+from common.prewarm import get_turn_detector, get_vad, prewarm
 
 load_dotenv()
 logger = logging.getLogger("grocery_agent")
 
 # --- JSON HELPER FUNCTIONS ---
-ORDERS_DIR = "orders"
-ORDER_HISTORY_FILE = os.path.join(ORDERS_DIR, "order_history.json")
-
-def ensure_orders_directory():
-    """Create orders directory if it doesn't exist."""
-    if not os.path.exists(ORDERS_DIR):
-        os.makedirs(ORDERS_DIR)
-
 def save_order_to_json(order: OrderData) -> dict:
-    """Save order to individual file and history."""
-    ensure_orders_directory()
-    
+    """Append the order to the sharded order store."""
     # Convert order to dict
     order_dict = {
         "order_id": order.order_id,
@@ -54,26 +45,32 @@ def save_order_to_json(order: OrderData) -> dict:
         "special_instructions": order.special_instructions
     }
     
-    # Save individual order file
-    order_file = os.path.join(ORDERS_DIR, f"{order.order_id}.json")
-    with open(order_file, 'w') as f:
-        json.dump(order_dict, f, indent=2)
-    
-    # Update order history
-    history = []
-    if os.path.exists(ORDER_HISTORY_FILE):
-        with open(ORDER_HISTORY_FILE, 'r') as f:
-            try:
-                history = json.load(f)
-            except json.JSONDecodeError:
-                history = []
-    
-    history.append(order_dict)
-    
-    with open(ORDER_HISTORY_FILE, 'w') as f:
-        json.dump(history, f, indent=2)
-    
-    return order_dict
+    return order_store.append(order_dict)
+
+# --- PROMPTS ---
+def build_catalog_info(catalog: CatalogSnapshot) -> str:
+    offer_lines = []
+    for category in dict.fromkeys(p.category for p in catalog.products):
+        names = [p.name for p in catalog.products if p.category == category]
+        offer_lines.append(f"• {category.replace('_', ' ').title()}: {', '.join(names)}")
+    offers = "\n".join(offer_lines)
+    recipes = "\n".join(f"- {recipe.name.capitalize()}" for recipe in catalog.recipes)
+    return f"""
+ABOUT {catalog.store_name}:
+{catalog.store_description}.
+
+WHAT WE OFFER:
+{offers}
+• {len(catalog.products)} products from trusted brands
+• Fast delivery within {catalog.delivery_time}
+• Fresh, high-quality products
+
+AVAILABLE RECIPES:
+We can help you get ingredients for:
+{recipes}
+
+Just say "I need ingredients for pasta" and we'll add everything you need!
+"""
 
 # --- USER CONTEXT ---
 @dataclass
@@ -82,12 +79,14 @@ class UserContext:
     catalog_info: str
     cart: CartState
     order_state: OrderState
+    prompt_version: str = ""  # catalog version; derived from catalog_info when not given
 
-# --- AGENT CLASS ---
-class GroceryAgent(Agent):
-    def __init__(self, *, userdata: UserContext) -> None:
-        
-        instructions = f"""
+    def __post_init__(self):
+        if not self.prompt_version:
+            self.prompt_version = content_version(self.store_name, self.catalog_info)
+
+def build_instructions(userdata: UserContext) -> str:
+    return f"""
 You are a friendly and helpful food & grocery ordering assistant for {userdata.store_name}.
 
 STORE INFORMATION:
@@ -104,6 +103,8 @@ YOUR ROLE:
 IMPORTANT GUIDELINES:
 - Be conversational and natural - don't just list tool outputs
 - When customers ask for "ingredients for X", use get_recipe_ingredients first to see what's needed, then use add_recipe_to_cart to add all items at once
+- If they say how many people it's for ("pasta for four"), pass servings so quantities are scaled
+- When one request changes several cart items (e.g. "two milks, a bread and remove the chips"), make all of them with a single apply_cart_changes call
 - Always confirm what you're adding to the cart so customers know what's happening
 - Ask for clarifications when needed (size, brand, quantity)
 - Keep track of their cart and remind them of items if needed
@@ -117,6 +118,7 @@ AVAILABLE ACTIONS:
 - Add full recipes (multiple items) to cart
 - Remove items from cart
 - Update item quantities
+- Apply several adds/removes/quantity changes in one step
 - View cart contents
 - Clear entire cart
 - Place order (saves to JSON file)
@@ -124,6 +126,18 @@ AVAILABLE ACTIONS:
 Remember: You're here to make grocery shopping easy and enjoyable!
 """
 
+# --- AGENT CLASS ---
+class GroceryAgent(Agent):
+    def __init__(self, *, userdata: UserContext) -> None:
+        
+        prompt = prompt_cache.render(
+            "grocery.instructions",
+            userdata.prompt_version,
+            lambda: build_instructions(userdata),
+        )
+        self.prompt_hash = prompt.sha256
+        instructions = prompt.text
+
         super().__init__(
             instructions=instructions,
             tools=[
@@ -159,27 +173,28 @@ Remember: You're here to make grocery shopping easy and enjoyable!
     async def get_recipe_ingredients(
         self,
         ctx: RunContext[UserContext],
-        recipe_name: Annotated[str, Field(description="Name of the recipe or meal (e.g., 'peanut butter sandwich', 'pasta', 'breakfast')")]
+        recipe_name: Annotated[str, Field(description="Name of the recipe or meal (e.g., 'peanut butter sandwich', 'pasta', 'breakfast')")],
+        servings: Annotated[Optional[int], Field(description="Number of people to feed, if the customer said")] = None
     ) -> str:
         """
         Get the list of ingredients needed for a specific recipe or meal.
         Use this when customer says things like "I need ingredients for..." or "What do I need to make..."
         """
-        recipe = find_recipe(recipe_name)
+        recipe, servings = resolve_recipe_request(recipe_name, servings)
         
         if not recipe:
-            available_recipes = [r.name for r in RECIPE_CATALOG]
+            available_recipes = [r.name for r in current_catalog().recipes]
             return f"Recipe '{recipe_name}' not found. Available recipes: {', '.join(available_recipes)}"
         
-        # Get products for this recipe
+        # Products are resolved when the catalog loads
         ingredients = []
-        for item_id in recipe.item_ids:
-            product = find_product_by_id(item_id)
-            if product:
-                ingredients.append(
-                    f"• {product.name} ({product.brand}, {product.size}) - ${product.price:.2f} [ID: {item_id}]"
-                )
+        for product, quantity in recipe_ingredients(recipe, servings):
+            ingredients.append(
+                f"• {quantity}x {product.name} ({product.brand}, {product.size}) - ${product.price * quantity:.2f} [ID: {product.id}]"
+            )
         
+        if servings:
+            return f"Ingredients for {recipe.name} (serves {servings}):\n" + "\n".join(ingredients)
         return f"Ingredients for {recipe.name}:\n" + "\n".join(ingredients)
 
     @function_tool
@@ -219,36 +234,38 @@ Remember: You're here to make grocery shopping easy and enjoyable!
     async def add_recipe_to_cart(
         self,
         ctx: RunContext[UserContext],
-        recipe_name: Annotated[str, Field(description="Name of the recipe to add all ingredients for")]
+        recipe_name: Annotated[str, Field(description="Name of the recipe to add all ingredients for")],
+        servings: Annotated[Optional[int], Field(description="Number of people to feed, if the customer said")] = None
     ) -> str:
         """
         Add all ingredients for a recipe to the cart at once.
         Use this when customer says "get me ingredients for pasta" or similar requests.
         """
-        recipe = find_recipe(recipe_name)
+        recipe, servings = resolve_recipe_request(recipe_name, servings)
         
         if not recipe:
-            available_recipes = [r.name for r in RECIPE_CATALOG]
+            available_recipes = [r.name for r in current_catalog().recipes]
             return f"Recipe '{recipe_name}' not found. Available recipes: {', '.join(available_recipes)}"
         
         # Add all items from recipe
         added_items = []
-        for item_id in recipe.item_ids:
-            product = find_product_by_id(item_id)
-            if product:
-                ctx.userdata.cart.add_item(
-                    item_id=product.id,
-                    name=product.name,
-                    quantity=1,
-                    price=product.price,
-                    brand=product.brand,
-                    size=product.size,
-                    category=product.category
-                )
-                added_items.append(product.name)
+        for product, quantity in recipe_ingredients(recipe, servings):
+            ctx.userdata.cart.add_item(
+                item_id=product.id,
+                name=product.name,
+                quantity=quantity,
+                price=product.price,
+                brand=product.brand,
+                size=product.size,
+                category=product.category
+            )
+            added_items.append(f"{quantity}x {product.name}" if quantity > 1 else product.name)
         
         cart_total = ctx.userdata.cart.get_total()
         
+        if servings:
+            return (f"✅ Added ingredients for {recipe.name} (serves {servings}): {', '.join(added_items)}\n"
+                    f"Cart total: ${cart_total:.2f}")
         return (f"✅ Added ingredients for {recipe.name}: {', '.join(added_items)}\n"
                 f"Cart total: ${cart_total:.2f}")
 
@@ -299,6 +316,29 @@ Remember: You're here to make grocery shopping easy and enjoyable!
         
         return f"✅ Updated {item_name} quantity to {quantity}. Cart total: ${cart_total:.2f}"
 
+    @function_tool
+    async def apply_cart_changes(
+        self,
+        ctx: RunContext[UserContext],
+        changes: Annotated[
+            List[CartChange],
+            Field(description="Every cart change the customer asked for, in order.", min_length=1),
+        ],
+    ) -> str:
+        """
+        Add, remove and re-quantity several cart items in one step.
+        Use this whenever a request touches more than one item. All changes are
+        checked first; if any is invalid, nothing is changed.
+        """
+        try:
+            applied = ctx.userdata.cart.apply_changes(changes, find_product_by_id)
+        except ValueError as e:
+            return f"❌ No changes made. {e}"
+
+        cart = ctx.userdata.cart
+        return (f"✅ Cart updated: {', '.join(applied)}\n"
+                f"Cart total: ${cart.get_total():.2f} ({cart.get_item_count()} items)")
+
     @function_tool
     async def view_cart(
         self,
@@ -347,8 +387,8 @@ Remember: You're here to make grocery shopping easy and enjoyable!
             special_instructions=special_instructions or ""
         )
         
-        # Save to JSON
-        save_order_to_json(order)
+        # Save to JSON (off the event loop)
+        await persistence.run(save_order_to_json, order)
         
         # Get order summary
         summary = format_order_summary(order)
@@ -362,37 +402,23 @@ Remember: You're here to make grocery shopping easy and enjoyable!
 
 
 # --- SERVER SETUP (MATCHING NYKAA PATTERN) ---
-server = AgentServer()
+server = AgentServer(setup_fnc=prewarm)
 
 @server.rtc_session
 async def main(ctx: JobContext) -> None:
     """Main entry point for the grocery ordering agent."""
     
-    # Store information
-    store_name = "FreshMart Express"
+    # Pick up catalog.json edits without a restart; each session starts on the latest version
+    grocery_database.catalog_loader.start()
+    catalog = current_catalog()
     
-    catalog_info = f"""
-ABOUT {store_name}:
-Your neighborhood online grocery and food ordering platform.
-
-WHAT WE OFFER:
-• Fresh Groceries: bread, eggs, milk, butter, pasta, rice, cheese, and more
-• Delicious Snacks: chips, chocolates, granola bars, nuts, cookies
-• Prepared Food: pizzas, sandwiches, salads, burrito bowls
-• 24+ products from trusted brands
-• Fast delivery within 3 days
-• Fresh, high-quality products
-
-AVAILABLE RECIPES:
-We can help you get ingredients for:
-- Peanut butter sandwich
-- Pasta (for 1 or 2 people)
-- Breakfast basics
-- Cheese sandwich
-- Toast with jam
-
-Just say "I need ingredients for pasta" and we'll add everything you need!
-"""
+    # Store information, rendered once per catalog version
+    store_name = catalog.store_name
+    catalog_info = prompt_cache.render(
+        "grocery.catalog_info",
+        (store_name, catalog.version),
+        lambda: build_catalog_info(catalog),
+    ).text
     
     # Initialize cart and order state
     cart = CartState()
@@ -402,7 +428,8 @@ Just say "I need ingredients for pasta" and we'll add everything you need!
         store_name=store_name,
         catalog_info=catalog_info,
         cart=cart,
-        order_state=order_state
+        order_state=order_state,
+        prompt_version=f"catalog-{catalog.version}",
     )
     
     # Create session
@@ -411,8 +438,8 @@ Just say "I need ingredients for pasta" and we'll add everything you need!
         stt=deepgram.STT(model="nova-3"),
         llm=google.LLM(model="gemini-2.5-pro"),
         tts=murf.TTS(model="en-US-falcon"),
-        turn_detection=MultilingualModel(),
-        vad=silero.VAD.load(),
+        turn_detection=get_turn_detector(ctx),
+        vad=get_vad(ctx),
     )
     
     # Start session
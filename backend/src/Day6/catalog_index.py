@@ -0,0 +1,254 @@
+# catalog_index.py
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# --- INDEX SETTINGS ---
+MAX_GRAM = 3  # every 1-, 2- and 3-character substring of a field is indexed
+
+# How much a hit in each field counts towards the ranking
+FIELD_WEIGHTS = {
+    "name": 50,
+    "keyword": 40,
+    "tag": 30,
+    "category": 20,
+    "brand": 10,
+}
+
+
+def _grams(text: str) -> Set[str]:
+    """All substrings of `text` up to MAX_GRAM characters long."""
+    grams = set()
+    for n in range(1, MAX_GRAM + 1):
+        for i in range(len(text) - n + 1):
+            grams.add(text[i:i + n])
+    return grams
+
+
+class ProductSearchIndex:
+    """
+    N-gram inverted index over the grocery catalog.
+
+    Matches the same products as a plain substring search over name, brand,
+    category, tags and keywords, but only checks the handful of products
+    whose n-grams cover the query instead of scanning the whole catalog.
+    """
+
+    def __init__(self, products: Iterable = ()):
+        self._products: Dict[str, object] = {}
+        self._fields: Dict[str, List[Tuple[str, int]]] = {}
+        self._order: Dict[str, int] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._next_seq = 0
+        # After copy(), posting sets are shared with the other index until
+        # one side changes them; _owned holds the grams already copied
+        self._copy_on_write = False
+        self._owned: Set[str] = set()
+
+        for product in products:
+            self.add(product)
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self._products
+
+    def copy(self) -> "ProductSearchIndex":
+        """
+        A copy to edit for the next catalog version. Posting sets are shared
+        until either index changes one, so this is a few dict copies rather
+        than re-indexing every product.
+        """
+        clone = ProductSearchIndex.__new__(ProductSearchIndex)
+        clone._products = dict(self._products)
+        clone._fields = dict(self._fields)
+        clone._order = dict(self._order)
+        clone._postings = defaultdict(set, self._postings)
+        clone._next_seq = self._next_seq
+        for index in (self, clone):
+            index._copy_on_write = True
+            index._owned = set()
+        return clone
+
+    def _writable_posting(self, gram: str) -> Set[str]:
+        posting = self._postings[gram]
+        if self._copy_on_write and gram not in self._owned:
+            posting = self._postings[gram] = set(posting)
+            self._owned.add(gram)
+        return posting
+
+    # --- Updates ---
+    @staticmethod
+    def _searchable_fields(product) -> List[Tuple[str, int]]:
+        fields = [
+            (product.name.lower(), FIELD_WEIGHTS["name"]),
+            (product.brand.lower(), FIELD_WEIGHTS["brand"]),
+            (product.category.lower(), FIELD_WEIGHTS["category"]),
+        ]
+        fields += [(tag.lower(), FIELD_WEIGHTS["tag"]) for tag in product.tags]
+        fields += [(keyword.lower(), FIELD_WEIGHTS["keyword"]) for keyword in product.keywords]
+        return fields
+
+    def add(self, product) -> None:
+        """Index a product, replacing any existing entry with the same id."""
+        if product.id in self._products:
+            self.remove(product.id)
+
+        fields = self._searchable_fields(product)
+        self._products[product.id] = product
+        self._fields[product.id] = fields
+        self._order[product.id] = self._next_seq
+        self._next_seq += 1
+
+        for text, _ in fields:
+            for gram in _grams(text):
+                self._writable_posting(gram).add(product.id)
+
+    def remove(self, product_id: str) -> None:
+        """Drop a product from the index. Unknown ids are ignored."""
+        fields = self._fields.pop(product_id, None)
+        if fields is None:
+            return
+        del self._products[product_id]
+        del self._order[product_id]
+
+        for text, _ in fields:
+            for gram in _grams(text):
+                if gram not in self._postings:
+                    continue
+                posting = self._writable_posting(gram)
+                posting.discard(product_id)
+                if not posting:
+                    del self._postings[gram]
+
+    # --- Lookups ---
+    def _candidates(self, query: str) -> Set[str]:
+        if len(query) <= MAX_GRAM:
+            # Short queries are indexed directly, so the posting list is exact
+            return set(self._postings.get(query, ()))
+
+        # Every product containing the query contains all of its trigrams
+        grams = {query[i:i + MAX_GRAM] for i in range(len(query) - MAX_GRAM + 1)}
+        postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+        if not postings[0]:
+            return set()
+        return set(postings[0]).intersection(*postings[1:])
+
+    def _score(self, product_id: str, query: str) -> int:
+        score = 0
+        for text, weight in self._fields[product_id]:
+            if query not in text:
+                continue
+            field_score = weight
+            if text == query:
+                field_score += 5
+            elif query in text.split():
+                field_score += 3
+            elif text.startswith(query):
+                field_score += 2
+            # Best field decides the rank, extra matching fields break ties
+            score = max(score, field_score) + 1
+        return score
+
+    def search(self, query: str) -> List:
+        """
+        Return products whose name, brand, category, tags or keywords contain
+        `query` (case-insensitive), best matches first.
+        """
+        query = query.lower()
+        if not query:
+            return list(self._products.values())
+
+        scored = []
+        for product_id in self._candidates(query):
+            score = self._score(product_id, query)
+            if score:
+                scored.append((-score, self._order[product_id], product_id))
+
+        scored.sort()
+        return [self._products[product_id] for _, _, product_id in scored]
+
+    def get(self, product_id: str):
+        return self._products.get(product_id)
+
+
+# --- RECIPES ---
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_SERVINGS_RE = re.compile(
+    r"^(?P<phrase>.*?)\s+for\s+(?P<count>\d+|" + "|".join(NUMBER_WORDS) + r")"
+    r"(?:\s+(?:people|persons|servings|adults|kids|of us|guests))?$"
+)
+
+
+def _phrase(text: str) -> str:
+    """Lowercase words only, single-spaced: 'PB&J ' -> 'pb j'."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def parse_servings(text: str) -> Tuple[str, Optional[int]]:
+    """'pasta for four' -> ('pasta', 4). Text without a 'for N' ending comes back with None."""
+    phrase = _phrase(text)
+    match = _SERVINGS_RE.match(phrase)
+    if not match:
+        return phrase, None
+    count = match.group("count")
+    servings = int(count) if count.isdigit() else NUMBER_WORDS[count]
+    return match.group("phrase"), servings if servings > 0 else None
+
+
+class RecipeIndex:
+    """
+    Recipes looked up by name/keyword phrase, with their ingredients
+    resolved to products when the index is built.
+
+    A lookup is an exact phrase hit, a known phrase inside the request
+    ("ingredients for pasta please"), or the request being part of a known
+    phrase ("peanut") - a few dict lookups either way, however many
+    recipes there are.
+    """
+
+    def __init__(self, recipes: Iterable, find_product: Callable[[str], Optional[object]]):
+        self._exact: Dict[str, object] = {}
+        self._partial: Dict[str, object] = {}
+        self._ingredients: Dict[str, Tuple] = {}
+        self._max_words = 0
+
+        # Earlier recipes win a shared phrase, like the old first-match scan
+        for recipe in recipes:
+            for text in [recipe.name] + list(recipe.keywords):
+                phrase = _phrase(text)
+                words = phrase.split()
+                self._max_words = max(self._max_words, len(words))
+                self._exact.setdefault(phrase, recipe)
+                for i in range(len(words)):
+                    for j in range(i + 1, len(words) + 1):
+                        self._partial.setdefault(" ".join(words[i:j]), recipe)
+            self._ingredients[recipe.name] = tuple(
+                product for product in map(find_product, recipe.item_ids) if product is not None
+            )
+
+    def find(self, text: str):
+        phrase = _phrase(text)
+        if not phrase:
+            return None
+        recipe = self._exact.get(phrase)
+        if recipe is not None:
+            return recipe
+
+        words = phrase.split()
+        for length in range(min(len(words), self._max_words), 0, -1):
+            for i in range(len(words) - length + 1):
+                recipe = self._exact.get(" ".join(words[i:i + length]))
+                if recipe is not None:
+                    return recipe
+        return self._partial.get(phrase)
+
+    def ingredients(self, recipe) -> Tuple:
+        """The recipe's products, in recipe order (ids missing from the catalog are skipped)."""
+        return self._ingredients.get(recipe.name, ())
@@ -0,0 +1,131 @@
+# catalog_loader.py
+import asyncio
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+logger = logging.getLogger("catalog-loader")
+
+# Newest catalog file layout this loader understands
+FORMAT_VERSION = 2
+
+# Seconds between checks for a changed catalog file
+CATALOG_POLL_INTERVAL = float(os.getenv("CATALOG_POLL_INTERVAL", "5"))
+
+T = TypeVar("T")
+
+
+class CatalogLoader(Generic[T]):
+    """
+    Loads a versioned JSON catalog file into an immutable snapshot.
+
+    `build(data, version)` turns the parsed file into the snapshot (products,
+    indexes, ...). The file is read once; after start(), a background task
+    polls its mtime/size and rebuilds off the event loop when it changes.
+    The new snapshot replaces the old one in a single assignment, so a
+    reader holding `current` keeps a consistent view and live sessions never
+    wait on a reload. A file that fails to parse or build is logged and skipped.
+    """
+
+    def __init__(self, path, build: Callable[[dict, int], T], *,
+                 poll_interval: float = CATALOG_POLL_INTERVAL):
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.version = 0
+        self.reloads = 0
+        self.failures = 0
+        self._build = build
+        self._current: Optional[T] = None
+        self._stamp: Optional[Tuple[int, int]] = None  # (mtime_ns, size) of the loaded file
+        self._lock = threading.Lock()
+        self._watcher: Optional[asyncio.Task] = None
+
+    @property
+    def current(self) -> T:
+        """The live snapshot, loading the file on first use."""
+        snapshot = self._current
+        if snapshot is None:
+            snapshot = self.load()
+        return snapshot
+
+    def _file_stamp(self) -> Tuple[int, int]:
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    # --- Loading ---
+    def load(self) -> T:
+        """Read and build the file now and swap it in. Errors propagate."""
+        with self._lock:
+            stamp = self._file_stamp()
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                raise ValueError(f"Catalog file must hold a JSON object, not {type(data).__name__}")
+            format_version = data.get("format_version", 1)
+            if format_version > FORMAT_VERSION:
+                raise ValueError(f"Catalog format {format_version} is newer than supported ({FORMAT_VERSION})")
+            snapshot = self._build(data, self.version + 1)
+            self._publish(snapshot, stamp)
+        return snapshot
+
+    def update(self, change: Callable[[T, int], T]) -> T:
+        """
+        Swap in `change(current, next_version)`, e.g. a one-off product edit.
+        Such edits last until the file itself next changes.
+        """
+        if self._current is None:
+            self.load()
+        with self._lock:
+            snapshot = change(self._current, self.version + 1)
+            self._publish(snapshot, self._stamp)
+        return snapshot
+
+    def _publish(self, snapshot: T, stamp: Optional[Tuple[int, int]]) -> None:
+        self.version += 1
+        self._stamp = stamp
+        self._current = snapshot
+
+    def reload_if_changed(self) -> bool:
+        """Reload if the file changed since the last load. Returns True if a new snapshot went live."""
+        try:
+            stamp = self._file_stamp()
+        except OSError as e:
+            logger.warning(f"Cannot stat catalog {self.path}: {e}")
+            return False
+        if stamp == self._stamp:
+            return False
+
+        try:
+            self.load()
+        except Exception as e:
+            # Keep serving the last good catalog (and keep the watcher alive);
+            # don't retry this version of the file
+            self._stamp = stamp
+            self.failures += 1
+            logger.error(f"Catalog reload failed, keeping version {self.version}: {e}")
+            return False
+
+        self.reloads += 1
+        logger.info(f"Catalog reloaded from {self.path.name} (version {self.version})")
+        return True
+
+    # --- Background reload ---
+    def start(self) -> None:
+        """Watch the file for changes from the running event loop (idempotent)."""
+        if self._watcher is not None and not self._watcher.done():
+            return
+        if self._current is None:
+            self.load()
+        self._watcher = asyncio.get_running_loop().create_task(self._watch())
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await asyncio.to_thread(self.reload_if_changed)
+
+    async def aclose(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
@@ -1,6 +1,10 @@
 # grocery_database.py
 from dataclasses import dataclass
-from typing import List, Optional, Dict
+from pathlib import Path
+from typing import List, Optional, Dict, Tuple
+
+from Day6.catalog_index import ProductSearchIndex, RecipeIndex, parse_servings
+from Day6.catalog_loader import CatalogLoader
 
 # --- COMMON INSTRUCTIONS ---
 COMMON_INSTRUCTIONS = """
@@ -28,333 +32,177 @@ class RecipeItem:
     name: str
     item_ids: List[str]
     keywords: List[str]
+    servings: int = 1  # people one set of the ingredients feeds
 
-# --- PRODUCT CATALOG ---
-PRODUCT_CATALOG = [
-    # GROCERIES
-    ProductItem(
-        id="g001",
-        name="Whole Wheat Bread",
-        category="groceries",
-        price=3.99,
-        brand="Nature's Best",
-        size="500g",
-        tags=["vegan", "whole-grain"],
-        keywords=["bread", "whole wheat", "wheat bread", "brown bread"]
-    ),
-    ProductItem(
-        id="g002",
-        name="White Bread",
-        category="groceries",
-        price=2.99,
-        brand="Soft Touch",
-        size="450g",
-        tags=["vegetarian"],
-        keywords=["bread", "white bread", "plain bread"]
-    ),
-    ProductItem(
-        id="g003",
-        name="Eggs",
-        category="groceries",
-        price=4.99,
-        brand="Farm Fresh",
-        size="12 count",
-        tags=["protein", "vegetarian"],
-        keywords=["eggs", "egg", "dozen eggs"]
-    ),
-    ProductItem(
-        id="g004",
-        name="Milk",
-        category="groceries",
-        price=3.49,
-        brand="Dairy Valley",
-        size="1 liter",
-        tags=["dairy", "vegetarian"],
-        keywords=["milk", "dairy", "whole milk"]
-    ),
-    ProductItem(
-        id="g005",
-        name="Butter",
-        category="groceries",
-        price=5.99,
-        brand="Golden Spread",
-        size="250g",
-        tags=["dairy", "vegetarian"],
-        keywords=["butter", "dairy butter"]
-    ),
-    ProductItem(
-        id="g006",
-        name="Peanut Butter",
-        category="groceries",
-        price=6.99,
-        brand="Nutty Delight",
-        size="500g",
-        tags=["vegan", "protein"],
-        keywords=["peanut butter", "pb", "nut butter"]
-    ),
-    ProductItem(
-        id="g007",
-        name="Pasta",
-        category="groceries",
-        price=2.49,
-        brand="Italian Choice",
-        size="500g",
-        tags=["vegan"],
-        keywords=["pasta", "spaghetti", "noodles", "italian"]
-    ),
-    ProductItem(
-        id="g008",
-        name="Tomato Sauce",
-        category="groceries",
-        price=3.99,
-        brand="Red Garden",
-        size="400ml",
-        tags=["vegan", "gluten-free"],
-        keywords=["tomato sauce", "pasta sauce", "marinara", "sauce"]
-    ),
-    ProductItem(
-        id="g009",
-        name="Olive Oil",
-        category="groceries",
-        price=8.99,
-        brand="Mediterranean Gold",
-        size="500ml",
-        tags=["vegan", "gluten-free"],
-        keywords=["olive oil", "oil", "cooking oil"]
-    ),
-    ProductItem(
-        id="g010",
-        name="Rice",
-        category="groceries",
-        price=7.99,
-        brand="Basmati King",
-        size="1kg",
-        tags=["vegan", "gluten-free"],
-        keywords=["rice", "basmati", "grain"]
-    ),
-    ProductItem(
-        id="g011",
-        name="Cheese",
-        category="groceries",
-        price=6.49,
-        brand="Cheddar Classic",
-        size="300g",
-        tags=["dairy", "vegetarian"],
-        keywords=["cheese", "cheddar", "dairy"]
-    ),
-    ProductItem(
-        id="g012",
-        name="Jam",
-        category="groceries",
-        price=4.49,
-        brand="Berry Best",
-        size="350g",
-        tags=["vegan", "gluten-free"],
-        keywords=["jam", "jelly", "strawberry jam", "fruit spread"]
-    ),
-    
-    # SNACKS
-    ProductItem(
-        id="s001",
-        name="Potato Chips",
-        category="snacks",
-        price=2.99,
-        brand="Crispy Crunch",
-        size="150g",
-        tags=["vegan"],
-        keywords=["chips", "potato chips", "crisps", "snack"]
-    ),
-    ProductItem(
-        id="s002",
-        name="Chocolate Bar",
-        category="snacks",
-        price=1.99,
-        brand="Sweet Bliss",
-        size="100g",
-        tags=["vegetarian"],
-        keywords=["chocolate", "candy bar", "sweet"]
-    ),
-    ProductItem(
-        id="s003",
-        name="Granola Bars",
-        category="snacks",
-        price=4.99,
-        brand="Energy Boost",
-        size="6 pack",
-        tags=["vegetarian", "whole-grain"],
-        keywords=["granola", "granola bars", "energy bars", "cereal bars"]
-    ),
-    ProductItem(
-        id="s004",
-        name="Mixed Nuts",
-        category="snacks",
-        price=5.99,
-        brand="Nutty Mix",
-        size="200g",
-        tags=["vegan", "protein"],
-        keywords=["nuts", "mixed nuts", "almonds", "cashews"]
-    ),
-    ProductItem(
-        id="s005",
-        name="Cookies",
-        category="snacks",
-        price=3.49,
-        brand="Baker's Choice",
-        size="250g",
-        tags=["vegetarian"],
-        keywords=["cookies", "biscuits", "chocolate chip"]
-    ),
-    
-    # PREPARED FOOD
-    ProductItem(
-        id="p001",
-        name="Margherita Pizza",
-        category="prepared_food",
-        price=12.99,
-        brand="FreshMart Kitchen",
-        size="medium",
-        tags=["vegetarian"],
-        keywords=["pizza", "margherita", "cheese pizza", "vegetarian pizza"]
-    ),
-    ProductItem(
-        id="p002",
-        name="Pepperoni Pizza",
-        category="prepared_food",
-        price=14.99,
-        brand="FreshMart Kitchen",
-        size="medium",
-        tags=[],
-        keywords=["pizza", "pepperoni", "meat pizza"]
-    ),
-    ProductItem(
-        id="p003",
-        name="Chicken Sandwich",
-        category="prepared_food",
-        price=6.99,
-        brand="FreshMart Kitchen",
-        size="regular",
-        tags=[],
-        keywords=["sandwich", "chicken sandwich", "chicken", "lunch"]
-    ),
-    ProductItem(
-        id="p004",
-        name="Veggie Sandwich",
-        category="prepared_food",
-        price=5.99,
-        brand="FreshMart Kitchen",
-        size="regular",
-        tags=["vegetarian"],
-        keywords=["sandwich", "veggie sandwich", "vegetarian sandwich", "veg"]
-    ),
-    ProductItem(
-        id="p005",
-        name="Caesar Salad",
-        category="prepared_food",
-        price=7.99,
-        brand="FreshMart Kitchen",
-        size="regular",
-        tags=["vegetarian"],
-        keywords=["salad", "caesar salad", "healthy", "greens"]
-    ),
-    ProductItem(
-        id="p006",
-        name="Burrito Bowl",
-        category="prepared_food",
-        price=9.99,
-        brand="FreshMart Kitchen",
-        size="regular",
-        tags=[],
-        keywords=["burrito", "burrito bowl", "mexican", "rice bowl"]
-    ),
-]
+# --- CATALOG SNAPSHOT ---
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """One immutable version of the catalog with its indexes."""
+    version: int
+    revision: int  # the file's own revision number
+    store_name: str
+    store_description: str
+    delivery_time: str
+    products: Tuple[ProductItem, ...]
+    recipes: Tuple[RecipeItem, ...]
+    product_index: ProductSearchIndex
+    recipe_index: RecipeIndex
+
+def _make_snapshot(meta: dict, products: List[ProductItem], recipes: List[RecipeItem],
+                   version: int, product_index: Optional[ProductSearchIndex] = None) -> CatalogSnapshot:
+    if product_index is None:
+        product_index = ProductSearchIndex(products)
+    return CatalogSnapshot(
+        version=version,
+        revision=int(meta.get("revision", 1)),
+        store_name=meta.get("store_name", "FreshMart Express"),
+        store_description=meta.get("store_description", ""),
+        delivery_time=meta.get("delivery_time", ""),
+        products=tuple(products),
+        recipes=tuple(recipes),
+        product_index=product_index,
+        recipe_index=RecipeIndex(recipes, product_index.get),
+    )
+
+def build_catalog(data: dict, version: int = 1) -> CatalogSnapshot:
+    """
+    Build a snapshot from parsed catalog.json.
+    Format 1 files (recipes as {"name": [item ids]}, no product keywords) still load.
+    """
+    products = []
+    for category, items in data["categories"].items():
+        for item in items:
+            products.append(ProductItem(
+                id=item["id"],
+                name=item["name"],
+                category=item.get("category", category),
+                price=float(item["price"]),
+                brand=item.get("brand", ""),
+                size=item.get("size", ""),
+                tags=list(item.get("tags", [])),
+                keywords=list(item.get("keywords", [])),
+            ))
+
+    recipes = data.get("recipes", [])
+    if isinstance(recipes, dict):
+        recipes = [{"name": name, "item_ids": item_ids} for name, item_ids in recipes.items()]
+    recipes = [
+        RecipeItem(
+            name=recipe["name"],
+            item_ids=list(recipe["item_ids"]),
+            keywords=list(recipe.get("keywords", [])),
+            servings=int(recipe.get("servings", 1)),
+        )
+        for recipe in recipes
+    ]
+
+    # A typo'd item id would otherwise ship a recipe with missing ingredients
+    product_ids = {p.id for p in products}
+    for recipe in recipes:
+        unknown = [item_id for item_id in recipe.item_ids if item_id not in product_ids]
+        if unknown:
+            raise ValueError(f"Recipe {recipe.name!r} lists unknown products: {', '.join(unknown)}")
+    return _make_snapshot(data, products, recipes, version)
+
+# --- CATALOG ---
+# catalog.json is the single source of products and recipes; edit it and
+# running workers pick up the new version (see CatalogLoader)
+CATALOG_FILE = Path(__file__).parent / "catalog.json"
+catalog_loader: CatalogLoader[CatalogSnapshot] = CatalogLoader(CATALOG_FILE, build_catalog)
+
+def current_catalog() -> CatalogSnapshot:
+    """The live catalog. Hold on to it for a consistent view across several lookups."""
+    return catalog_loader.current
+
+# Module-level views of the live catalog (read on access, never stale)
+_LIVE_VIEWS = {
+    "PRODUCT_CATALOG": lambda catalog: list(catalog.products),
+    "RECIPE_CATALOG": lambda catalog: list(catalog.recipes),
+    "PRODUCT_INDEX": lambda catalog: catalog.product_index,
+    "RECIPE_INDEX": lambda catalog: catalog.recipe_index,
+    "CATALOG_VERSION": lambda catalog: catalog.version,
+}
+
+def __getattr__(name: str):
+    if name in _LIVE_VIEWS:
+        return _LIVE_VIEWS[name](current_catalog())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# --- RECIPE DATABASE ---
-RECIPE_CATALOG = [
-    RecipeItem(
-        name="peanut butter sandwich",
-        item_ids=["g001", "g006"],
-        keywords=["peanut butter sandwich", "pb sandwich", "pb&j", "peanut butter"]
-    ),
-    RecipeItem(
-        name="pasta",
-        item_ids=["g007", "g008", "g009"],
-        keywords=["pasta", "spaghetti", "pasta dish", "italian pasta"]
-    ),
-    RecipeItem(
-        name="pasta for two",
-        item_ids=["g007", "g008", "g009"],
-        keywords=["pasta for two", "pasta for 2", "pasta two people"]
-    ),
-    RecipeItem(
-        name="breakfast",
-        item_ids=["g002", "g003", "g004", "g005"],
-        keywords=["breakfast", "morning meal", "basic breakfast"]
-    ),
-    RecipeItem(
-        name="cheese sandwich",
-        item_ids=["g002", "g011", "g005"],
-        keywords=["cheese sandwich", "grilled cheese"]
-    ),
-    RecipeItem(
-        name="toast with jam",
-        item_ids=["g001", "g012", "g005"],
-        keywords=["toast", "jam toast", "bread and jam"]
-    ),
-]
+def _store_meta(catalog: CatalogSnapshot) -> dict:
+    return {
+        "revision": catalog.revision,
+        "store_name": catalog.store_name,
+        "store_description": catalog.store_description,
+        "delivery_time": catalog.delivery_time,
+    }
+
+def add_product(product: ProductItem) -> None:
+    """Add a product to the live catalog (or replace one with the same ID) until the file next changes."""
+    def change(catalog: CatalogSnapshot, version: int) -> CatalogSnapshot:
+        products = [p for p in catalog.products if p.id != product.id] + [product]
+        # Only the edited product is (re)indexed
+        product_index = catalog.product_index.copy()
+        product_index.add(product)
+        return _make_snapshot(_store_meta(catalog), products, list(catalog.recipes), version, product_index)
+    catalog_loader.update(change)
+
+def remove_product(product_id: str) -> Optional[ProductItem]:
+    """Remove a product from the live catalog. Returns it, or None if not found."""
+    removed = current_catalog().product_index.get(product_id)
+    if removed is None:
+        return None
+
+    def change(catalog: CatalogSnapshot, version: int) -> CatalogSnapshot:
+        products = [p for p in catalog.products if p.id != product_id]
+        product_index = catalog.product_index.copy()
+        product_index.remove(product_id)
+        return _make_snapshot(_store_meta(catalog), products, list(catalog.recipes), version, product_index)
+    catalog_loader.update(change)
+    return removed
 
 # --- SEARCH FUNCTIONS ---
 def search_products(query: str) -> List[ProductItem]:
     """
     Search for products by name, brand, tags, or keywords.
-    Returns a list of matching products.
+    Returns a list of matching products, best matches first.
     """
-    query_lower = query.lower()
-    results = []
-    
-    for product in PRODUCT_CATALOG:
-        # Check name, brand, category, tags, and keywords
-        if (query_lower in product.name.lower() or
-            query_lower in product.brand.lower() or
-            query_lower in product.category.lower() or
-            any(query_lower in tag.lower() for tag in product.tags) or
-            any(query_lower in keyword.lower() for keyword in product.keywords)):
-            results.append(product)
-    
-    return results
+    return current_catalog().product_index.search(query)
 
 def find_product_by_id(product_id: str) -> Optional[ProductItem]:
     """Find a product by its ID."""
-    for product in PRODUCT_CATALOG:
-        if product.id == product_id:
-            return product
-    return None
+    return current_catalog().product_index.get(product_id)
 
 def find_recipe(recipe_name: str) -> Optional[RecipeItem]:
     """
     Find a recipe by name or keywords.
     Returns the recipe if found, else None.
     """
-    recipe_name_lower = recipe_name.lower().strip()
-    
-    for recipe in RECIPE_CATALOG:
-        # Check exact name match
-        if recipe_name_lower == recipe.name.lower():
-            return recipe
-        
-        # Check keywords
-        for keyword in recipe.keywords:
-            if recipe_name_lower in keyword.lower() or keyword.lower() in recipe_name_lower:
-                return recipe
-    
-    return None
+    return current_catalog().recipe_index.find(recipe_name)
+
+def resolve_recipe_request(text: str, servings: Optional[int] = None) -> Tuple[Optional[RecipeItem], Optional[int]]:
+    """
+    Recipe and head count for a request like "pasta for four".
+    An explicit `servings` wins over one spoken in the text.
+    """
+    phrase, spoken = parse_servings(text)
+    recipe = find_recipe(phrase) or find_recipe(text)
+    return recipe, servings or spoken
+
+def recipe_ingredients(recipe: RecipeItem, servings: Optional[int] = None) -> List[Tuple[ProductItem, int]]:
+    """
+    (product, quantity) for each ingredient, with quantities scaled so the
+    recipe feeds `servings` people (one set of ingredients if not given).
+    """
+    sets = -(-servings // recipe.servings) if servings else 1
+    return [(product, sets) for product in current_catalog().recipe_index.ingredients(recipe)]
 
 def get_all_products_by_category(category: str) -> List[ProductItem]:
     """Get all products in a specific category."""
-    return [p for p in PRODUCT_CATALOG if p.category.lower() == category.lower()]
+    return [p for p in current_catalog().products if p.category.lower() == category.lower()]
 
 def get_products_by_tag(tag: str) -> List[ProductItem]:
     """Get all products with a specific tag."""
-    return [p for p in PRODUCT_CATALOG if tag.lower() in [t.lower() for t in p.tags]]
+    return [p for p in current_catalog().products if tag.lower() in [t.lower() for t in p.tags]]
 
 # --- HELPER CLASS ---
 class GroceryDB:
@@ -374,11 +222,11 @@ class GroceryDB:
     
     @staticmethod
     def get_all_products() -> List[ProductItem]:
-        return PRODUCT_CATALOG
+        return list(current_catalog().products)
     
     @staticmethod
     def get_all_recipes() -> List[RecipeItem]:
-        return RECIPE_CATALOG
+        return list(current_catalog().recipes)
     
     @staticmethod
     def get_category(category: str) -> List[ProductItem]:
@@ -1,9 +1,11 @@
 # grocery_order.py
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List, Literal
 from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
 
+from common.order_ids import new_order_id
+
 # --- CART ITEM MODEL ---
 class CartItem(BaseModel):
     """Represents an item in the shopping cart."""
@@ -19,10 +21,19 @@ class CartItem(BaseModel):
         """Calculate total price for this item."""
         return self.price * self.quantity
 
+# --- CART CHANGE MODEL ---
+class CartChange(BaseModel):
+    """One operation in a batch cart update."""
+    action: Literal["add", "remove", "set"] = Field(
+        description="'add' adds units, 'remove' drops the item, 'set' sets its quantity (0 removes it)."
+    )
+    item_id: str = Field(description="Item ID (e.g., 'g001', 'p001', 's001')")
+    quantity: int = Field(default=1, ge=0, description="Units to add, or the new quantity for 'set'. Ignored for 'remove'.")
+
 # --- ORDER MODEL ---
 class OrderItem(BaseModel):
     """Base class for orders."""
-    order_id: str = Field(default_factory=lambda: f"ORD{datetime.now().strftime('%Y%m%d%H%M%S')}")
+    order_id: str = Field(default_factory=lambda: new_order_id("ORD"))
 
 class OrderData(OrderItem):
     """Complete order information."""
@@ -37,10 +48,28 @@ class OrderData(OrderItem):
 
 # --- CART STATE MANAGEMENT ---
 class CartState:
-    """Manages the shopping cart during the session."""
+    """
+    Manages the shopping cart during the session.
+    
+    Totals and per-category buckets are kept up to date on every change,
+    and the summary text is cached until the cart changes again, so cart
+    views don't rescan every line. Change quantities through these methods
+    rather than on the CartItem objects directly.
+    """
     
     def __init__(self):
         self.items: Dict[str, CartItem] = {}
+        self._total = 0.0
+        self._count = 0
+        self._by_category: Dict[str, Dict[str, CartItem]] = {}
+        self._summary: Optional[str] = None  # None when the cart changed since the last render
+    
+    def _set_quantity(self, item: CartItem, quantity: int) -> None:
+        delta = quantity - item.quantity
+        item.quantity = quantity
+        self._total += item.price * delta
+        self._count += delta
+        self._summary = None
     
     def add_item(self, item_id: str, name: str, quantity: int, price: float, 
                  brand: str, size: str, category: str) -> CartItem:
@@ -50,26 +79,42 @@ class CartState:
         """
         if item_id in self.items:
             # Update quantity if item already exists
-            self.items[item_id].quantity += quantity
+            item = self.items[item_id]
+            self._set_quantity(item, item.quantity + quantity)
         else:
             # Add new item
-            self.items[item_id] = CartItem(
+            item = CartItem(
                 item_id=item_id,
                 name=name,
-                quantity=quantity,
+                quantity=0,
                 price=price,
                 brand=brand,
                 size=size,
                 category=category
             )
+            self.items[item_id] = item
+            self._by_category.setdefault(category.lower(), {})[item_id] = item
+            self._set_quantity(item, quantity)
         
-        return self.items[item_id]
+        return item
     
     def remove_item(self, item_id: str) -> Optional[CartItem]:
         """Remove an item from the cart."""
-        if item_id in self.items:
-            return self.items.pop(item_id)
-        return None
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return None
+        
+        self._total -= item.get_total()
+        self._count -= item.quantity
+        self._summary = None
+        bucket = self._by_category[item.category.lower()]
+        del bucket[item_id]
+        if not bucket:
+            del self._by_category[item.category.lower()]
+        if not self.items:
+            # Start clean instead of carrying float rounding leftovers
+            self._total = 0.0
+        return item
     
     def update_quantity(self, item_id: str, quantity: int) -> bool:
         """
@@ -84,9 +129,66 @@ class CartState:
             self.remove_item(item_id)
             return True
         
-        self.items[item_id].quantity = quantity
+        self._set_quantity(self.items[item_id], quantity)
         return True
     
+    def apply_changes(self, changes: List[CartChange], find_product: Callable) -> List[str]:
+        """
+        Apply a batch of add/remove/set changes, all or nothing.
+        Every change is checked first (products via `find_product`, removals
+        against the cart as it would be by then); if any fails, the cart is
+        untouched and ValueError lists every problem.
+        Returns a short description of each change.
+        """
+        quantities = {item_id: item.quantity for item_id, item in self.items.items()}
+        names = {item_id: item.name for item_id, item in self.items.items()}
+        products = {}
+        descriptions = []
+        errors = []
+
+        for n, change in enumerate(changes, start=1):
+            item_id = change.item_id
+            if change.action == "remove":
+                if quantities.pop(item_id, None) is None:
+                    errors.append(f"Change {n}: '{item_id}' is not in the cart.")
+                else:
+                    descriptions.append(f"removed {names[item_id]}")
+                continue
+
+            product = products.get(item_id) or find_product(item_id)
+            if product is None:
+                errors.append(f"Change {n}: item '{item_id}' is not in the catalog.")
+                continue
+            products[item_id] = product
+            names[item_id] = product.name
+
+            if change.action == "add":
+                if change.quantity < 1:
+                    errors.append(f"Change {n}: add needs a quantity of at least 1.")
+                    continue
+                quantities[item_id] = quantities.get(item_id, 0) + change.quantity
+                descriptions.append(f"+{change.quantity}x {product.name}")
+            elif change.quantity == 0:
+                quantities.pop(item_id, None)
+                descriptions.append(f"removed {product.name}")
+            else:
+                quantities[item_id] = change.quantity
+                descriptions.append(f"{product.name} set to {change.quantity}")
+
+        if errors:
+            raise ValueError(" ".join(errors))
+
+        for item_id in [item_id for item_id in self.items if item_id not in quantities]:
+            self.remove_item(item_id)
+        for item_id, quantity in quantities.items():
+            if item_id in self.items:
+                self._set_quantity(self.items[item_id], quantity)
+            else:
+                product = products[item_id]
+                self.add_item(item_id=product.id, name=product.name, quantity=quantity, price=product.price,
+                              brand=product.brand, size=product.size, category=product.category)
+        return descriptions
+
     def get_item(self, item_id: str) -> Optional[CartItem]:
         """Get a specific item from the cart."""
         return self.items.get(item_id)
@@ -96,12 +198,12 @@ class CartState:
         return list(self.items.values())
     
     def get_total(self) -> float:
-        """Calculate the total price of all items in the cart."""
-        return sum(item.get_total() for item in self.items.values())
+        """Total price of all items in the cart, to the cent."""
+        return round(self._total, 2)
     
     def get_item_count(self) -> int:
         """Get the total number of items in the cart."""
-        return sum(item.quantity for item in self.items.values())
+        return self._count
     
     def is_empty(self) -> bool:
         """Check if the cart is empty."""
@@ -110,14 +212,22 @@ class CartState:
     def clear(self) -> None:
         """Clear all items from the cart."""
         self.items.clear()
+        self._by_category.clear()
+        self._total = 0.0
+        self._count = 0
+        self._summary = None
     
     def get_summary(self) -> str:
         """
         Get a text summary of the cart contents.
         Returns a formatted string with all items and total.
         """
+        if self._summary is not None:
+            return self._summary
+        
         if self.is_empty():
-            return "Your cart is empty."
+            self._summary = "Your cart is empty."
+            return self._summary
         
         summary_lines = []
         summary_lines.append("🛒 Your Cart:")
@@ -133,11 +243,12 @@ class CartState:
         summary_lines.append(f"Total: ${self.get_total():.2f}")
         summary_lines.append(f"Items: {self.get_item_count()}")
         
-        return "\n".join(summary_lines)
+        self._summary = "\n".join(summary_lines)
+        return self._summary
     
     def get_items_by_category(self, category: str) -> List[CartItem]:
         """Get all items in a specific category."""
-        return [item for item in self.items.values() if item.category.lower() == category.lower()]
+        return list(self._by_category.get(category.lower(), {}).values())
     
     def has_item(self, item_id: str) -> bool:
         """Check if an item is in the cart."""
@@ -0,0 +1,248 @@
+# order_store.py
+import atexit
+import heapq
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Tuple
+
+from common.order_ids import ID_LENGTH, decode_order_id
+
+# --- Configuration ---
+ORDERS_DIR = "orders"
+SHARD_BUCKETS = int(os.getenv("ORDER_SHARD_BUCKETS", "8"))  # hash buckets per day
+FSYNC_EVERY = 16        # fsync after this many orders...
+FSYNC_INTERVAL = 1.0    # ...or after this many seconds, whichever comes first
+MAX_OPEN_FILES = 32
+
+_DATE_DIR_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _bucket(key: str) -> int:
+    return zlib.crc32(key.encode("utf-8")) % SHARD_BUCKETS
+
+
+def _sort_key(order_id: str) -> str:
+    # Snowflake IDs sort as strings once the prefix is dropped
+    return order_id[-ID_LENGTH:]
+
+
+def customer_key(name: str) -> str:
+    """Lookup key for a customer name: lowercase, single-spaced."""
+    return " ".join(name.lower().split())
+
+
+def shard_date(order_id: str) -> str:
+    """UTC day an order ID was issued, which is the day shard it lives in."""
+    timestamp_ms, _, _ = decode_order_id(order_id)
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+class OrderStore:
+    """
+    Day- and hash-sharded, append-only order store.
+
+        orders/2026-10-17/3.jsonl             one JSON line per order in that shard
+        orders/2026-10-17/3.idx               order_id, byte offset, length, customer
+        orders/2026-10-17/customers/5.idx     customer, order_id, byte offset, length
+
+    A checkout appends one line to each of three files, however many orders
+    exist. Looking up an order reads one shard's index (the ID says which
+    day, its hash which bucket) and then just that record.
+
+    History and customer pages walk day shards newest first and stop once
+    the page is full, so days older than the page are never opened. Each
+    day touched still costs a scan of its index files: for history, every
+    bucket index of that day (all of the day's orders); for a customer,
+    one bucket of that day's customer index (about 1/SHARD_BUCKETS of it).
+    """
+
+    def __init__(self, root: str = ORDERS_DIR, fsync_every: int = FSYNC_EVERY,
+                 fsync_interval: float = FSYNC_INTERVAL):
+        self.root = root
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._fds: "OrderedDict[str, int]" = OrderedDict()
+        self._dirty: set = set()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _shard_paths(self, order_id: str) -> Tuple[str, str]:
+        base = os.path.join(self.root, shard_date(order_id), str(_bucket(order_id)))
+        return base + ".jsonl", base + ".idx"
+
+    def _customer_path(self, key: str, date: str) -> str:
+        return os.path.join(self.root, date, "customers", f"{_bucket(key)}.idx")
+
+    # --- Writing ---
+    def _open(self, path: str) -> int:
+        fd = self._fds.get(path)
+        if fd is not None:
+            self._fds.move_to_end(path)
+            return fd
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # O_APPEND: every write lands at the current end of file, even when
+        # several worker processes append to the same shard
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._fds[path] = fd
+        while len(self._fds) > MAX_OPEN_FILES:
+            old_path, old_fd = self._fds.popitem(last=False)
+            if old_path in self._dirty:
+                os.fsync(old_fd)
+                self._dirty.discard(old_path)
+            os.close(old_fd)
+        return fd
+
+    def _append(self, path: str, data: bytes) -> int:
+        """Append `data` in one write. Returns the offset it landed at."""
+        fd = self._open(path)
+        os.write(fd, data)
+        self._dirty.add(path)
+        return os.lseek(fd, 0, os.SEEK_CUR) - len(data)
+
+    def append(self, order: dict) -> dict:
+        """Store one order (needs order_id and customer_name). Returns the order."""
+        order_id = order["order_id"]
+        key = customer_key(order.get("customer_name", ""))
+        record = (json.dumps(order, separators=(",", ":")) + "\n").encode("utf-8")
+        data_path, index_path = self._shard_paths(order_id)
+
+        with self._lock:
+            # Record first, then its index entries, so readers never see an
+            # index line pointing at bytes that aren't there yet
+            offset = self._append(data_path, record)
+            self._append(index_path, f"{order_id}\t{offset}\t{len(record)}\t{key}\n".encode("utf-8"))
+            if key:
+                self._append(self._customer_path(key, shard_date(order_id)),
+                             f"{key}\t{order_id}\t{offset}\t{len(record)}\n".encode("utf-8"))
+
+            self._pending += 1
+            if (self._pending >= self.fsync_every or
+                    time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync_locked()
+        return order
+
+    def _sync_locked(self) -> None:
+        for path in self._dirty:
+            fd = self._fds.get(path)
+            if fd is not None:
+                os.fsync(fd)
+        self._dirty.clear()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """Force any batched appends to disk."""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        """Flush batched appends and release open shard files."""
+        with self._lock:
+            self._sync_locked()
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
+    # --- Reading ---
+    @staticmethod
+    def _read_index(path: str) -> Iterator[Tuple[str, int, int]]:
+        """(order_id, offset, length) for every complete line of a shard index."""
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                # A torn last line from a crash mid-write has no newline or missing fields
+                if not line.endswith("\n") or len(parts) != 4:
+                    continue
+                yield parts[0], int(parts[1]), int(parts[2])
+
+    @staticmethod
+    def _read_record(data_path: str, offset: int, length: int) -> Optional[dict]:
+        with open(data_path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def get(self, order_id: str) -> Optional[dict]:
+        """Look up one order by ID."""
+        try:
+            data_path, index_path = self._shard_paths(order_id)
+        except (KeyError, ValueError, OverflowError, OSError):
+            return None  # not one of our IDs
+        for entry_id, offset, length in self._read_index(index_path):
+            if entry_id == order_id:
+                return self._read_record(data_path, offset, length)
+        return None
+
+    def by_customer(self, name: str, limit: int = 20) -> List[dict]:
+        """A customer's most recent orders, newest first."""
+        key = customer_key(name)
+        if not key:
+            return []
+        orders: List[dict] = []
+        for date in self._dates():
+            path = self._customer_path(key, date)
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as f:
+                entries = [
+                    (_sort_key(parts[1]), parts[1], int(parts[2]), int(parts[3]))
+                    for parts in (line.rstrip("\n").split("\t") for line in f if line.endswith("\n"))
+                    if len(parts) == 4 and parts[0] == key
+                ]
+            for _, order_id, offset, length in heapq.nlargest(limit - len(orders), entries):
+                order = self._read_record(self._shard_paths(order_id)[0], offset, length)
+                if order is not None:
+                    orders.append(order)
+            if len(orders) >= limit:
+                break
+        return orders
+
+    def _dates(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted((name for name in os.listdir(self.root) if _DATE_DIR_RE.match(name)), reverse=True)
+
+    def history(self, limit: int = 20, before: Optional[str] = None) -> List[dict]:
+        """
+        One page of orders, newest first. Pass the last order_id of a page as
+        `before` to get the next one; only the day shards the page spans are read.
+        """
+        cursor = _sort_key(before) if before else None
+        cursor_date = shard_date(before) if before else None
+        page: List[dict] = []
+
+        for date in self._dates():
+            if cursor_date is not None and date > cursor_date:
+                continue
+            entries = []
+            for bucket in range(SHARD_BUCKETS):
+                base = os.path.join(self.root, date, str(bucket))
+                entries.extend(
+                    (_sort_key(order_id), base + ".jsonl", offset, length)
+                    for order_id, offset, length in self._read_index(base + ".idx")
+                    if cursor is None or _sort_key(order_id) < cursor
+                )
+            for _, data_path, offset, length in heapq.nlargest(limit - len(page), entries):
+                order = self._read_record(data_path, offset, length)
+                if order is not None:
+                    page.append(order)
+            if len(page) >= limit:
+                break
+        return page
+
+
+# Shared store for the grocery agent
+order_store = OrderStore()
+atexit.register(order_store.close)
@@ -14,11 +14,14 @@ from livekit.agents import (
     cli,
     function_tool,
 )
-from livekit.plugins import google, deepgram, silero, murf
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from livekit.plugins import google, deepgram, murf
 from pydantic import Field
 from dataclasses import dataclass
 
+from common.persistence import persistence
+from common.prompt_cache import content_version, prompt_cache
+from common.prewarm import get_turn_detector, get_vad, prewarm
+
 load_dotenv()
 logger = logging.getLogger("Zathura_GM")
 
@@ -53,15 +56,37 @@ def save_game_state(player: str, location: str, status: str, inventory: str) ->
     
     return entry
 
+# --- PROMPT CONTEXT ---
+STORY_SETTING = """
+    The player has just started playing a vintage 1950s clockwork board game called Zathura.
+    With their first move, their entire house has been launched into outer space.
+    They are floating near Saturn. There are meteors, aliens (Zorgons), and malfunctioning robots.
+    The only way home is to finish the game by reaching the planet Zathura.
+    """
+
+GAME_RULES = """
+    - The game must be played to completion.
+    - Cheating has severe consequences.
+    - The house is the spaceship.
+    - Zorgons are attracted to heat.
+    """
+
+# Fixed texts, so the prompt version is computed once per process
+PROMPT_VERSION = content_version(STORY_SETTING, GAME_RULES)
+
 @dataclass
 class GameContext:
     story_setting: str
     game_rules: str
+    prompt_version: str = ""  # derived from the texts when not given
 
-class ZathuraGMAgent(Agent):
-    def __init__(self, *, userdata: GameContext) -> None:
-        # Build dynamic context
-        instructions = f"""
+    def __post_init__(self):
+        if not self.prompt_version:
+            self.prompt_version = content_version(self.story_setting, self.game_rules)
+
+def build_instructions(userdata: GameContext) -> str:
+    # Build dynamic context
+    return f"""
 You are the Game Master for ZATHURA - A Space Adventure Board Game.
 
 SETTING:
@@ -83,6 +108,16 @@ STYLE:
 - Keep descriptions vivid but concise.
 """
 
+class ZathuraGMAgent(Agent):
+    def __init__(self, *, userdata: GameContext) -> None:
+        prompt = prompt_cache.render(
+            "zathura.instructions",
+            userdata.prompt_version,
+            lambda: build_instructions(userdata),
+        )
+        self.prompt_hash = prompt.sha256
+        instructions = prompt.text
+
         super().__init__(
             instructions=instructions,
             tools=[
@@ -102,32 +137,18 @@ STYLE:
         """
         Save the game state when the player finds an item, survives a danger, or reaches a new room.
         """
-        save_game_state(player, location, status, inventory)
+        await persistence.run(save_game_state, player, location, status, inventory)
         return f"Game saved. {player} is currently in the {location}."
 
 
-server = AgentServer()
+server = AgentServer(setup_fnc=prewarm)
 
 @server.rtc_session
 async def main(ctx: JobContext) -> None:
-    # Build context for the agent
-    story_setting = """
-    The player has just started playing a vintage 1950s clockwork board game called Zathura.
-    With their first move, their entire house has been launched into outer space.
-    They are floating near Saturn. There are meteors, aliens (Zorgons), and malfunctioning robots.
-    The only way home is to finish the game by reaching the planet Zathura.
-    """
-
-    game_rules = """
-    - The game must be played to completion.
-    - Cheating has severe consequences.
-    - The house is the spaceship.
-    - Zorgons are attracted to heat.
-    """
-
     userdata = GameContext(
-        story_setting=story_setting,
-        game_rules=game_rules
+        story_setting=STORY_SETTING,
+        game_rules=GAME_RULES,
+        prompt_version=PROMPT_VERSION,
     )
     
     # Configure Session
@@ -138,8 +159,8 @@ async def main(ctx: JobContext) -> None:
         tts=deepgram.TTS(
             model="aura-asteria-en",    
         ),
-        turn_detection=MultilingualModel(),
-        vad=silero.VAD.load(),
+        turn_detection=get_turn_detector(ctx),
+        vad=get_vad(ctx),
     )
 
     # --- THE FIX IS HERE ---
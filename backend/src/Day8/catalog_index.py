@@ -0,0 +1,161 @@
+# catalog_index.py
+import bisect
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# --- INDEX SETTINGS ---
+MIN_PREFIX = 3          # query words this long also match longer words ("hood" -> "hoodie")
+MAX_JOINED_PREFIX = 2   # "t shirt" is also indexed as "tshirt", "e book" as "ebook"
+PREFIX_CACHE_SIZE = 1024
+INDEX_CACHE_SIZE = 8    # catalogs whose index is kept for reuse across sessions
+
+# Filler words the voice agent often passes through in a query ("a mug for my dad")
+STOPWORDS = {"a", "an", "the", "for", "with", "in", "of", "and", "my", "some", "me", "to"}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, punctuation and hyphens to single spaces (t-shirt -> t shirt)."""
+    return " ".join(_TOKEN_RE.findall(text.lower())) if text else ""
+
+
+def stem(word: str) -> str:
+    """Light plural stemming: mugs -> mug, hoodies -> hoodie, glasses -> glass."""
+    if len(word) <= 3 or not word.endswith("s") or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith(("sses", "xes", "ches", "shes", "zes")):
+        return word[:-2]
+    return word[:-1]
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(word) for word in _TOKEN_RE.findall(text.lower())]
+
+
+class CatalogSearchIndex:
+    """
+    Day8 catalog preprocessed once for search_products.
+
+    Product text is normalized, tokenized and stemmed up front into posting
+    lists (word -> positions in the catalog), with facet indexes for category
+    and color and a price-sorted list. A search intersects the posting lists
+    of its filters, smallest first, so its cost follows the size of the
+    result instead of the size of the catalog. Results keep catalog order.
+    """
+
+    def __init__(self, catalog: List[dict]):
+        self.catalog = catalog
+        self._postings: Dict[str, Set[int]] = {}
+        self._categories: Dict[str, Set[int]] = {}
+        self._colors: Dict[str, Set[int]] = {}
+        self._prices: List[float] = []
+
+        for pos, product in enumerate(catalog):
+            text = f"{product.get('name', '')} {product.get('description', '')} {product.get('category', '')}"
+            tokens = tokenize(text)
+            # Joined short prefixes too, so "tshirt" finds "T-Shirt"
+            words = set(tokens) | {a + b for a, b in zip(tokens, tokens[1:]) if len(a) <= MAX_JOINED_PREFIX}
+            for word in words:
+                self._postings.setdefault(word, set()).add(pos)
+            self._categories.setdefault(normalize(product.get("category", "")), set()).add(pos)
+            self._colors.setdefault(normalize(product.get("color", "")), set()).add(pos)
+            self._prices.append(product.get("price", 0))
+
+        self._vocabulary = sorted(self._postings)
+        self._by_price = sorted(range(len(catalog)), key=self._prices.__getitem__)
+        self._sorted_prices = [self._prices[pos] for pos in self._by_price]
+        self._prefix_cache: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.catalog)
+
+    # --- Posting lists ---
+    def _word_postings(self, word: str) -> Set[int]:
+        """Products containing `word`, or a longer word starting with it."""
+        exact = self._postings.get(word, set())
+        if len(word) < MIN_PREFIX:
+            return exact
+        cached = self._prefix_cache.get(word)
+        if cached is not None:
+            return cached
+
+        start = bisect.bisect_left(self._vocabulary, word)
+        end = bisect.bisect_left(self._vocabulary, word + "\uffff")
+        if end - start == 0:
+            matches = exact
+        elif end - start == 1:
+            matches = self._postings[self._vocabulary[start]]
+        else:
+            matches = set().union(*(self._postings[w] for w in self._vocabulary[start:end]))
+        if len(self._prefix_cache) >= PREFIX_CACHE_SIZE:
+            self._prefix_cache.clear()
+        self._prefix_cache[word] = matches
+        return matches
+
+    @staticmethod
+    def _facet_postings(facet: Dict[str, Set[int]], wanted: str, either_way: bool) -> Set[int]:
+        # Facets have a handful of distinct values, so partial matching them is cheap
+        hits = [positions for value, positions in facet.items()
+                if wanted in value or (either_way and value and value in wanted)]
+        if len(hits) == 1:
+            return hits[0]
+        return set().union(*hits)
+
+    # --- Search ---
+    def search(self, query: str = "", category: str = "", color: str = "",
+               max_price: Optional[float] = None) -> List[dict]:
+        """Products matching every query word and filter, in catalog order."""
+        postings: List[Set[int]] = []
+        category = normalize(category)
+        if category:
+            postings.append(self._facet_postings(self._categories, category, either_way=True))
+        color = normalize(color)
+        if color:
+            postings.append(self._facet_postings(self._colors, color, either_way=False))
+        for word in dict.fromkeys(tokenize(query)):
+            if word not in STOPWORDS:
+                postings.append(self._word_postings(word))
+
+        if postings:
+            postings.sort(key=len)
+            if not postings[0]:
+                return []
+            positions: Iterable[int] = postings[0].intersection(*postings[1:])
+            if max_price is not None:
+                positions = [pos for pos in positions if self._prices[pos] <= max_price]
+            return [self.catalog[pos] for pos in sorted(positions)]
+
+        if max_price is None:
+            return list(self.catalog)
+        end = bisect.bisect_right(self._sorted_prices, max_price)
+        return [self.catalog[pos] for pos in sorted(self._by_price[:end])]
+
+
+def _fingerprint(catalog: List[dict]) -> tuple:
+    """Every product field the index reads, in catalog order."""
+    return tuple((p.get("name"), p.get("description"), p.get("category"), p.get("color"), p.get("price"))
+                 for p in catalog)
+
+
+_indexes: "OrderedDict[int, Tuple[list, tuple, CatalogSearchIndex]]" = OrderedDict()
+
+
+def index_for(catalog: List[dict]) -> CatalogSearchIndex:
+    """
+    Shared index for a catalog list, rebuilt after any change to it.
+
+    Reuse is checked against a fingerprint of the indexed fields, so products
+    added, removed, reordered or edited in place all trigger a rebuild. Only
+    the most recently used catalogs are kept.
+    """
+    fingerprint = _fingerprint(catalog)
+    entry = _indexes.get(id(catalog))
+    if entry is None or entry[0] is not catalog or entry[1] != fingerprint:
+        entry = (catalog, fingerprint, CatalogSearchIndex(catalog))
+        _indexes[id(catalog)] = entry
+        while len(_indexes) > INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    _indexes.move_to_end(id(catalog))
+    return entry[2]
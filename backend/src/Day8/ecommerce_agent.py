@@ -1,6 +1,8 @@
+import asyncio
 import logging
 import json
 import os
+import uuid
 from datetime import datetime
 from typing import Annotated, Optional
 
@@ -10,15 +12,21 @@ from livekit.agents import (
     AgentServer,
     AgentSession,
     JobContext,
+    JobProcess,
     RunContext,
     cli,
     function_tool,
 )
-from livekit.plugins import google, deepgram, silero, murf
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from livekit.plugins import google, deepgram, murf
 from pydantic import BaseModel, Field
 from dataclasses import dataclass
 
+from Day8.catalog_index import CatalogSearchIndex, index_for
+from Day8.inventory import HOLD_TTL, Hold, get_inventory, inventory_writer
+from common.order_ids import new_order_id
+from common.persistence import persistence
+from common.prewarm import get_turn_detector, get_vad, prewarm
+
 load_dotenv()
 logger = logging.getLogger("EcommerceGM")
 
@@ -43,6 +51,16 @@ def save_order(order: dict) -> dict:
     
     return order
 
+def load_orders() -> list:
+    """Reads all orders from the JSON file (empty list if none yet)."""
+    if not os.path.exists(ORDERS_FILE):
+        return []
+    with open(ORDERS_FILE, "r") as f:
+        return json.load(f)
+
+# Products read out per search; a voice reply can't list a whole category
+MAX_LISTED = 10
+
 # --- PYDANTIC MODELS ---
 class SearchProductsArgs(BaseModel):
     """Arguments for searching products"""
@@ -63,12 +81,21 @@ class EcommerceContext:
     catalog: list
     conversation_history: list = None
     current_browsing: list = None
+    holds: dict = None  # product id -> Hold awaiting the customer's confirmation
+    session_id: str = None  # owner of this session's holds
+    search_index: CatalogSearchIndex = None
     
     def __post_init__(self):
         if self.conversation_history is None:
             self.conversation_history = []
         if self.current_browsing is None:
             self.current_browsing = []
+        if self.holds is None:
+            self.holds = {}
+        if self.session_id is None:
+            self.session_id = uuid.uuid4().hex
+        if self.search_index is None:
+            self.search_index = index_for(self.catalog)
 
 class EcommerceAgent(Agent):
     def __init__(self, *, userdata: EcommerceContext) -> None:
@@ -79,9 +106,10 @@ YOUR ROLE:
 1. Help customers browse our product catalog using natural language queries.
 2. When a user asks for products, use the search_products tool with their query.
 3. Summarize search results with product name, price, and key details.
-4. When a user wants to buy, use the place_order tool to create an order.
-5. Confirm order details with order ID and total price.
-6. If asked about the last order, use the get_last_order tool.
+4. When a user picks a product, use reserve_item to hold it while they confirm.
+5. Once they confirm, use place_order to create the order. If they change their mind, use cancel_reservation.
+6. Confirm order details with order ID and total price.
+7. If asked about the last order, use the get_last_order tool.
 
 COMMUNICATION STYLE:
 - Be friendly and helpful.
@@ -97,13 +125,6 @@ IMPORTANT: Always provide all required parameters to functions. Use empty string
             tools=[],
         )
 
-    def _normalize_text(self, text: str) -> str:
-        """Helper to normalize text for fuzzy matching (removes punctuation/hyphens)"""
-        if not text: return ""
-        # Replace hyphens with spaces (t-shirt -> t shirt)
-        text = text.lower().replace("-", " ").replace(",", " ")
-        return text
-
     @function_tool
     async def search_products(
         self,
@@ -114,56 +135,13 @@ IMPORTANT: Always provide all required parameters to functions. Use empty string
         Search the product catalog based on user preferences.
         Returns a formatted list of matching products.
         """
-        results = []
-        
-        # Normalize inputs
-        query_text = self._normalize_text(args.query)
-        category_text = self._normalize_text(args.category)
-        color_text = self._normalize_text(args.color)
-        
-        # Split query into keywords for smarter matching
-        query_keywords = query_text.split() if query_text else []
-
-        for product in ctx.userdata.catalog:
-            # 1. Check Category
-            if category_text:
-                prod_cat = self._normalize_text(product.get("category", ""))
-                # Allow partial match (e.g., "tshirt" matches "t-shirt")
-                if category_text not in prod_cat and prod_cat not in category_text:
-                    continue
-            
-            # 2. Check Price
-            if args.max_price and args.max_price < 999999:
-                if product.get("price", 0) > args.max_price:
-                    continue
-            
-            # 3. Check Color
-            if color_text:
-                prod_color = self._normalize_text(product.get("color", ""))
-                if color_text not in prod_color:
-                    continue
-            
-            # 4. Smart Text Search (The Fix)
-            if query_keywords:
-                # Combine all searchable text from the product
-                prod_text = self._normalize_text(
-                    f"{product.get('name', '')} {product.get('description', '')} {product.get('category', '')}"
-                )
-                
-                # Check if ALL keywords match (fuzzy)
-                match_all = True
-                for word in query_keywords:
-                    # Handle plurals simply: "mugs" -> "mug"
-                    singular_word = word[:-1] if word.endswith('s') and len(word) > 3 else word
-                    
-                    if singular_word not in prod_text:
-                        match_all = False
-                        break
-                
-                if not match_all:
-                    continue
-            
-            results.append(product)
+        # Catalog text is normalized and indexed once per catalog, not per query
+        results = ctx.userdata.search_index.search(
+            query=args.query,
+            category=args.category,
+            color=args.color,
+            max_price=args.max_price if args.max_price and args.max_price < 999999 else None,
+        )
         
         # Store results
         ctx.userdata.current_browsing = results
@@ -171,19 +149,67 @@ IMPORTANT: Always provide all required parameters to functions. Use empty string
         if not results:
             return f"Sorry, I couldn't find any products matching '{args.query}'. Try specific terms like 'coffee mug', 'hoodie', or 'white t-shirt'."
         
-        # Format results
+        # Format results (stock reads don't wait on other buyers' reservations)
+        listed = results[:MAX_LISTED]
+        stock = await asyncio.to_thread(get_inventory().available_many, [p["id"] for p in listed])
         response = f"Great! I found {len(results)} product(s):\n\n"
-        for idx, product in enumerate(results, 1):
+        for idx, product in enumerate(listed, 1):
             response += f"{idx}. {product['name']}\n"
             response += f"   Price: ₹{product['price']}\n"
+            response += f"   {'In stock: ' + str(stock[product['id']]) if stock[product['id']] else 'Out of stock'}\n"
             if product.get("color"):
                 response += f"   Color: {product['color']}\n"
             if product.get("size"):
                 response += f"   Sizes: {product['size']}\n"
             response += f"   {product.get('description', '')}\n\n"
+        if len(results) > MAX_LISTED:
+            response += f"Showing the first {MAX_LISTED}. Ask the customer to narrow it down by category, color or budget.\n"
         
         return response
 
+    async def _reserve(self, ctx: RunContext[EcommerceContext], product: dict, quantity: int) -> Optional[Hold]:
+        """Hold units for this session, replacing any earlier hold on the same product."""
+        inventory = get_inventory()
+        previous = ctx.userdata.holds.pop(product["id"], None)
+        if previous is not None:
+            await inventory_writer.run(inventory.release, previous.hold_id)
+        hold = await inventory_writer.run(inventory.reserve, product["id"], quantity, ctx.userdata.session_id)
+        if hold is not None:
+            ctx.userdata.holds[product["id"]] = hold
+        return hold
+
+    @function_tool
+    async def reserve_item(
+        self,
+        ctx: RunContext[EcommerceContext],
+        args: PlaceOrderArgs,
+    ) -> str:
+        """
+        Hold a product from the last search while the customer confirms the order.
+        """
+        if not ctx.userdata.current_browsing:
+            return "Please search for products first before reserving."
+        
+        if args.product_index < 1 or args.product_index > len(ctx.userdata.current_browsing):
+            return f"Invalid selection. Please choose 1-{len(ctx.userdata.current_browsing)}."
+        
+        product = ctx.userdata.current_browsing[args.product_index - 1]
+        hold = await self._reserve(ctx, product, args.quantity)
+        if hold is None:
+            left = await asyncio.to_thread(get_inventory().available, product["id"])
+            return f"Sorry, only {left} of {product['name']} left." if left else f"Sorry, {product['name']} is out of stock."
+        
+        minutes = max(1, round(HOLD_TTL / 60))
+        return (f"Reserved {args.quantity}x {product['name']} (₹{product['price'] * args.quantity}) "
+                f"for {minutes} minute(s). Ask the customer to confirm the order.")
+
+    @function_tool
+    async def cancel_reservation(self, ctx: RunContext[EcommerceContext]) -> str:
+        """Release every item held for this customer (they decided not to buy)."""
+        released = await inventory_writer.run(get_inventory().release_owner, ctx.userdata.session_id)
+        ctx.userdata.holds.clear()
+        return f"Released {released} reservation(s)." if released else "Nothing was reserved."
+
     @function_tool
     async def place_order(
         self,
@@ -201,7 +227,22 @@ IMPORTANT: Always provide all required parameters to functions. Use empty string
         
         product = ctx.userdata.current_browsing[args.product_index - 1]
         
-        order_id = f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        # Sell the units reserved while the customer confirmed, or reserve them now;
+        # a hold that timed out is retried once against current stock
+        inventory = get_inventory()
+        hold = ctx.userdata.holds.get(product["id"])
+        if hold is None or hold.quantity != args.quantity:
+            hold = await self._reserve(ctx, product, args.quantity)
+        sold = hold is not None and await inventory_writer.run(inventory.commit, hold.hold_id)
+        if hold is not None and not sold:
+            hold = await self._reserve(ctx, product, args.quantity)
+            sold = hold is not None and await inventory_writer.run(inventory.commit, hold.hold_id)
+        ctx.userdata.holds.pop(product["id"], None)
+        if not sold:
+            left = await asyncio.to_thread(inventory.available, product["id"])
+            return f"Sorry, only {left} of {product['name']} left." if left else f"Sorry, {product['name']} is out of stock."
+        
+        order_id = new_order_id("ORD-")
         total_price = product["price"] * args.quantity
         
         order = {
@@ -221,7 +262,7 @@ IMPORTANT: Always provide all required parameters to functions. Use empty string
             "currency": "INR",
         }
         
-        save_order(order)
+        await persistence.run(save_order, order)
         
         return f"""
 🎉 Order Confirmed!
@@ -233,12 +274,8 @@ Total: ₹{total_price}
     @function_tool
     async def get_last_order(self, ctx: RunContext[EcommerceContext]) -> str:
         """Retrieve the most recent order."""
-        if not os.path.exists(ORDERS_FILE):
-            return "No previous orders found."
-        
         try:
-            with open(ORDERS_FILE, "r") as f:
-                orders = json.load(f)
+            orders = await persistence.run(load_orders)
         except:
             return "No valid orders found."
         
@@ -250,13 +287,24 @@ Total: ₹{total_price}
         return f"Your last order was {item['product_name']} for ₹{last['total']}."
 
 
-server = AgentServer()
+def prewarm_ecommerce(proc: JobProcess) -> None:
+    """Shared models, plus the inventory database opened and seeded before any call."""
+    prewarm(proc)
+    get_inventory()
+
+
+server = AgentServer(setup_fnc=prewarm_ecommerce)
 
 @server.rtc_session
 async def main(ctx: JobContext) -> None:
     from Day8.ecommerce_catalog import PRODUCTS
     
-    userdata = EcommerceContext(catalog=PRODUCTS)
+    # Index the catalog off the event loop before the customer starts talking.
+    # Not on the persistence writer: other sessions' saves would queue behind it
+    search_index = await asyncio.to_thread(index_for, PRODUCTS)
+    # Already open after prewarm; opened off the loop if prewarm didn't run
+    await asyncio.to_thread(get_inventory)
+    userdata = EcommerceContext(catalog=PRODUCTS, search_index=search_index)
     
     session = AgentSession[EcommerceContext](
         userdata=userdata,
@@ -266,10 +314,16 @@ async def main(ctx: JobContext) -> None:
             voice="Alicia",
             model="Murf Falcon",
         ),
-        turn_detection=MultilingualModel(),
-        vad=silero.VAD.load(),
+        turn_detection=get_turn_detector(ctx),
+        vad=get_vad(ctx),
     )
 
+    async def release_holds() -> None:
+        # Hangup: anything still reserved goes back on sale
+        await inventory_writer.run(get_inventory().release_owner, userdata.session_id)
+
+    ctx.add_shutdown_callback(release_holds)
+
     agent = EcommerceAgent(userdata=userdata)
     await session.start(agent=agent, room=ctx.room)
     
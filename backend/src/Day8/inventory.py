@@ -0,0 +1,284 @@
+# inventory.py
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from Day8.ecommerce_catalog import PRODUCTS
+from common.persistence import PersistenceService
+
+try:
+    import fcntl  # POSIX only, queues writers from different processes
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+INVENTORY_SQLITE_FILE = "inventory.db"
+
+# Seconds a reservation holds stock while the customer confirms
+HOLD_TTL = float(os.getenv("INVENTORY_HOLD_TTL", "300"))
+
+# How long a writer waits for another process's transaction before giving up (ms)
+BUSY_TIMEOUT_MS = 10_000
+
+
+@dataclass(frozen=True)
+class Hold:
+    hold_id: str
+    sku: str
+    quantity: int
+    owner: str
+    expires_at: float
+
+
+class InventoryService:
+    """
+    Per-SKU stock with time-limited reservations, in SQLite.
+
+    Every worker process opens the same database, so all buyers share one
+    count. A reservation is a single conditional UPDATE (held += n only if
+    on_hand - held >= n), so two buyers can never hold or sell the same
+    unit. Holds expire after their TTL and are swept lazily whenever their
+    SKU is reserved again, or by expire(). commit() turns a hold into a
+    sale; release() (or release_owner() on hangup) gives it back.
+
+    Stock reads never take a lock: each thread reads through its own
+    connection, and WAL lets readers see the last committed state while a
+    writer is busy.
+    """
+
+    def __init__(self, db_path: str = INVENTORY_SQLITE_FILE, *, hold_ttl: float = HOLD_TTL,
+                 clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.hold_ttl = hold_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._readers = threading.local()
+        # Writers from other processes wait on this file lock instead of
+        # SQLite's sleep-and-retry busy handler, so they wake as soon as it's free
+        self._write_lock_fd = os.open(db_path + ".lock", os.O_RDWR | os.O_CREAT, 0o644) if fcntl else None
+        self._conn = self._connect()
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS stock (
+                sku TEXT PRIMARY KEY,
+                on_hand INTEGER NOT NULL,
+                held INTEGER NOT NULL DEFAULT 0,
+                CHECK (held >= 0 AND held <= on_hand)
+            );
+            CREATE TABLE IF NOT EXISTS holds (
+                hold_id TEXT PRIMARY KEY,
+                sku TEXT NOT NULL,
+                quantity INTEGER NOT NULL,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS holds_sku_expiry ON holds (sku, expires_at);
+            CREATE INDEX IF NOT EXISTS holds_expiry ON holds (expires_at);
+            CREATE INDEX IF NOT EXISTS holds_owner ON holds (owner);
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: write transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                               timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = self._readers.conn = self._connect()
+        return conn
+
+    def _transaction(self, work: Callable[[sqlite3.Connection], object]):
+        """Run `work` in one write transaction, holding the database's write lock throughout."""
+        with self._lock:
+            if self._write_lock_fd is not None:
+                fcntl.flock(self._write_lock_fd, fcntl.LOCK_EX)
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    result = work(self._conn)
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+                return result
+            finally:
+                if self._write_lock_fd is not None:
+                    fcntl.flock(self._write_lock_fd, fcntl.LOCK_UN)
+
+    # --- Stock levels ---
+    def seed(self, products: Iterable[dict]) -> None:
+        """Add catalog SKUs with their `stock` as on-hand. SKUs already tracked keep their counts."""
+        rows = [(p["id"], int(p.get("stock", 0))) for p in products]
+        self._transaction(lambda conn: conn.executemany(
+            "INSERT OR IGNORE INTO stock (sku, on_hand) VALUES (?, ?)", rows))
+
+    def restock(self, sku: str, quantity: int) -> None:
+        self._transaction(lambda conn: conn.execute(
+            "INSERT INTO stock (sku, on_hand) VALUES (?, ?) "
+            "ON CONFLICT(sku) DO UPDATE SET on_hand = on_hand + excluded.on_hand", (sku, quantity)))
+
+    _AVAILABLE_SQL = """
+        SELECT on_hand - held + COALESCE(
+            (SELECT SUM(quantity) FROM holds WHERE holds.sku = stock.sku AND expires_at <= ?), 0)
+        FROM stock WHERE sku = ?
+    """
+
+    def available(self, sku: str) -> int:
+        """Units that can still be reserved (holds past their TTL don't count). 0 for unknown SKUs."""
+        row = self._reader().execute(self._AVAILABLE_SQL, (self._clock(), sku)).fetchone()
+        return row[0] if row else 0
+
+    def available_many(self, skus: Iterable[str]) -> Dict[str, int]:
+        now = self._clock()
+        reader = self._reader()
+        levels = {}
+        for sku in skus:
+            row = reader.execute(self._AVAILABLE_SQL, (now, sku)).fetchone()
+            levels[sku] = row[0] if row else 0
+        return levels
+
+    def on_hand(self, sku: str) -> int:
+        row = self._reader().execute("SELECT on_hand FROM stock WHERE sku = ?", (sku,)).fetchone()
+        return row[0] if row else 0
+
+    # --- Reservations ---
+    def _expire_locked(self, conn: sqlite3.Connection, now: float, sku: Optional[str] = None) -> int:
+        if sku is None:
+            expired = conn.execute(
+                "SELECT sku, SUM(quantity), COUNT(*) FROM holds WHERE expires_at <= ? GROUP BY sku", (now,)
+            ).fetchall()
+        else:
+            expired = conn.execute(
+                "SELECT sku, SUM(quantity), COUNT(*) FROM holds WHERE sku = ? AND expires_at <= ? GROUP BY sku",
+                (sku, now),
+            ).fetchall()
+        if not expired:
+            return 0
+        conn.executemany("UPDATE stock SET held = held - ? WHERE sku = ?", [(qty, s) for s, qty, _ in expired])
+        if sku is None:
+            conn.execute("DELETE FROM holds WHERE expires_at <= ?", (now,))
+        else:
+            conn.execute("DELETE FROM holds WHERE sku = ? AND expires_at <= ?", (sku, now))
+        return sum(count for _, _, count in expired)
+
+    def reserve(self, sku: str, quantity: int, owner: str, ttl: Optional[float] = None) -> Optional[Hold]:
+        """Hold `quantity` units for `owner`. Returns the hold, or None if not enough stock is free."""
+        if quantity < 1:
+            raise ValueError("quantity must be at least 1")
+        now = self._clock()
+        hold = Hold(hold_id=uuid.uuid4().hex, sku=sku, quantity=quantity, owner=owner,
+                    expires_at=now + (self.hold_ttl if ttl is None else ttl))
+
+        def work(conn: sqlite3.Connection) -> Optional[Hold]:
+            self._expire_locked(conn, now, sku)
+            reserved = conn.execute(
+                "UPDATE stock SET held = held + ? WHERE sku = ? AND on_hand - held >= ?",
+                (quantity, sku, quantity),
+            ).rowcount
+            if not reserved:
+                return None
+            conn.execute(
+                "INSERT INTO holds (hold_id, sku, quantity, owner, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (hold.hold_id, hold.sku, hold.quantity, hold.owner, hold.expires_at),
+            )
+            return hold
+
+        return self._transaction(work)
+
+    def commit(self, hold_id: str) -> bool:
+        """Turn a live hold into a sale (stock leaves on-hand). False if it expired or is unknown."""
+        now = self._clock()
+
+        def work(conn: sqlite3.Connection) -> bool:
+            row = conn.execute("SELECT sku, quantity, expires_at FROM holds WHERE hold_id = ?", (hold_id,)).fetchone()
+            if row is None:
+                return False
+            sku, quantity, expires_at = row
+            conn.execute("DELETE FROM holds WHERE hold_id = ?", (hold_id,))
+            if expires_at <= now:
+                conn.execute("UPDATE stock SET held = held - ? WHERE sku = ?", (quantity, sku))
+                return False
+            conn.execute("UPDATE stock SET on_hand = on_hand - ?, held = held - ? WHERE sku = ?",
+                         (quantity, quantity, sku))
+            return True
+
+        return self._transaction(work)
+
+    def release(self, hold_id: str) -> bool:
+        """Give a hold's units back. False if it was already gone."""
+        def work(conn: sqlite3.Connection) -> bool:
+            row = conn.execute("SELECT sku, quantity FROM holds WHERE hold_id = ?", (hold_id,)).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM holds WHERE hold_id = ?", (hold_id,))
+            conn.execute("UPDATE stock SET held = held - ? WHERE sku = ?", (row[1], row[0]))
+            return True
+
+        return self._transaction(work)
+
+    def release_owner(self, owner: str) -> int:
+        """Release every hold of one buyer (e.g. when they hang up). Returns how many."""
+        def work(conn: sqlite3.Connection) -> int:
+            rows = conn.execute(
+                "SELECT sku, SUM(quantity), COUNT(*) FROM holds WHERE owner = ? GROUP BY sku", (owner,)
+            ).fetchall()
+            conn.executemany("UPDATE stock SET held = held - ? WHERE sku = ?", [(qty, sku) for sku, qty, _ in rows])
+            conn.execute("DELETE FROM holds WHERE owner = ?", (owner,))
+            return sum(count for _, _, count in rows)
+
+        return self._transaction(work)
+
+    def expire(self) -> int:
+        """Release every hold past its TTL. Returns how many."""
+        now = self._clock()
+        return self._transaction(lambda conn: self._expire_locked(conn, now))
+
+    def holds(self, owner: Optional[str] = None) -> List[Hold]:
+        sql, params = "SELECT hold_id, sku, quantity, owner, expires_at FROM holds", ()
+        if owner is not None:
+            sql, params = sql + " WHERE owner = ?", (owner,)
+        return [Hold(*row) for row in self._reader().execute(sql, params).fetchall()]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+            if self._write_lock_fd is not None:
+                os.close(self._write_lock_fd)
+                self._write_lock_fd = None
+        conn = getattr(self._readers, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._readers.conn = None
+
+
+_inventory: Optional[InventoryService] = None
+_inventory_lock = threading.Lock()
+
+# Inventory writes can wait on another process's file lock, so they queue on
+# their own writer thread instead of stalling order saves in `persistence`
+inventory_writer = PersistenceService("inventory-writer")
+atexit.register(inventory_writer.close)
+
+
+def get_inventory() -> InventoryService:
+    """
+    Process-wide inventory, opened on first use and seeded from the Day8 catalog.
+
+    Opening and seeding touch the disk; the agent calls this from prewarm or
+    a worker thread so the event loop never does it.
+    """
+    global _inventory
+    if _inventory is None:
+        with _inventory_lock:
+            if _inventory is None:
+                inventory = InventoryService()
+                inventory.seed(PRODUCTS)
+                _inventory = inventory
+    return _inventory
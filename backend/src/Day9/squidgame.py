@@ -20,11 +20,13 @@ from livekit.agents import (
     cli,
     function_tool,
 )
-from livekit.plugins import google, deepgram, silero, murf
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from livekit.plugins import google, deepgram, murf
 from pydantic import BaseModel, Field
 import random
 
+from common.persistence import persistence
+from common.prewarm import get_turn_detector, get_vad, prewarm
+
 load_dotenv()
 logger = logging.getLogger("SquidGameImprov")
 logger.setLevel(logging.INFO)
@@ -54,6 +56,13 @@ def save_session(session: dict) -> dict:
     logger.info(f"Session saved: {session['session_id']}")
     return session
 
+def load_sessions() -> list:
+    """Reads all saved improv sessions (empty list if none yet)."""
+    if not os.path.exists(SESSIONS_FILE):
+        return []
+    with open(SESSIONS_FILE, "r") as f:
+        return json.load(f)
+
 # ============================================================================
 # SQUID GAME IMPROV SCENARIOS - Day 10: Clear, tense, character-driven
 # ============================================================================
@@ -360,7 +369,7 @@ The games are over. You may go. Remember this: In life as in improv, commitment
             "performances": ctx.userdata.performances
         }
         
-        save_session(session_data)
+        await persistence.run(save_session, session_data)
         
         return closing
 
@@ -388,7 +397,7 @@ The games are over. You may go. Remember this: In life as in improv, commitment
             "status": "early_exit"
         }
         
-        save_session(session_data)
+        await persistence.run(save_session, session_data)
         return farewell
 
     @function_tool
@@ -396,12 +405,8 @@ The games are over. You may go. Remember this: In life as in improv, commitment
         """
         Retrieve most recent session
         """
-        if not os.path.exists(SESSIONS_FILE):
-            return "No previous sessions found."
-        
         try:
-            with open(SESSIONS_FILE, "r") as f:
-                sessions = json.load(f)
+            sessions = await persistence.run(load_sessions)
         except Exception as e:
             logger.error(f"Error reading sessions: {e}")
             return "No valid sessions found."
@@ -417,7 +422,7 @@ The games are over. You may go. Remember this: In life as in improv, commitment
 # LIVEKIT SERVER SETUP - Day 10 Voice Agent
 # ============================================================================
 
-server = AgentServer()
+server = AgentServer(setup_fnc=prewarm)
 
 @server.rtc_session
 async def main(ctx: JobContext) -> None:
@@ -442,8 +447,8 @@ async def main(ctx: JobContext) -> None:
             stt=deepgram.STT(model="nova-2", language="en"),
             llm=google.LLM(model="gemini-2.5-flash"),
             tts=murf.TTS(voice="Alicia", model="Murf Falcon"),
-            turn_detection=MultilingualModel(),
-            vad=silero.VAD.load(),
+            turn_detection=get_turn_detector(ctx),
+            vad=get_vad(ctx),
         )
         
         logger.info("✓ STT: Deepgram Nova-2")
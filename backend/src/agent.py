@@ -5,7 +5,6 @@ from livekit.agents import (
     Agent,
     AgentSession,
     JobContext,
-    JobProcess,
     MetricsCollectedEvent,
     RoomInputOptions,
     WorkerOptions,
@@ -15,8 +14,9 @@ from livekit.agents import (
     # function_tool,
     # RunContext
 )
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from livekit.plugins import murf, google, deepgram, noise_cancellation
+
+from common.prewarm import get_turn_detector, get_vad, prewarm
 
 logger = logging.getLogger("agent")
 
@@ -50,10 +50,6 @@ class Assistant(Agent):
     #     return "sunny with a temperature of 70 degrees."
 
 
-def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
-
-
 async def entrypoint(ctx: JobContext):
     # Logging setup
     # Add any other context you want in all log entries here
@@ -81,8 +77,8 @@ async def entrypoint(ctx: JobContext):
             ),
         # VAD and turn detection are used to determine when the user is speaking and when the agent should respond
         # See more at https://docs.livekit.io/agents/build/turns
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
+        turn_detection=get_turn_detector(ctx),
+        vad=get_vad(ctx),
         # allow the LLM to generate a response while waiting for the end of turn
         # See more at https://docs.livekit.io/agents/build/audio/#preemptive-generation
         preemptive_generation=True,
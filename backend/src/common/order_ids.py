@@ -0,0 +1,158 @@
+# order_ids.py
+# Sortable, collision-free order IDs shared by the ordering agents.
+#
+# Snowflake layout in 64 bits, written as 13 Crockford base32 characters so
+# IDs sort as strings in creation order and stay short enough to read out:
+#
+#     41 bits  milliseconds since ORDER_ID_EPOCH_MS (~69 years)
+#     10 bits  worker id (one per process, 0-1023)
+#     12 bits  sequence within the millisecond (4096/ms per worker)
+#
+#     order_id = new_order_id("ORD-")   # e.g. ORD-0AB3K7Q2M0001
+
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to a pid-derived worker id
+    fcntl = None
+
+logger = logging.getLogger("order-ids")
+
+ORDER_ID_EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z
+
+TIMESTAMP_BITS = 41
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+ID_LENGTH = 13
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"  # Crockford base32
+_DECODE = {char: value for value, char in enumerate(_ALPHABET)}
+
+# Worker ids are claimed with a lock file per id; the OS drops the lock when
+# the process exits, so crashed workers never leak an id. Lock files only
+# keep processes on one host apart: when several hosts write to the same
+# order store, pin each process with a distinct ORDER_WORKER_ID instead.
+WORKER_LOCK_DIR = Path(os.getenv("ORDER_WORKER_LOCK_DIR", os.path.join(tempfile.gettempdir(), "order-id-workers")))
+
+
+def encode(value: int) -> str:
+    chars = []
+    for _ in range(ID_LENGTH):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def decode_order_id(order_id: str) -> Tuple[int, int, int]:
+    """(unix ms, worker id, sequence) of an ID, with or without its prefix."""
+    value = 0
+    for char in order_id[-ID_LENGTH:].upper():
+        value = (value << 5) | _DECODE[char]
+    sequence = value & MAX_SEQUENCE
+    worker_id = (value >> SEQUENCE_BITS) & MAX_WORKER_ID
+    timestamp = (value >> (SEQUENCE_BITS + WORKER_BITS)) + ORDER_ID_EPOCH_MS
+    return timestamp, worker_id, sequence
+
+
+def _claim_worker_id() -> Tuple[int, Optional[int]]:
+    """Lock the first free worker id, starting from one derived from the pid. Returns (id, lock fd)."""
+    env = os.getenv("ORDER_WORKER_ID")
+    if env is not None:
+        worker_id = int(env)
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"ORDER_WORKER_ID must be 0-{MAX_WORKER_ID}, got {worker_id}")
+        return worker_id, None
+
+    start = zlib.crc32(f"{os.getpid()}".encode()) & MAX_WORKER_ID
+    if fcntl is None:
+        return start, None
+
+    WORKER_LOCK_DIR.mkdir(parents=True, exist_ok=True)
+    for offset in range(MAX_WORKER_ID + 1):
+        worker_id = (start + offset) & MAX_WORKER_ID
+        fd = os.open(WORKER_LOCK_DIR / f"worker-{worker_id}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            continue
+        return worker_id, fd
+    raise RuntimeError(f"All {MAX_WORKER_ID + 1} order worker ids are in use")
+
+
+class OrderIdGenerator:
+    """
+    Snowflake-style ID source for one process.
+
+    IDs from one generator strictly increase: if the clock steps back, or
+    more than 4096 IDs are asked for within a millisecond, the timestamp
+    part runs ahead of the clock instead of repeating.
+    """
+
+    def __init__(self, worker_id: Optional[int] = None, *, clock: Callable[[], float] = time.time):
+        if worker_id is not None and not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be 0-{MAX_WORKER_ID}, got {worker_id}")
+        self._fixed_worker_id = worker_id
+        self._worker_id = worker_id
+        self._lock_fd: Optional[int] = None
+        self._clock = clock
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @property
+    def worker_id(self) -> int:
+        if self._worker_id is None:
+            with self._lock:
+                if self._worker_id is None:
+                    self._worker_id, self._lock_fd = _claim_worker_id()
+                    logger.info(f"Order IDs using worker id {self._worker_id}")
+        return self._worker_id
+
+    def next_int(self) -> int:
+        worker_id = self.worker_id
+        with self._lock:
+            now_ms = int(self._clock() * 1000) - ORDER_ID_EPOCH_MS
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            elif self._sequence < MAX_SEQUENCE:
+                self._sequence += 1
+            else:
+                # Sequence exhausted (or clock went back): borrow the next millisecond
+                self._last_ms += 1
+                self._sequence = 0
+            return (self._last_ms << (WORKER_BITS + SEQUENCE_BITS)) | (worker_id << SEQUENCE_BITS) | self._sequence
+
+    def next_id(self, prefix: str = "ORD-") -> str:
+        return f"{prefix}{encode(self.next_int())}"
+
+    def _after_fork(self) -> None:
+        # A forked child shares the parent's lock, so it must claim its own id
+        self._lock = threading.Lock()
+        if self._fixed_worker_id is None:
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+            self._worker_id = None
+            self._lock_fd = None
+
+
+# Shared generator for this process
+order_ids = OrderIdGenerator()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=order_ids._after_fork)
+
+
+def new_order_id(prefix: str = "ORD-") -> str:
+    return order_ids.next_id(prefix)
@@ -0,0 +1,112 @@
+# persistence.py
+# Off-loop file persistence shared by every Day agent.
+#
+# Function tools hand their blocking save/load helpers to the writer thread
+# and await the result, so a slow disk never stalls the event loop that is
+# also moving audio frames for every room on the worker:
+#
+#     await persistence.run(save_order, order)
+
+import asyncio
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("persistence")
+
+_STOP = object()
+
+
+class PersistenceService:
+    """
+    Single background writer thread fed by a FIFO queue.
+
+    Jobs run one at a time in submission order, so read-modify-write helpers
+    from different sessions in this process can't interleave, and a load
+    queued after a save always sees that save.
+    """
+
+    def __init__(self, name: str = "persistence-writer"):
+        self.name = name
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        # Counters for load tests and metrics; only the writer thread updates them
+        self.completed = 0
+        self.busy_seconds = 0.0
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PersistenceService is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                future, fn, args, kwargs = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                started = time.perf_counter()
+                result, error = None, None
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    logger.error(f"Persistence job {getattr(fn, '__name__', fn)} failed: {e}")
+                    error = e
+                # Count the job before waking whoever awaits it
+                self.busy_seconds += time.perf_counter() - started
+                self.completed += 1
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    # --- Public API ---
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue a blocking call. The returned future resolves once it has run."""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Queue a blocking call and wait for it without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def pending(self) -> int:
+        """Number of jobs waiting in the queue."""
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Block until every queued job has run."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Finish queued jobs and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+
+# Shared writer for this worker process
+persistence = PersistenceService()
+atexit.register(persistence.close)
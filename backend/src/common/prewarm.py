@@ -0,0 +1,85 @@
+# prewarm.py
+# Process-wide model warmup shared by every Day agent server.
+#
+# Usage in a Day agent:
+#     server = AgentServer(setup_fnc=prewarm)
+#     ...
+#     session = AgentSession(..., turn_detection=get_turn_detector(ctx), vad=get_vad(ctx))
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from livekit.agents import JobContext, JobProcess
+from livekit.plugins import silero
+from livekit.plugins.turn_detector.multilingual import MultilingualModel
+
+logger = logging.getLogger("prewarm")
+
+VAD_KEY = "vad"
+TURN_DETECTOR_KEY = "turn_detection"
+METRICS_KEY = "model_load_metrics"
+MAX_METRICS = 1000  # keep only the most recent load records per process
+
+
+@dataclass
+class ModelLoadMetrics:
+    """How long a shared model took to become available to a session."""
+    model: str
+    load_ms: float
+    cold_start: bool  # True if the model was loaded for this call, False if reused
+    pid: int
+
+
+def _record(proc: JobProcess, model: str, load_ms: float, cold_start: bool) -> ModelLoadMetrics:
+    metric = ModelLoadMetrics(model=model, load_ms=load_ms, cold_start=cold_start, pid=proc.pid or 0)
+    proc.userdata.setdefault(METRICS_KEY, deque(maxlen=MAX_METRICS)).append(metric)
+    logger.info(
+        f"{model} {'cold' if cold_start else 'warm'} start: {load_ms:.1f} ms (pid {metric.pid})",
+        extra={"model": model, "load_ms": load_ms, "cold_start": cold_start},
+    )
+    return metric
+
+
+def _get_or_load(proc: JobProcess, key: str, model: str, loader: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    value = proc.userdata.get(key)
+    cold_start = value is None
+    if cold_start:
+        value = loader()
+        proc.userdata[key] = value
+    _record(proc, model, (time.perf_counter() - start) * 1000, cold_start)
+    return value
+
+
+def prewarm(proc: JobProcess) -> None:
+    """
+    setup_fnc for AgentServer: loads the Silero VAD once per worker process,
+    before any room is assigned to it.
+    """
+    _get_or_load(proc, VAD_KEY, "silero_vad", silero.VAD.load)
+
+
+def get_vad(ctx: JobContext):
+    """Shared VAD for this worker process (loaded on demand if prewarm didn't run)."""
+    return _get_or_load(ctx.proc, VAD_KEY, "silero_vad", silero.VAD.load)
+
+
+def get_turn_detector(ctx: JobContext) -> MultilingualModel:
+    """
+    Shared turn detector for this worker process.
+
+    The model is bound to the process' inference executor, which only exists
+    inside a job, so it is built by the first session and reused afterwards.
+    """
+    return _get_or_load(ctx.proc, TURN_DETECTOR_KEY, "multilingual_turn_detector", MultilingualModel)
+
+
+def get_load_metrics(proc: JobProcess) -> Dict[str, list]:
+    """Group the recorded load times by model, e.g. for a usage summary."""
+    grouped: Dict[str, list] = {}
+    for metric in proc.userdata.get(METRICS_KEY, []):
+        grouped.setdefault(metric.model, []).append(metric)
+    return grouped
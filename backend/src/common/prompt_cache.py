@@ -0,0 +1,92 @@
+# prompt_cache.py
+# Per-process cache of rendered agent prompts.
+#
+# Static prompt sections (menus, catalogs, company context) only change when
+# their source data changes, so they are rendered once per data version and
+# reused by every session. Each rendered prompt carries a stable SHA-256 so
+# it is easy to check that sessions send byte-identical prefixes, which is
+# what provider-side prompt caching keys on.
+#
+#     rendered = prompt_cache.render("barista.instructions", MENU_VERSION, build_fn)
+#     Agent(instructions=rendered.text)
+#
+# Versions are small values (counters, modes, short hashes), never the prompt
+# text itself; content_version() derives one for inputs that have none.
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger("prompt-cache")
+
+
+def content_version(*parts: str) -> str:
+    """Short stable version for prompt inputs that don't carry one of their own."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    key: str
+    version: Hashable
+    text: str
+    sha256: str
+
+    @property
+    def short_hash(self) -> str:
+        return self.sha256[:12]
+
+
+class PromptCache:
+    """Rendered prompts keyed by name, re-rendered when their data version changes."""
+
+    def __init__(self):
+        self._entries: Dict[str, RenderedPrompt] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, key: str, version: Hashable, builder: Callable[[], str]) -> RenderedPrompt:
+        """Return the cached prompt for `key`, rebuilding it if `version` changed."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            return entry
+
+        text = builder()
+        entry = RenderedPrompt(
+            key=key,
+            version=version,
+            text=text,
+            sha256=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self.misses += 1
+        logger.info(f"Rendered prompt '{key}' (version {version}, {len(text)} chars, sha256 {entry.short_hash})")
+        return entry
+
+    def get(self, key: str) -> Optional[RenderedPrompt]:
+        return self._entries.get(key)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one cached prompt, or all of them."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def hashes(self) -> Dict[str, Tuple[Hashable, str]]:
+        """key -> (version, sha256) for everything currently cached."""
+        return {key: (e.version, e.sha256) for key, e in self._entries.items()}
+
+
+# Shared cache for this worker process
+prompt_cache = PromptCache()
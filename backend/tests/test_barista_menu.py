@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import pytest
+from livekit.agents import ToolError
+
+from Day1.agent_barista import CoffeeShopAgent, DrinkRequest, build_drink, new_userdata
+from Day1.database import MenuIndex, MenuItem, menu_index
+
+
+def test_menu_index_lookups_are_per_category() -> None:
+    index = MenuIndex([
+        MenuItem("latte", "Latte", "drink"),
+        MenuItem("oat_milk", "Oat Milk", "milk"),
+    ])
+    assert index.find("drink", "latte").name == "Latte"
+    assert index.find("milk", "latte") is None
+    assert index.find("syrup", "latte") is None
+    assert [i.id for i in index.items("milk")] == ["oat_milk"]
+
+    with pytest.raises(AttributeError):
+        index.find("drink", "latte").notes = "no __dict__ on slotted items"
+
+
+def test_build_drink_validates_every_part() -> None:
+    menu = menu_index()
+    item, description = build_drink(menu, "latte", "l", "oat_milk", ["vanilla", "shot"])
+    assert item.syrup_ids == ["vanilla", "shot"]
+    assert description == "L Latte with oat milk and vanilla, shot"
+
+    for args in (("tea",), ("latte", "m", "goat_milk"), ("latte", "m", None, ["ketchup"])):
+        with pytest.raises(ToolError):
+            build_drink(menu, *args)
+
+
+async def _agent_and_ctx():
+    userdata = await new_userdata()
+    return CoffeeShopAgent(userdata=userdata), SimpleNamespace(userdata=userdata)
+
+
+@pytest.mark.asyncio
+async def test_order_drinks_tool_adds_whole_table() -> None:
+    agent, ctx = await _agent_and_ctx()
+    result = await agent.order_drinks_tool(ctx, [
+        DrinkRequest(drink_id="latte", size="s"),
+        DrinkRequest(drink_id="mocha", milk_id="almond_milk", extra_ids=["whip"]),
+        DrinkRequest(drink_id="espresso"),
+    ])
+
+    assert result.startswith("Added 3 drinks")
+    drinks = sorted(i.drink_id for i in ctx.userdata.order.items.values())
+    assert drinks == ["espresso", "latte", "mocha"]
+
+
+@pytest.mark.asyncio
+async def test_order_drinks_tool_is_all_or_nothing() -> None:
+    agent, ctx = await _agent_and_ctx()
+    with pytest.raises(ToolError, match="Drink 2"):
+        await agent.order_drinks_tool(ctx, [
+            DrinkRequest(drink_id="latte"),
+            DrinkRequest(drink_id="frappuccino"),
+        ])
+    assert ctx.userdata.order.items == {}
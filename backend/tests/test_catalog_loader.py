@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from Day6 import grocery_database
+from Day6.catalog_loader import CatalogLoader
+from Day6.grocery_database import build_catalog, current_catalog, find_product_by_id, search_products
+
+
+def _write(path, data, mtime=None) -> None:
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime is not None:
+        # Same-size edits can land within one mtime tick; make the change visible
+        os.utime(path, ns=(mtime, mtime))
+
+
+def _catalog(price: float = 3.99) -> dict:
+    return {
+        "format_version": 2,
+        "revision": 1,
+        "store_name": "Test Mart",
+        "categories": {"groceries": [
+            {"id": "g001", "name": "Bread", "price": price, "brand": "B", "size": "1", "tags": [], "keywords": ["loaf"]},
+            {"id": "g002", "name": "Jam", "price": 2.0, "brand": "J", "size": "1", "tags": [], "keywords": []},
+        ]},
+        "recipes": [{"name": "toast", "item_ids": ["g001", "g002"], "keywords": ["jam toast"], "servings": 2}],
+    }
+
+
+def test_catalog_file_is_the_source() -> None:
+    catalog = current_catalog()
+    assert catalog.store_name == "FreshMart Express"
+    assert len(catalog.products) == 23
+    assert find_product_by_id("g007").name == "Pasta"
+    assert search_products("bread")[0].id in {"g001", "g002"}
+    assert grocery_database.find_recipe("pasta for two").servings == 2
+    assert grocery_database.CATALOG_VERSION == catalog.version
+
+
+def test_format_1_still_loads() -> None:
+    data = _catalog()
+    del data["format_version"]
+    data["recipes"] = {"toast": ["g001", "g002"]}
+    catalog = build_catalog(data)
+    assert catalog.recipes[0].servings == 1
+    assert [p.id for p in catalog.recipe_index.ingredients(catalog.recipes[0])] == ["g001", "g002"]
+
+
+def test_reload_swaps_snapshot(tmp_path) -> None:
+    path = tmp_path / "catalog.json"
+    _write(path, _catalog(), mtime=1_000_000_000)
+    loader = CatalogLoader(path, build_catalog)
+
+    old = loader.current
+    assert loader.reload_if_changed() is False
+
+    _write(path, _catalog(price=4.99), mtime=2_000_000_000)
+    assert loader.reload_if_changed() is True
+    assert loader.current.product_index.get("g001").price == 4.99
+    assert loader.current.version == old.version + 1
+    # Readers holding the old snapshot keep a consistent view
+    assert old.product_index.get("g001").price == 3.99
+
+
+def test_bad_file_keeps_last_good(tmp_path) -> None:
+    path = tmp_path / "catalog.json"
+    _write(path, _catalog(), mtime=1_000_000_000)
+    loader = CatalogLoader(path, build_catalog)
+    good = loader.current
+
+    path.write_text("{ not json", encoding="utf-8")
+    assert loader.reload_if_changed() is False
+    assert loader.current is good and loader.failures == 1
+
+    _write(path, dict(_catalog(), format_version=99), mtime=3_000_000_000)
+    assert loader.reload_if_changed() is False
+    assert loader.current is good
+    with pytest.raises(ValueError):
+        loader.load()
+
+    _write(path, [], mtime=4_000_000_000)
+    assert loader.reload_if_changed() is False
+    assert loader.current is good and loader.failures == 3
+
+
+def test_recipe_with_unknown_product_is_rejected(tmp_path) -> None:
+    path = tmp_path / "catalog.json"
+    _write(path, _catalog(), mtime=1_000_000_000)
+    loader = CatalogLoader(path, build_catalog)
+    good = loader.current
+
+    data = _catalog()
+    data["recipes"][0]["item_ids"] = ["g001", "g0002"]
+    with pytest.raises(ValueError, match="g0002"):
+        build_catalog(data)
+
+    _write(path, data, mtime=2_000_000_000)
+    assert loader.reload_if_changed() is False
+    assert loader.current is good and loader.failures == 1
+
+
+async def test_background_reload(tmp_path) -> None:
+    path = tmp_path / "catalog.json"
+    _write(path, _catalog(), mtime=1_000_000_000)
+    loader = CatalogLoader(path, build_catalog, poll_interval=0.01)
+    loader.start()
+    try:
+        version = loader.version
+        _write(path, _catalog(price=5.49), mtime=2_000_000_000)
+        for _ in range(200):
+            if loader.version > version:
+                break
+            await asyncio.sleep(0.01)
+        assert loader.current.product_index.get("g001").price == 5.49
+        assert loader.reloads == 1
+    finally:
+        await loader.aclose()
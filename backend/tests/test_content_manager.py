@@ -0,0 +1,84 @@
+import json
+
+from Day3.content_manager import ContentManager, Lesson
+
+
+def _write_lessons(path, count):
+    lessons = [{
+        "id": f"topic_{i}",
+        "title": f"Topic {i} \"quoted\" {{braces}} [and, brackets]: ü",
+        "summary": "Line one\nline two with a \\ backslash and \"id\": \"fake\"",
+        "sample_question": f"Question {i}?",
+    } for i in range(count)]
+    path.write_text(json.dumps(lessons, indent=2, ensure_ascii=False), encoding="utf-8")
+    return lessons
+
+
+def test_lessons_match_full_parse(tmp_path) -> None:
+    path = tmp_path / "lessons.json"
+    lessons = _write_lessons(path, 500)
+    content = ContentManager(str(path))
+
+    assert content.get_lesson("topic_250") == Lesson(**lessons[250])
+    assert content.get_lesson("missing") is None
+    assert len(content) == 500
+    assert content.get_all_topics() == ", ".join(lesson["title"] for lesson in lessons)
+    assert content.lesson_ids()[:2] == ["topic_0", "topic_1"]
+    content.close()
+
+
+def test_index_is_built_lazily(tmp_path) -> None:
+    path = tmp_path / "lessons.json"
+    content = ContentManager(str(path))  # file doesn't exist yet: nothing is read here
+    _write_lessons(path, 3)
+    assert content.get_lesson("topic_2").sample_question == "Question 2?"
+
+
+def test_non_string_fields_and_bundled_content(tmp_path) -> None:
+    path = tmp_path / "lessons.json"
+    path.write_text('[{"order": 1, "tags": ["a", "b"], "id": "x", "title": "X", '
+                    '"summary": "s", "sample_question": "q"}]')
+    content = ContentManager(str(path))
+    assert content.get_all_topics() == "X"
+
+    assert ContentManager().get_all_topics() == "Variables, Loops, Functions"
+
+
+def test_index_does_not_parse_lessons(tmp_path, monkeypatch) -> None:
+    code = "def f():\n    return {'a': [1, {2: 3}]}  # \\\"}\" " * 200
+    lessons = [{"id": f"code_{i}", "title": f"Code {{{i}}}", "summary": code,
+                "sample_question": "What does f return?", "examples": [{"code": code}]} for i in range(50)]
+    path = tmp_path / "lessons.json"
+    path.write_text(json.dumps(lessons, indent=2))
+
+    parsed = []
+    real_loads = json.loads
+    monkeypatch.setattr("Day3.content_manager.json.loads",
+                        lambda data: parsed.append(len(data)) or real_loads(data))
+    content = ContentManager(str(path))
+    assert len(content) == 50
+    assert max(parsed) < 20  # only the short id/title/key strings were decoded
+
+    parsed.clear()
+    assert content.get_lesson("code_7").summary == code
+    assert len(parsed) == 1
+    assert content.get_all_topics().startswith("Code {0}, Code {1}")
+
+
+def test_missing_or_broken_file_is_retried(tmp_path) -> None:
+    path = tmp_path / "lessons.json"
+    content = ContentManager(str(path))
+    assert content.get_all_topics() == "" and len(content) == 0
+
+    path.write_text('[{"id": "x", "title": "X", "summary": ')
+    assert content.get_lesson("x") is None
+
+    _write_lessons(path, 2)
+    assert content.get_lesson("topic_1").sample_question == "Question 1?"
+    content.close()
+
+
+def test_extra_lesson_keys_are_ignored(tmp_path) -> None:
+    path = tmp_path / "lessons.json"
+    path.write_text('[{"id": "x", "title": "X", "summary": "s", "sample_question": "q", "difficulty": 2}]')
+    assert ContentManager(str(path)).get_lesson("x") == Lesson(id="x", title="X", summary="s", sample_question="q")
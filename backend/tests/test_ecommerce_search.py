@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+from Day8 import catalog_index
+from Day8 import inventory as inventory_module
+from Day8.catalog_index import INDEX_CACHE_SIZE, CatalogSearchIndex, index_for, stem
+from Day8.ecommerce_catalog import PRODUCTS
+from Day8.inventory import InventoryService
+
+
+def _normalize(text: str) -> str:
+    return text.lower().replace("-", " ").replace(",", " ") if text else ""
+
+
+def _linear_search(query="", category="", color="", max_price=None) -> list:
+    """The original search_products scan."""
+    query, category, color = _normalize(query), _normalize(category), _normalize(color)
+    results = []
+    for p in PRODUCTS:
+        prod_cat = _normalize(p.get("category", ""))
+        if category and category not in prod_cat and prod_cat not in category:
+            continue
+        if max_price is not None and p.get("price", 0) > max_price:
+            continue
+        if color and color not in _normalize(p.get("color", "")):
+            continue
+        text = _normalize(f"{p.get('name', '')} {p.get('description', '')} {p.get('category', '')}")
+        if not all((w[:-1] if w.endswith("s") and len(w) > 3 else w) in text for w in query.split()):
+            continue
+        results.append(p)
+    return results
+
+
+def test_index_matches_linear_scan() -> None:
+    index = CatalogSearchIndex(PRODUCTS)
+    cases = [{"query": q} for q in ["", "mug", "mugs", "coffee mug", "hoodie", "hoodies", "t-shirt",
+                                     "white t-shirt", "cap", "ceramic", "cotton", "marble", "nope"]]
+    cases += [{"category": c} for c in ["mug", "hoodie", "t-shirt", "cap"]]
+    cases += [{"color": c} for c in ["black", "navy", "white"]]
+    cases += [{"max_price": 900}, {"query": "mug", "max_price": 900}, {"category": "hoodie", "color": "black"}]
+
+    for case in cases:
+        expected = [p["id"] for p in _linear_search(**case)]
+        assert [p["id"] for p in index.search(**case)] == expected, case
+
+
+def test_stemming_prefixes_and_compounds() -> None:
+    index = CatalogSearchIndex(PRODUCTS)
+    tshirts = [p["id"] for p in PRODUCTS if p["category"] == "t-shirt"]
+
+    assert stem("hoodies") == "hoodie" and stem("glasses") == "glass" and stem("mugs") == "mug"
+    assert [p["id"] for p in index.search("tshirts")] == tshirts
+    assert index.search("hood") == index.search("hoodie")
+    assert index.search("a mug for my dad") == index.search("mug dad")
+
+
+def test_index_is_shared_and_rebuilt_on_change() -> None:
+    catalog = list(PRODUCTS)
+    index = index_for(catalog)
+    assert index_for(catalog) is index
+
+    catalog.append({"id": "mug-999", "name": "Enamel Camp Mug", "category": "mug", "price": 500})
+    assert index_for(catalog) is not index
+    assert index_for(catalog).search("enamel")[0]["id"] == "mug-999"
+
+    # Edited in place: same list, same length
+    catalog[-1] = dict(catalog[-1], name="Steel Camp Mug")
+    assert index_for(catalog).search("steel")[0]["id"] == "mug-999"
+    assert index_for(catalog).search("enamel") == []
+
+
+def test_index_cache_is_bounded() -> None:
+    catalogs = [list(PRODUCTS) for _ in range(INDEX_CACHE_SIZE + 3)]
+    for catalog in catalogs:
+        index_for(catalog)
+    assert len(catalog_index._indexes) == INDEX_CACHE_SIZE
+    assert id(catalogs[-1]) in catalog_index._indexes and id(catalogs[0]) not in catalog_index._indexes
+
+
+async def test_search_lists_first_results_only(tmp_path, monkeypatch) -> None:
+    from Day8.ecommerce_agent import MAX_LISTED, EcommerceAgent, EcommerceContext
+
+    catalog = [{"id": f"mug-{n}", "name": f"Mug {n}", "category": "mug", "price": 100 + n, "stock": 5}
+               for n in range(MAX_LISTED + 5)]
+    inventory = InventoryService(str(tmp_path / "inventory.db"))
+    inventory.seed(catalog)
+    monkeypatch.setattr(inventory_module, "_inventory", inventory)
+
+    userdata = EcommerceContext(catalog=catalog)
+    agent = EcommerceAgent(userdata=userdata)
+    args = SimpleNamespace(query="mugs", category="", color="", max_price=999999)
+
+    result = await agent.search_products(SimpleNamespace(userdata=userdata), args)
+    assert f"found {MAX_LISTED + 5} product(s)" in result
+    assert f"{MAX_LISTED}. Mug {MAX_LISTED - 1}" in result and f"Mug {MAX_LISTED}\n" not in result
+    assert len(userdata.current_browsing) == MAX_LISTED + 5
+    inventory.close()
@@ -0,0 +1,40 @@
+from Day4.faq_index import FAQSearchIndex, tokenize
+from Day4.nykaa_database import FAQ_DATA, FAQItem, find_faq_answer, search_faq
+
+
+def test_ranking_prefers_the_specific_faq() -> None:
+    # The old first-substring match answered this with the delivery FAQ
+    top, _ = search_faq("how do I track my order")[0]
+    assert top.question == "How do I track my order?"
+
+    top, _ = search_faq("what are the delivery times")[0]
+    assert top.question == "What are your delivery times?"
+
+
+def test_returns_top_k_with_descending_scores() -> None:
+    results = search_faq("professional membership", top_k=3)
+    assert len(results) == 3
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert results[0][0].question == "What is Nykaa PRO?"
+
+
+def test_no_match_returns_nothing() -> None:
+    assert search_faq("zzz qqq") == []
+    assert find_faq_answer("zzz qqq") is None
+    assert find_faq_answer("Are your products genuine?") == FAQ_DATA[8].answer
+
+
+def test_index_over_custom_faqs() -> None:
+    index = FAQSearchIndex([
+        FAQItem("Do you ship abroad?", "Only within India.", ["international", "abroad"]),
+        FAQItem("Can I pay by card?", "Yes, all major cards.", ["payment", "card"]),
+    ])
+    assert len(index) == 2
+    assert index.search("paying with cards", k=1)[0][0].question == "Can I pay by card?"
+    assert tokenize("The Brands' shipping") == ["brand", "ship"]
+
+
+def test_relative_cutoff_drops_weak_matches() -> None:
+    results = search_faq("how do I track my order", top_k=3, min_relative_score=0.6)
+    assert [faq.question for faq, _ in results] == ["How do I track my order?"]
@@ -0,0 +1,39 @@
+from Day5.fraud_case import FraudCase
+from Day5.fraud_database import MOCK_FRAUD_CASES, FraudCaseRepository
+
+
+def _repo(tmp_path) -> FraudCaseRepository:
+    repo = FraudCaseRepository(str(tmp_path / "fraud_cases.db"))
+    repo.save_many([FraudCase.from_dict(case) for case in MOCK_FRAUD_CASES])
+    return repo
+
+
+def test_lookups_by_username_and_id(tmp_path) -> None:
+    repo = _repo(tmp_path)
+    case = repo.find_by_username("sarah SMITH")
+    assert case is not None and case.case_id == "FRAUD_002"
+    assert repo.get("FRAUD_003").userName == "Raj Kumar"
+    assert repo.find_by_username("nobody") is None
+
+
+def test_updates_persist_and_reload(tmp_path) -> None:
+    repo = _repo(tmp_path)
+    assert repo.update_status("FRAUD_001", "confirmed_fraud", "Card blocked")
+    assert not repo.update_status("FRAUD_404", "confirmed_fraud", "")
+
+    case = repo.get("FRAUD_002")
+    case.status = "confirmed_safe"
+    repo.save(case)
+    repo.close()
+
+    reopened = FraudCaseRepository(str(tmp_path / "fraud_cases.db"))
+    assert reopened.get("FRAUD_001").outcome_note == "Card blocked"
+    assert reopened.find_by_username("sarah smith").status == "confirmed_safe"
+    assert len(reopened) == len(MOCK_FRAUD_CASES)
+
+
+def test_returned_cases_are_copies(tmp_path) -> None:
+    repo = _repo(tmp_path)
+    case = repo.get("FRAUD_001")
+    case.status = "edited_but_not_saved"
+    assert repo.get("FRAUD_001").status == "pending_review"
@@ -0,0 +1,110 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from Day6.agent_grocery import GroceryAgent, UserContext
+from Day6.grocery_database import PRODUCT_INDEX, current_catalog
+from Day6.grocery_order import CartChange, CartState, OrderState
+
+
+def _cart(**quantities) -> CartState:
+    cart = CartState()
+    for item_id, quantity in quantities.items():
+        product = PRODUCT_INDEX.get(item_id)
+        cart.add_item(product.id, product.name, quantity, product.price, product.brand, product.size, product.category)
+    return cart
+
+
+def test_apply_changes_in_order() -> None:
+    cart = _cart(s001=1, g003=2)
+    applied = cart.apply_changes([
+        CartChange(action="add", item_id="g004", quantity=2),
+        CartChange(action="add", item_id="g001"),
+        CartChange(action="remove", item_id="s001"),
+        CartChange(action="set", item_id="g003", quantity=6),
+        CartChange(action="add", item_id="g004"),
+    ], PRODUCT_INDEX.get)
+
+    assert applied == ["+2x Milk", "+1x Whole Wheat Bread", "removed Potato Chips", "Eggs set to 6", "+1x Milk"]
+    assert {item_id: item.quantity for item_id, item in cart.items.items()} == {"g003": 6, "g004": 3, "g001": 1}
+
+
+def test_invalid_batch_changes_nothing() -> None:
+    cart = _cart(g003=2)
+    with pytest.raises(ValueError) as error:
+        cart.apply_changes([
+            CartChange(action="add", item_id="g004"),
+            CartChange(action="add", item_id="zz99"),
+            CartChange(action="remove", item_id="s001"),
+            CartChange(action="add", item_id="g001", quantity=0),
+        ], PRODUCT_INDEX.get)
+
+    assert "Change 2" in str(error.value) and "Change 3" in str(error.value) and "Change 4" in str(error.value)
+    assert {item_id: item.quantity for item_id, item in cart.items.items()} == {"g003": 2}
+
+
+def test_remove_after_add_in_same_batch_and_set_zero() -> None:
+    cart = _cart(g005=1)
+    cart.apply_changes([
+        CartChange(action="add", item_id="g007"),
+        CartChange(action="remove", item_id="g007"),
+        CartChange(action="set", item_id="g005", quantity=0),
+    ], PRODUCT_INDEX.get)
+    assert cart.is_empty()
+
+
+async def test_apply_cart_changes_tool_summary() -> None:
+    userdata = UserContext(store_name=current_catalog().store_name, catalog_info="", cart=_cart(s001=1), order_state=OrderState())
+    agent = GroceryAgent(userdata=userdata)
+    ctx = SimpleNamespace(userdata=userdata)
+
+    result = await agent.apply_cart_changes(ctx, [
+        CartChange(action="add", item_id="g004", quantity=2),
+        CartChange(action="remove", item_id="s001"),
+    ])
+    assert result == "✅ Cart updated: +2x Milk, removed Potato Chips\nCart total: $6.98 (2 items)"
+
+    result = await agent.apply_cart_changes(ctx, [CartChange(action="remove", item_id="s001")])
+    assert result.startswith("❌ No changes made. Change 1")
+
+
+def test_running_totals_match_a_full_recount() -> None:
+    rng = random.Random(7)
+    products = list(current_catalog().products)
+    cart = CartState()
+    for _ in range(2_000):
+        product = rng.choice(products)
+        op = rng.random()
+        if op < 0.5:
+            cart.add_item(product.id, product.name, rng.randint(1, 5), product.price,
+                          product.brand, product.size, product.category)
+        elif op < 0.7:
+            cart.remove_item(product.id)
+        elif op < 0.9:
+            cart.update_quantity(product.id, rng.randint(0, 9))
+        else:
+            cart.apply_changes([CartChange(action="set", item_id=product.id, quantity=rng.randint(0, 3))],
+                               PRODUCT_INDEX.get)
+
+        items = cart.get_all_items()
+        assert cart.get_total() == round(sum(i.price * i.quantity for i in items), 2)
+        assert cart.get_item_count() == sum(i.quantity for i in items)
+        for category in ("groceries", "snacks", "prepared_food"):
+            assert cart.get_items_by_category(category.upper()) == [i for i in items if i.category == category]
+
+    cart.clear()
+    assert (cart.get_total(), cart.get_item_count(), cart.get_items_by_category("snacks")) == (0, 0, [])
+
+
+def test_summary_is_cached_until_the_cart_changes() -> None:
+    cart = _cart(g001=1)
+    summary = cart.get_summary()
+    assert cart.get_summary() is summary
+
+    cart.update_quantity("g001", 3)
+    updated = cart.get_summary()
+    assert updated is not summary and "3x Whole Wheat Bread" in updated and "Items: 3" in updated
+
+    cart.remove_item("g001")
+    assert cart.get_summary() == "Your cart is empty."
@@ -0,0 +1,59 @@
+from Day6 import grocery_database
+from Day6.catalog_index import RecipeIndex, parse_servings
+from Day6.grocery_database import (
+    RECIPE_CATALOG, ProductItem, add_product, find_recipe, recipe_ingredients,
+    remove_product, resolve_recipe_request
+)
+
+
+def test_find_recipe_by_name_and_keywords() -> None:
+    assert find_recipe("pasta").name == "pasta"
+    assert find_recipe("Spaghetti").name == "pasta"
+    assert find_recipe("pasta for two").name == "pasta for two"
+    assert find_recipe("PB&J").name == "peanut butter sandwich"
+    assert find_recipe("I need ingredients for grilled cheese please").name == "cheese sandwich"
+    assert find_recipe("peanut").name == "peanut butter sandwich"
+    assert find_recipe("") is None
+    assert find_recipe("sushi") is None
+
+
+def test_parse_servings() -> None:
+    assert parse_servings("pasta for four") == ("pasta", 4)
+    assert parse_servings("Breakfast for 3 people") == ("breakfast", 3)
+    assert parse_servings("pasta") == ("pasta", None)
+    assert parse_servings("pasta for 0") == ("pasta", None)
+
+
+def test_servings_scale_quantities() -> None:
+    recipe, servings = resolve_recipe_request("pasta for four")
+    assert (recipe.name, servings) == ("pasta", 4)
+    assert [(p.id, q) for p, q in recipe_ingredients(recipe, servings)] == [(i, 2) for i in recipe.item_ids]
+
+    # One set of ingredients when no head count is given, rounded up otherwise
+    assert {q for _, q in recipe_ingredients(recipe)} == {1}
+    assert {q for _, q in recipe_ingredients(recipe, 3)} == {2}
+
+    recipe, servings = resolve_recipe_request("pasta for four", servings=6)
+    assert servings == 6
+
+
+def test_ingredients_resolved_up_front() -> None:
+    index = RecipeIndex(RECIPE_CATALOG, lambda item_id: None)
+    assert index.ingredients(find_recipe("pasta")) == ()
+
+    products = [p for p, _ in recipe_ingredients(find_recipe("breakfast"))]
+    assert [p.id for p in products] == find_recipe("breakfast").item_ids
+
+
+def test_index_follows_catalog_updates() -> None:
+    fresh = ProductItem(id="g001", name="Sourdough Bread", category="groceries", price=4.5,
+                        brand="Baker's Best", size="1 loaf", tags=["bread"], keywords=["bread"])
+    try:
+        add_product(fresh)
+        names = [p.name for p, _ in recipe_ingredients(find_recipe("toast"))]
+        assert "Sourdough Bread" in names
+
+        remove_product("g001")
+        assert "g001" not in [p.id for p, _ in recipe_ingredients(find_recipe("toast"))]
+    finally:
+        grocery_database.catalog_loader.load()
@@ -0,0 +1,80 @@
+from Day6.catalog_index import ProductSearchIndex
+from Day6 import grocery_database
+from Day6.grocery_database import PRODUCT_CATALOG, ProductItem, current_catalog, search_products
+
+
+def _linear_search(query: str) -> list:
+    q = query.lower()
+    return [
+        p for p in PRODUCT_CATALOG
+        if q in p.name.lower() or q in p.brand.lower() or q in p.category.lower()
+        or any(q in t.lower() for t in p.tags) or any(q in k.lower() for k in p.keywords)
+    ]
+
+
+def test_index_matches_substring_scan() -> None:
+    """The index returns the same result set as the old linear scan."""
+    queries = ["", "b", "br", "bread", "BREAD", "pizza", "vegan", "snacks", "fresh",
+               "peanut butter", "sauce", "butter", "x", "chocolate chip", "nope"]
+    for product in PRODUCT_CATALOG:
+        queries += [product.name, product.brand, product.name[1:5]]
+
+    for query in queries:
+        expected = {p.id for p in _linear_search(query)}
+        assert {p.id for p in search_products(query)} == expected, query
+
+
+def test_results_are_ranked() -> None:
+    results = search_products("butter")
+    assert results[0].name == "Butter"
+    assert results[1].name == "Peanut Butter"
+
+
+def test_incremental_updates() -> None:
+    index = ProductSearchIndex(PRODUCT_CATALOG)
+    oat = ProductItem(id="g999", name="Oat Milk", category="groceries", price=4.0,
+                      brand="Plant Co", size="1 liter", tags=["vegan"], keywords=["oat milk"])
+
+    index.add(oat)
+    assert oat in index.search("oat")
+
+    index.remove("g999")
+    assert index.search("oat milk") == []
+    assert {p.id for p in index.search("milk")} == {p.id for p in _linear_search("milk")}
+
+
+def test_copy_leaves_the_original_untouched() -> None:
+    index = ProductSearchIndex(PRODUCT_CATALOG)
+    before = {p.id for p in index.search("bread")}
+    oat = ProductItem(id="g999", name="Oat Bread", category="groceries", price=4.0,
+                      brand="Plant Co", size="1 loaf", tags=[], keywords=[])
+
+    edited = index.copy()
+    edited.add(oat)
+    edited.remove("g001")
+    assert {p.id for p in edited.search("bread")} == before - {"g001"} | {"g999"}
+    assert {p.id for p in index.search("bread")} == before
+
+    # Editing the original afterwards doesn't leak into the copy either
+    index.remove("g002")
+    assert "g002" in {p.id for p in edited.search("bread")}
+
+
+def test_catalog_edit_does_not_rebuild_the_index(monkeypatch) -> None:
+    builds, adds = [], []
+    original_init, original_add = ProductSearchIndex.__init__, ProductSearchIndex.add
+    monkeypatch.setattr(ProductSearchIndex, "__init__",
+                        lambda self, products=(): builds.append(1) or original_init(self, products))
+    monkeypatch.setattr(ProductSearchIndex, "add",
+                        lambda self, product: adds.append(product.id) or original_add(self, product))
+    oat = ProductItem(id="g999", name="Oat Milk", category="groceries", price=4.0,
+                      brand="Plant Co", size="1 liter", tags=["vegan"], keywords=["oat milk"])
+    try:
+        current_catalog()
+        grocery_database.add_product(oat)
+        grocery_database.remove_product("g999")
+        assert builds == [] and adds == ["g999"]
+        assert search_products("oat milk") == []
+    finally:
+        monkeypatch.undo()
+        grocery_database.catalog_loader.load()
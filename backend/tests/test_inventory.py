@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from Day8 import inventory as inventory_module
+from Day8.inventory import InventoryService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _inventory(tmp_path, stock=5, **kwargs) -> InventoryService:
+    inventory = InventoryService(str(tmp_path / "inventory.db"), **kwargs)
+    inventory.seed([{"id": "mug-001", "stock": stock}])
+    return inventory
+
+
+def test_reserve_commit_release(tmp_path) -> None:
+    inventory = _inventory(tmp_path)
+    a = inventory.reserve("mug-001", 3, "alice")
+    assert inventory.available("mug-001") == 2
+    assert inventory.reserve("mug-001", 3, "bob") is None
+
+    assert inventory.commit(a.hold_id)
+    assert not inventory.commit(a.hold_id)
+    assert (inventory.on_hand("mug-001"), inventory.available("mug-001")) == (2, 2)
+
+    b = inventory.reserve("mug-001", 2, "bob")
+    assert inventory.release(b.hold_id) and not inventory.release(b.hold_id)
+    assert inventory.available("mug-001") == 2
+    assert inventory.available("unknown") == 0
+
+    # Re-seeding keeps the live count rather than resetting it
+    inventory.seed([{"id": "mug-001", "stock": 5}])
+    assert inventory.on_hand("mug-001") == 2
+    inventory.close()
+
+
+def test_holds_expire(tmp_path) -> None:
+    clock = FakeClock()
+    inventory = _inventory(tmp_path, hold_ttl=60, clock=clock)
+    hold = inventory.reserve("mug-001", 5, "alice")
+    assert inventory.available("mug-001") == 0
+
+    clock.now += 61
+    assert inventory.available("mug-001") == 5  # expired holds don't count, even before a sweep
+    assert not inventory.commit(hold.hold_id)
+    assert inventory.reserve("mug-001", 5, "bob") is not None
+
+    clock.now += 61
+    assert inventory.expire() == 1
+    assert inventory.holds() == []
+    inventory.close()
+
+
+def test_release_owner_on_hangup(tmp_path) -> None:
+    inventory = _inventory(tmp_path)
+    inventory.reserve("mug-001", 1, "alice")
+    inventory.reserve("mug-001", 2, "alice")
+    inventory.reserve("mug-001", 1, "bob")
+    assert inventory.release_owner("alice") == 2
+    assert [h.owner for h in inventory.holds()] == ["bob"]
+    assert inventory.available("mug-001") == 4
+    inventory.close()
+
+
+def test_concurrent_buyers_never_oversell(tmp_path) -> None:
+    # Separate service objects share the database like separate worker processes do
+    services = [_inventory(tmp_path, stock=50) for _ in range(4)]
+    sold = []
+
+    def buy(service, n):
+        for i in range(40):
+            hold = service.reserve("mug-001", 1 + (i % 2), f"{n}-{i}")
+            if hold is not None and service.commit(hold.hold_id):
+                sold.append(hold.quantity)
+
+    threads = [threading.Thread(target=buy, args=(service, n)) for n, service in enumerate(services)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(sold) <= 50
+    assert services[0].on_hand("mug-001") == 50 - sum(sold)
+    for service in services:
+        service.close()
+
+
+async def test_reserve_then_place_order(tmp_path, monkeypatch) -> None:
+    from Day8.ecommerce_agent import EcommerceAgent, EcommerceContext
+
+    monkeypatch.chdir(tmp_path)
+    inventory = _inventory(tmp_path, stock=2)
+    monkeypatch.setattr(inventory_module, "_inventory", inventory)
+
+    product = {"id": "mug-001", "name": "Mug", "price": 800}
+    userdata = EcommerceContext(catalog=[product], current_browsing=[product])
+    other = EcommerceContext(catalog=[product], current_browsing=[product])
+    agent = EcommerceAgent(userdata=userdata)
+    args = SimpleNamespace(product_index=1, quantity=2, size="", color="")
+
+    assert (await agent.reserve_item(SimpleNamespace(userdata=userdata), args)).startswith("Reserved 2x Mug")
+    # Someone else can't buy the units on hold
+    assert await agent.place_order(SimpleNamespace(userdata=other), args) == "Sorry, Mug is out of stock."
+
+    result = await agent.place_order(SimpleNamespace(userdata=userdata), args)
+    assert "Order Confirmed" in result
+    assert inventory.on_hand("mug-001") == 0 and userdata.holds == {}
+    inventory.close()
+
+
+async def test_reservations_do_not_queue_behind_other_saves(tmp_path, monkeypatch) -> None:
+    from Day8.ecommerce_agent import EcommerceAgent, EcommerceContext
+    from common.persistence import persistence
+
+    inventory = _inventory(tmp_path, stock=2)
+    monkeypatch.setattr(inventory_module, "_inventory", inventory)
+    product = {"id": "mug-001", "name": "Mug", "price": 800}
+    userdata = EcommerceContext(catalog=[product], current_browsing=[product])
+    agent = EcommerceAgent(userdata=userdata)
+
+    # A slow save on the shared writer doesn't hold up the stock transaction
+    release = threading.Event()
+    stuck = persistence.submit(release.wait, 5)
+    try:
+        result = await asyncio.wait_for(
+            agent.reserve_item(SimpleNamespace(userdata=userdata),
+                               SimpleNamespace(product_index=1, quantity=1, size="", color="")), 2)
+        assert result.startswith("Reserved 1x Mug")
+    finally:
+        release.set()
+        stuck.result()
+    inventory.close()
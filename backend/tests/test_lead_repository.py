@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from Day4.lead_repository import LeadRepository, normalize_email
+from Day4.nykaa_order import LeadData
+
+
+def _lead(email: str, **fields) -> LeadData:
+    defaults = dict(name="Asha", use_case="Professional makeup kit", timeline="now", call_summary="Chat")
+    defaults.update(fields)
+    return LeadData(email=email, **defaults)
+
+
+def test_normalize_email() -> None:
+    assert normalize_email("  Asha.R@Example.COM ") == "asha.r@example.com"
+    assert normalize_email("Asha.R+nykaa@example.com") == "asha.r+nykaa@example.com"
+    assert normalize_email("mailto:asha@example.com") == "asha@example.com"
+
+
+def test_upsert_dedups_by_email_and_keeps_known_fields(tmp_path) -> None:
+    repo = LeadRepository(str(tmp_path / "leads.db"))
+    first, created = repo.upsert(_lead("asha@example.com", company="Glow Studio", lead_id="L1"),
+                                 timestamp="2025-11-01T10:00:00")
+    assert created and first["calls"] == 1
+
+    second, created = repo.upsert(_lead(" ASHA@Example.com", timeline="Later", lead_id="L2"),
+                                  timestamp="2025-11-03T10:00:00")
+    assert not created
+    assert len(repo) == 1
+    assert second["lead_id"] == "L1"
+    assert second["company"] == "Glow Studio"
+    assert second["timeline"] == "later"
+    assert second["first_seen"] == "2025-11-01T10:00:00"
+    assert second["calls"] == 2
+    assert repo.get_by_email("asha@example.com") == second
+
+    # A +tag address is a different mailbox as far as we know
+    _, created = repo.upsert(_lead("asha+promo@example.com", lead_id="L3"))
+    assert created and len(repo) == 2
+
+
+def test_leads_without_email_are_not_merged(tmp_path) -> None:
+    repo = LeadRepository(str(tmp_path / "leads.db"))
+    for n, email in enumerate(["", "   ", "Not Specified", "not specified"]):
+        _, created = repo.upsert(_lead(email, name=f"Caller {n}"))
+        assert created
+
+    assert len(repo) == 4
+    assert sorted(lead["name"] for lead in repo.query()) == [f"Caller {n}" for n in range(4)]
+    assert repo.get_by_email("Not Specified") is None
+
+
+def test_queries_by_timeline_score_and_time(tmp_path) -> None:
+    repo = LeadRepository(str(tmp_path / "leads.db"))
+    repo.upsert(_lead("hot@x.com"), timestamp="2025-11-10T09:00:00")
+    repo.upsert(_lead("old@x.com"), timestamp="2025-10-01T09:00:00")
+    repo.upsert(_lead("cold@x.com", timeline="exploring", use_case="just browsing"),
+                timestamp="2025-11-10T08:00:00")
+
+    assert [lead["email"] for lead in repo.query(timeline="NOW")] == ["hot@x.com", "old@x.com"]
+    hot = repo.hot_leads(now=datetime(2025, 11, 12))
+    assert [lead["email"] for lead in hot] == ["hot@x.com"]
+    assert repo.last()["email"] == "hot@x.com"
+
+
+def test_json_import_merges_duplicates(tmp_path) -> None:
+    records = [
+        {"lead_id": "A", "timestamp": "2025-11-02T00:00:00", "name": "Asha", "email": "a@x.com",
+         "use_case": "gifting", "timeline": "soon", "call_summary": "second"},
+        {"lead_id": "B", "timestamp": "2025-11-01T00:00:00", "name": "Asha", "email": "A@x.com",
+         "use_case": "gifting", "timeline": "later", "call_summary": "first"},
+    ]
+    repo = LeadRepository(str(tmp_path / "leads.db"))
+    assert repo.import_records(records) == 1
+    lead = repo.get_by_email("a@x.com")
+    assert (lead["lead_id"], lead["call_summary"], lead["calls"]) == ("B", "second", 2)
+    assert len(repo) == 1 and lead["timeline"] == "soon"
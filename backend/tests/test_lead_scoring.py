@@ -0,0 +1,48 @@
+import json
+import random
+
+from Day4.nykaa_order import LeadColumns, LeadData, LeadQualification
+
+WORDS = [
+    "salon", "Beautician", "makeup artist", "makeup\nartist", "PROFESSIONAL", "wholesale",
+    "resell", "reseller", "business", "restore", "store", "personal", "myself", "shopping",
+    "own use", "ownuse", "gifting", "corporate", "diwali", "hampers", "\n", " ", "-",
+]
+TIMELINES = ["now", "NOW", "soon", "later", "next month", ""]
+TEAM_SIZES = ["Not Specified", "1", "5-10", "50", "50+"]
+COMPANIES = ["Not Specified", "Self-Employed", "freelance", "FREELANCE", "Glow Studio", "Tech Flow"]
+
+
+def _random_records(rng: random.Random, n: int):
+    for i in range(n):
+        yield {
+            "lead_id": f"lead-{i}",
+            "name": "Test",
+            "email": f"t{i}@example.com",
+            "company": rng.choice(COMPANIES),
+            "use_case": "".join(rng.choice(WORDS) for _ in range(rng.randint(0, 5))),
+            "team_size": rng.choice(TEAM_SIZES),
+            "timeline": rng.choice(TIMELINES),
+            "call_summary": "",
+        }
+
+
+def test_batch_scores_match_per_lead_scorer() -> None:
+    records = list(_random_records(random.Random(7), 5000))
+    expected = [LeadQualification.score_lead(LeadData(**r)) for r in records]
+    assert LeadQualification.score_leads(LeadColumns.from_records(records)) == expected
+
+
+def test_from_json_applies_lead_defaults(tmp_path) -> None:
+    path = tmp_path / "nykaa_leads.json"
+    path.write_text(json.dumps([
+        {"lead_id": "a", "name": "A", "email": "a@x.in", "use_case": "salon supplies",
+         "timeline": "now", "call_summary": ""},
+        {"lead_id": "b", "name": "B", "email": "b@x.in", "use_case": "for myself",
+         "timeline": "later", "company": "Self-Employed", "team_size": "1", "call_summary": ""},
+    ]))
+
+    columns = LeadColumns.from_json(str(path))
+    assert len(columns) == 2
+    assert columns.company == ["Not Specified", "Self-Employed"]
+    assert LeadQualification.score_leads(columns) == [20, 8]
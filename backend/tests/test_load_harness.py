@@ -0,0 +1,25 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from load_test import SCENARIOS, run_scenario
+
+
+@pytest.mark.asyncio
+async def test_scripted_sessions_run_real_tools(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    report = await run_scenario(SCENARIOS["day1"], sessions=3, llm_delay=0.0)
+
+    assert report["failed"] == 0
+    calls = {name: len(values) for name, (values, errors) in report["tools"].items()}
+    assert calls == {
+        "order_drink_tool": 3,
+        "order_drinks_tool": 3,
+        "confirm_order_tool": 3,
+        "finalize_order_tool": 3,
+    }
+    assert report["store_jobs"] == 3
+    assert (tmp_path / "coffee_orders.jsonl").read_text().count("\n") == 3
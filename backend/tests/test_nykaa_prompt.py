@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from Day4.Nykaa_sdr import FAQ_CONTEXT, PROMPT_MODE, build_instructions, new_userdata
+from Day4.nykaa_database import FAQ_DATA
+
+
+def test_rag_prompt_carries_topics_not_answers() -> None:
+    rag = build_instructions(new_userdata("rag"))
+    full = build_instructions(new_userdata("full"))
+
+    assert FAQ_CONTEXT.strip() in full
+    for faq in FAQ_DATA:
+        assert faq.question in rag
+        assert faq.answer not in rag
+    assert "search_faq" in rag
+    assert len(rag) < len(full) * 0.6
+
+
+def test_unknown_mode_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        new_userdata("summary")
+
+
+def test_rag_prompt_keeps_company_facts() -> None:
+    # Answerable straight from the prompt, without a search_faq round trip
+    rag = build_instructions(new_userdata("rag"))
+    for fact in ("Falguni Nayar", "2012", "2400+ brands", "100+ stores", "NSE/BSE", "Nykaa PRO"):
+        assert fact in rag
+
+
+def test_full_prompt_is_the_default() -> None:
+    assert PROMPT_MODE == "full" or os.getenv("NYKAA_PROMPT_MODE")
+    assert new_userdata().prompt_version == PROMPT_MODE
@@ -0,0 +1,68 @@
+import multiprocessing as mp
+
+import pytest
+
+from common.order_ids import (
+    ID_LENGTH, MAX_SEQUENCE, ORDER_ID_EPOCH_MS, OrderIdGenerator, decode_order_id, order_ids
+)
+from Day6.grocery_order import OrderData
+
+
+class FakeClock:
+    def __init__(self, ms: int):
+        self.ms = ms
+
+    def __call__(self) -> float:
+        return self.ms / 1000
+
+
+def test_ids_sort_in_creation_order() -> None:
+    gen = OrderIdGenerator(worker_id=7)
+    ids = [gen.next_id() for _ in range(20_000)]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+    assert all(i.startswith("ORD-") and len(i) == 4 + ID_LENGTH for i in ids)
+
+
+def test_decode_round_trip() -> None:
+    clock = FakeClock(ORDER_ID_EPOCH_MS + 123_456)
+    gen = OrderIdGenerator(worker_id=1023, clock=clock)
+    assert decode_order_id(gen.next_id("ORD")) == (ORDER_ID_EPOCH_MS + 123_456, 1023, 0)
+    assert decode_order_id(gen.next_id())[2] == 1
+
+
+def test_sequence_overflow_and_clock_skew() -> None:
+    clock = FakeClock(ORDER_ID_EPOCH_MS + 10_000)
+    gen = OrderIdGenerator(worker_id=3, clock=clock)
+    ids = [gen.next_int() for _ in range(MAX_SEQUENCE + 10)]
+    clock.ms -= 5_000  # clock steps back
+    ids += [gen.next_int() for _ in range(10)]
+    assert all(a < b for a, b in zip(ids, ids[1:]))
+
+
+def test_worker_id_bounds() -> None:
+    with pytest.raises(ValueError):
+        OrderIdGenerator(worker_id=1024)
+
+
+def _claim(barrier, results) -> None:
+    results.put(order_ids.worker_id)
+    barrier.wait()  # stay alive (holding the id) until every process has claimed one
+
+
+def test_live_processes_claim_distinct_worker_ids() -> None:
+    ctx = mp.get_context("spawn")
+    barrier, results = ctx.Barrier(4), ctx.Queue()
+    procs = [ctx.Process(target=_claim, args=(barrier, results)) for _ in range(4)]
+    for proc in procs:
+        proc.start()
+    worker_ids = [results.get(timeout=60) for _ in procs]
+    for proc in procs:
+        proc.join(timeout=60)
+    assert len(set(worker_ids)) == 4
+
+
+def test_orders_in_the_same_second_get_distinct_ids() -> None:
+    orders = [OrderData(customer_name="A", delivery_address="B", items=[], total_amount=0) for _ in range(100)]
+    assert len({o.order_id for o in orders}) == 100
+    assert all(o.order_id.startswith("ORD") for o in orders)
@@ -0,0 +1,78 @@
+import json
+import time
+
+from Day1.order_journal import OrderJournal
+
+
+def _journal(tmp_path, **kwargs) -> OrderJournal:
+    return OrderJournal(
+        snapshot_path=str(tmp_path / "coffee_orders.json"),
+        journal_path=str(tmp_path / "coffee_orders.jsonl"),
+        **kwargs,
+    )
+
+
+def test_append_reads_back_after_legacy_snapshot(tmp_path) -> None:
+    """Orders in an existing list-of-dicts file come before journaled ones."""
+    legacy = [{"timestamp": "2025-01-01T00:00:00", "total_items": 0, "items": []}]
+    (tmp_path / "coffee_orders.json").write_text(json.dumps(legacy, indent=4))
+
+    journal = _journal(tmp_path)
+    journal.append({"timestamp": "2025-01-02T00:00:00", "total_items": 1, "items": []})
+    journal.close()
+
+    history = journal.load_all()
+    assert [e["timestamp"][:10] for e in history] == ["2025-01-01", "2025-01-02"]
+
+
+def test_compact_writes_snapshot_and_truncates_journal(tmp_path) -> None:
+    journal = _journal(tmp_path, fsync_every=1000, fsync_interval=1000)
+    for i in range(5):
+        journal.append({"timestamp": str(i), "total_items": i, "items": []})
+
+    assert journal.compact() == 5
+    assert (tmp_path / "coffee_orders.jsonl").read_text() == ""
+
+    snapshot = json.loads((tmp_path / "coffee_orders.json").read_text())
+    assert [e["total_items"] for e in snapshot] == [0, 1, 2, 3, 4]
+
+    # Appends after compaction keep going to the (now empty) journal
+    journal.append({"timestamp": "5", "total_items": 5, "items": []})
+    journal.close()
+    assert len(journal.load_all()) == 6
+
+
+def test_torn_last_line_is_skipped(tmp_path) -> None:
+    journal = _journal(tmp_path)
+    journal.append({"timestamp": "ok", "total_items": 0, "items": []})
+    journal.close()
+    with open(tmp_path / "coffee_orders.jsonl", "a") as f:
+        f.write('{"timestamp": "torn"')
+
+    assert [e["timestamp"] for e in journal.load_all()] == ["ok"]
+
+
+def test_crash_between_snapshot_and_truncate_leaves_no_duplicates(tmp_path) -> None:
+    journal = _journal(tmp_path)
+    for i in range(3):
+        journal.append({"timestamp": str(i), "total_items": i, "items": []})
+    journal.close()
+
+    # Snapshot swapped in, journal never truncated
+    (tmp_path / "coffee_orders.json").write_text(json.dumps(journal.load_all(), indent=4))
+    assert [e["total_items"] for e in journal.load_all()] == [0, 1, 2]
+
+    journal.append({"timestamp": "3", "total_items": 3, "items": []})
+    assert journal.compact() == 4
+    assert [e["total_items"] for e in journal.load_all()] == [0, 1, 2, 3]
+    journal.close()
+
+
+def test_quiet_period_still_syncs(tmp_path) -> None:
+    journal = _journal(tmp_path, fsync_every=1000, fsync_interval=0.05)
+    journal.append({"timestamp": "0", "total_items": 0, "items": []})
+    assert journal._pending == 1
+
+    time.sleep(0.2)
+    assert journal._pending == 0 and journal._timer is None
+    journal.close()
@@ -0,0 +1,100 @@
+import json
+
+from common.order_ids import OrderIdGenerator
+from Day6.order_store import OrderStore, shard_date
+
+
+def _store(tmp_path, **kwargs) -> OrderStore:
+    return OrderStore(root=str(tmp_path / "orders"), **kwargs)
+
+
+def _orders(count: int, customers=("Asha Rao", "Ben Li")):
+    ids = OrderIdGenerator(worker_id=1)
+    return [
+        {"order_id": ids.next_id("ORD"), "customer_name": customers[i % len(customers)],
+         "items": [], "total_amount": float(i)}
+        for i in range(count)
+    ]
+
+
+def test_lookup_by_id_and_customer(tmp_path) -> None:
+    store = _store(tmp_path)
+    orders = _orders(30)
+    for order in orders:
+        store.append(order)
+
+    assert store.get(orders[7]["order_id"]) == orders[7]
+    assert store.get("ORD0000000000000") is None
+    assert store.get("not-an-id") is None
+
+    asha = store.by_customer("  asha   RAO ", limit=5)
+    assert [o["total_amount"] for o in asha] == [28.0, 26.0, 24.0, 22.0, 20.0]
+    assert store.by_customer("nobody") == []
+    store.close()
+
+
+def test_history_pages_newest_first(tmp_path) -> None:
+    store = _store(tmp_path)
+    orders = _orders(45)
+    for order in orders:
+        store.append(order)
+
+    seen, before = [], None
+    while True:
+        page = store.history(limit=20, before=before)
+        if not page:
+            break
+        seen += page
+        before = page[-1]["order_id"]
+    assert [o["order_id"] for o in seen] == [o["order_id"] for o in reversed(orders)]
+    store.close()
+
+
+def test_shards_by_day_and_bucket(tmp_path) -> None:
+    store = _store(tmp_path)
+    orders = _orders(40)
+    for order in orders:
+        store.append(order)
+    store.close()
+
+    day = tmp_path / "orders" / shard_date(orders[0]["order_id"])
+    logs = sorted(day.glob("*.jsonl"))
+    assert len(logs) > 1
+    lines = [json.loads(line) for log in logs for line in log.read_text().splitlines()]
+    assert sorted(o["order_id"] for o in lines) == sorted(o["order_id"] for o in orders)
+
+
+def test_torn_index_line_is_skipped(tmp_path) -> None:
+    store = _store(tmp_path)
+    order = _orders(1)[0]
+    store.append(order)
+    store.close()
+
+    index = next((tmp_path / "orders" / shard_date(order["order_id"])).glob("*.idx"))
+    with open(index, "a") as f:
+        f.write("ORD-torn\t12")
+
+    assert store.history() == [order]
+    assert store.get(order["order_id"]) == order
+
+
+def test_customer_pages_stop_at_the_newest_days(tmp_path) -> None:
+    store = _store(tmp_path)
+    days = [1_790_000_000.0 + 86_400 * n for n in range(3)]
+    orders = []
+    for n, day in enumerate(days):
+        ids = OrderIdGenerator(worker_id=1, clock=lambda day=day: day)
+        for i in range(4):
+            order = {"order_id": ids.next_id("ORD"), "customer_name": "Asha Rao", "items": [],
+                     "total_amount": float(n * 10 + i)}
+            orders.append(store.append(order))
+    store.close()
+
+    assert [o["total_amount"] for o in store.by_customer("asha rao", limit=6)] == [23.0, 22.0, 21.0, 20.0, 13.0, 12.0]
+
+    # A page inside the newest two days never opens the oldest day's index
+    oldest = tmp_path / "orders" / shard_date(orders[0]["order_id"]) / "customers"
+    for index in oldest.glob("*.idx"):
+        index.unlink()
+    assert len(store.by_customer("Asha Rao", limit=8)) == 8
+    assert len(store.by_customer("Asha Rao", limit=20)) == 8
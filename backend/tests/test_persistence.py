@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from common.persistence import PersistenceService
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_in_order_off_the_loop() -> None:
+    service = PersistenceService()
+    loop_thread = threading.get_ident()
+    seen = []
+
+    def write(i: int) -> int:
+        assert threading.get_ident() != loop_thread
+        seen.append(i)
+        return i * 2
+
+    results = await asyncio.gather(*(service.run(write, i) for i in range(20)))
+    assert results == [i * 2 for i in range(20)]
+    assert seen == list(range(20))
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_write_does_not_block_event_loop() -> None:
+    service = PersistenceService()
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await service.run(time.sleep, 0.2)
+    task.cancel()
+    service.close()
+
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_the_caller() -> None:
+    service = PersistenceService()
+
+    def broken() -> None:
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        await service.run(broken)
+
+    # The writer keeps going after a failed job
+    assert await service.run(lambda: "ok") == "ok"
+    service.close()
+
+
+def test_close_drains_queue() -> None:
+    service = PersistenceService()
+    done = []
+    for i in range(5):
+        service.submit(lambda i=i: (time.sleep(0.01), done.append(i)))
+    service.close()
+    assert done == [0, 1, 2, 3, 4]
+    with pytest.raises(RuntimeError):
+        service.submit(print)
@@ -0,0 +1,70 @@
+import hashlib
+
+from common.prompt_cache import PromptCache, content_version
+from Day1 import database
+from Day1.database import MenuIndex, MenuItem, items_in_category, set_menu
+
+
+def test_renders_once_per_version() -> None:
+    cache = PromptCache()
+    calls = []
+
+    def build() -> str:
+        calls.append(1)
+        return "menu v1"
+
+    first = cache.render("menu", 1, build)
+    second = cache.render("menu", 1, build)
+
+    assert first is second
+    assert len(calls) == 1
+    assert first.sha256 == hashlib.sha256(b"menu v1").hexdigest()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_version_change_rerenders() -> None:
+    cache = PromptCache()
+    old = cache.render("menu", 1, lambda: "espresso")
+    new = cache.render("menu", 2, lambda: "espresso, latte")
+
+    assert new.text == "espresso, latte"
+    assert new.sha256 != old.sha256
+    assert cache.hashes() == {"menu": (2, new.sha256)}
+
+    cache.invalidate("menu")
+    assert cache.get("menu") is None
+
+
+def test_menu_categories_follow_menu_version() -> None:
+    original = list(database.raw_data)
+    try:
+        drinks = items_in_category("drink")
+        assert items_in_category("drink") is drinks
+
+        version = set_menu([MenuItem("tea", "Tea", "drink")])
+        assert version == database.MENU_VERSION
+        assert [i.id for i in items_in_category("drink")] == ["tea"]
+    finally:
+        set_menu(original)
+
+
+async def test_barista_prompt_follows_the_session_menu() -> None:
+    from Day1.agent_barista import CoffeeShopAgent, new_userdata
+
+    userdata = await new_userdata()
+    default = CoffeeShopAgent(userdata=userdata)
+    userdata.menu = MenuIndex([MenuItem("tea", "Tea", "drink")], version=-1)
+    custom = CoffeeShopAgent(userdata=userdata)
+
+    assert custom.prompt_hash != default.prompt_hash
+    assert "Tea (tea)" in custom.instructions and "Latte" not in custom.instructions
+
+
+def test_prompt_versions_are_short() -> None:
+    from Day4.Nykaa_sdr import UserContext, new_userdata
+
+    assert new_userdata("rag").prompt_version == "rag"
+    custom = UserContext(company_context="x" * 10_000, faq_context="")
+    assert custom.prompt_version == content_version("x" * 10_000, "", "False")
+    assert len(custom.prompt_version) == 16
+    assert content_version("ab", "c") != content_version("a", "bc")
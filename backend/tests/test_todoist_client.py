@@ -0,0 +1,117 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+from aiohttp import web
+
+from Day2.todoist_client import TodoistClientPool
+
+LATENCY = 0.2
+
+
+async def _start_stub(fail_first: int = 0, status: int = 503):
+    """Local stand-in for the Todoist REST API: POST /api/v1/tasks."""
+    ids = itertools.count(1)
+    state = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+
+    async def add_task(request: web.Request) -> web.Response:
+        state["requests"] += 1
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            body = await request.json()
+            await asyncio.sleep(LATENCY)
+            if state["requests"] <= fail_first:
+                return web.json_response({"error": "try again"}, status=status)
+            task_id = str(next(ids))
+            return web.json_response({
+                "id": task_id, "content": body["content"], "description": "",
+                "project_id": "1", "section_id": None, "parent_id": None,
+                "labels": [], "priority": 1, "due": None, "deadline": None,
+                "duration": None, "is_collapsed": False, "child_order": 1,
+                "responsible_uid": None, "assigned_by_uid": None, "completed_at": None,
+                "added_by_uid": "1", "added_at": "2025-01-01T00:00:00Z",
+                "updated_at": "2025-01-01T00:00:00Z",
+            })
+        finally:
+            state["in_flight"] -= 1
+
+    app = web.Application()
+    app.router.add_post("/api/v1/tasks", add_task)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", state
+
+
+@pytest.mark.asyncio
+async def test_batch_costs_about_one_round_trip() -> None:
+    runner, url, state = await _start_stub()
+    pool = TodoistClientPool(api_url=url)
+    try:
+        start = time.perf_counter()
+        results = await pool.add_tasks("token", ["Drink water", "Walk", "Stretch"])
+        elapsed = time.perf_counter() - start
+
+        assert [t.content for t in results] == ["Drink water", "Walk", "Stretch"]
+        assert elapsed < 2 * LATENCY
+        assert pool.client("token") is pool.client("token")
+    finally:
+        await pool.aclose()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded() -> None:
+    runner, url, state = await _start_stub()
+    pool = TodoistClientPool(api_url=url, max_concurrency=2)
+    try:
+        await pool.add_tasks("token", [f"task {i}" for i in range(6)])
+        assert state["max_in_flight"] == 2
+    finally:
+        await pool.aclose()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_retries_server_errors() -> None:
+    runner, url, state = await _start_stub(fail_first=1)
+    pool = TodoistClientPool(api_url=url, backoff_base=0.01)
+    try:
+        task = await pool.add_task("token", "Meditate")
+        assert task.content == "Meditate"
+        assert state["requests"] == 2
+    finally:
+        await pool.aclose()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried() -> None:
+    runner, url, state = await _start_stub(fail_first=10, status=401)
+    pool = TodoistClientPool(api_url=url, backoff_base=0.01)
+    try:
+        results = await pool.add_tasks("bad-token", ["Journal"])
+        assert isinstance(results[0], Exception)
+        assert state["requests"] == 1
+    finally:
+        await pool.aclose()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_api_url_is_read_from_env_on_first_use(monkeypatch) -> None:
+    runner, url, state = await _start_stub()
+    monkeypatch.delenv("TODOIST_API_URL", raising=False)
+    pool = TodoistClientPool()
+    # Set after the pool exists, like load_dotenv() running after the import
+    monkeypatch.setenv("TODOIST_API_URL", url)
+    try:
+        task = await pool.add_task("token", "Drink water")
+        assert task.content == "Drink water" and state["requests"] == 1
+    finally:
+        await pool.aclose()
+        await runner.cleanup()
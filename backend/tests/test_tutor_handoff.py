@@ -0,0 +1,62 @@
+import os
+import sys
+from pathlib import Path
+
+from livekit.agents import AgentSession, ChatContext
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+os.environ.setdefault("MURF_API_KEY", "test")  # Day3 builds its Murf voices at import
+
+from fake_providers import ScriptedLLM, Turn
+from Day3.agent_tutor import LearnAgent, RouterAgent, TutorSession
+from Day3.tutor_history import SharedHistory
+
+
+def test_history_keeps_a_window_and_summarizes_the_rest() -> None:
+    history = SharedHistory(window=3)
+    ctx = ChatContext.empty()
+    for i in range(5):
+        ctx.add_message(role="user", content=f"question {i}", created_at=float(i + 1))
+    ctx.add_message(role="system", content="instructions", created_at=10.0)
+
+    assert history.absorb(ctx) == 5
+    assert [m.text_content for m in history.messages] == ["question 2", "question 3", "question 4"]
+    assert history.summary == "user: question 0\nuser: question 1"
+    # Already-absorbed messages aren't taken twice
+    assert history.absorb(ctx) == 0
+    assert history.version == 1
+
+    handed_over = history.chat_ctx()
+    assert handed_over.items[0].role == "system"
+    assert handed_over.items[1:] == list(history.messages)
+
+
+async def test_switches_reuse_pooled_agents_with_bounded_context() -> None:
+    switches = [("learn", "loops"), ("quiz", "loops"), ("learn", "loops"), ("teach_back", "functions")]
+    turns = []
+    for mode, topic in switches:
+        turns.append(Turn(f"{mode} {topic} please", [("switch_mode_tool", {"mode": mode, "topic": topic})]))
+        turns.extend(Turn(f"{mode} {topic} chat {i}") for i in range(4))
+
+    tutor = TutorSession(history=SharedHistory(window=4))
+    fake_llm = ScriptedLLM(turns)
+    session = AgentSession(llm=fake_llm, userdata=tutor)
+    await session.start(RouterAgent())
+
+    learn_agent = None
+    for rounds in range(3):
+        for turn in turns:
+            await session.run(user_input=turn.user)
+            if learn_agent is None and isinstance(session.current_agent, LearnAgent):
+                learn_agent = session.current_agent
+
+    assert set(tutor.agents) == set(switches)
+    assert tutor.agents[("learn", "loops")] is learn_agent
+    assert len(tutor.history.messages) == 4
+    assert tutor.history.summary
+    # The active agent holds the handed-over window plus its own turns since,
+    # not the whole 60-turn session
+    assert len(session.current_agent.chat_ctx.items) < 20
+
+    await session.aclose()
+    await fake_llm.aclose()
@@ -0,0 +1,91 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import aiohttp
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fake_providers import FakeMurfServer
+from Day3.voice_pool import VoicePool
+
+HANDSHAKE = 0.2
+
+
+async def _speak(tts, text: str) -> None:
+    async with tts.stream() as stream:
+        stream.push_text(text)
+        stream.end_input()
+        async for _ in stream:
+            pass
+
+
+@pytest.fixture
+async def fake_murf():
+    server = FakeMurfServer(handshake_delay=HANDSHAKE)
+    base_url = await server.start()
+    async with aiohttp.ClientSession() as http:
+        yield server, dict(api_key="test", base_url=base_url, http_session=http)
+    await server.aclose()
+
+
+async def test_voices_are_built_lazily_and_warm_voices_skip_the_handshake(fake_murf) -> None:
+    server, options = fake_murf
+    pool = VoicePool({"matthew": "Matthew", "alicia": "Alicia", "ken": "Ken"}, **options)
+    assert pool.report() == {}
+
+    await _speak(pool.get("matthew"), "Hello there.")  # cold: pays the handshake
+    pool.warm("alicia")
+    await asyncio.sleep(HANDSHAKE * 2)
+    await _speak(pool.get("alicia"), "Question one.")
+    await _speak(pool.get("alicia"), "Question two.")
+
+    report = pool.report()
+    assert set(report) == {"matthew", "alicia"}
+    assert report["matthew"]["ttfa_p50_ms"] >= HANDSHAKE * 1000
+    assert report["alicia"]["ttfa_p95_ms"] < HANDSHAKE * 1000
+    assert (report["alicia"]["streams"], report["alicia"]["warmups"]) == (2, 1)
+    assert server.connections == 2  # one socket per voice, reused
+    await pool.aclose()
+
+
+async def test_idle_voices_close_their_sockets_and_reconnect(fake_murf) -> None:
+    server, options = fake_murf
+    pool = VoicePool({"ken": "Ken"}, idle_timeout=0.05, **options)
+    tts = pool.get("ken")
+    await _speak(tts, "I don't understand loops.")
+    assert server.open_connections == 1
+
+    # The background reaper closes the socket once the voice goes quiet
+    await asyncio.sleep(0.15)
+    assert server.open_connections == 0
+    assert await pool.close_idle() == []
+
+    await _speak(tts, "Aha, I get it now!")
+    assert server.connections == 2
+    assert pool.report()["ken"]["idle_closes"] == 1
+    await pool.aclose()
+
+
+async def test_synthesize_keeps_the_voice_busy(fake_murf) -> None:
+    server, options = fake_murf
+    server.audio_delay = 0.2
+    pool = VoicePool({"ken": "Ken"}, idle_timeout=0.01, **options)
+    voice = pool.get("ken")
+
+    stream = voice.synthesize("A whole answer at once.")
+    await asyncio.sleep(0.05)
+    # In flight: the reaper leaves it alone
+    assert pool.stats["ken"].active == 1
+    assert await pool.close_idle() == []
+
+    frame = await stream.collect()
+    assert frame.duration > 0 and server.requests == 1
+    assert pool.stats["ken"].idle_closes == 0
+
+    # Done: released, then reaped once idle
+    await asyncio.sleep(0.05)
+    assert pool.stats["ken"].active == 0
+    assert pool.stats["ken"].idle_closes == 1
+    await pool.aclose()
@@ -0,0 +1,90 @@
+import json
+import shutil
+import threading
+
+from Day2.wellness_store import WellnessStore
+
+
+def _store(tmp_path) -> WellnessStore:
+    return WellnessStore(
+        snapshot_path=str(tmp_path / "wellness_log.json"),
+        journal_path=str(tmp_path / "wellness_log.jsonl"),
+        aggregates_dir=str(tmp_path / "wellness_aggregates"),
+    )
+
+
+def _entry(day: int, mood: str, goals: int = 1) -> dict:
+    return {"timestamp": f"2025-11-{day:02d}T09:00:00", "mood": mood,
+            "goals": [f"goal {i}" for i in range(goals)], "summary": ""}
+
+
+def test_aggregates_bootstrap_from_legacy_log_and_update(tmp_path) -> None:
+    legacy = [_entry(1, "Feeling great"), _entry(1, "A bit tired", goals=2)]
+    (tmp_path / "wellness_log.json").write_text(json.dumps(legacy, indent=4))
+    store = _store(tmp_path)
+
+    store.append(_entry(2, "happy", goals=3))
+    days = dict(store.recent_days(7))
+    assert days["2025-11-01"] == {"checkins": 2, "positive": 1, "negative": 1, "goals": 3}
+    assert days["2025-11-02"] == {"checkins": 1, "positive": 1, "negative": 0, "goals": 3}
+
+
+def test_recent_days_returns_window(tmp_path) -> None:
+    store = _store(tmp_path)
+    for day in range(1, 21):
+        store.append(_entry(day, "good"))
+    window = store.recent_days(7)
+    assert [d for d, _ in window] == [f"2025-11-{d:02d}" for d in range(14, 21)]
+
+
+def test_tail_spans_journal_and_snapshot(tmp_path) -> None:
+    legacy = [_entry(1, "old a"), _entry(2, "old b")]
+    (tmp_path / "wellness_log.json").write_text(json.dumps(legacy))
+    store = _store(tmp_path)
+    for day in range(3, 6):
+        store.append(_entry(day, f"new {day}"))
+
+    assert [e["mood"] for e in store.tail(2)] == ["new 4", "new 5"]
+    assert [e["mood"] for e in store.tail(4)] == ["old b", "new 3", "new 4", "new 5"]
+    assert store.last()["mood"] == "new 5"
+
+
+def test_tail_reads_across_blocks(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("Day2.wellness_store.TAIL_BLOCK_SIZE", 64)
+    store = _store(tmp_path)
+    for i in range(50):
+        store.append({"timestamp": "2025-11-01T00:00:00", "mood": f"m{i}", "goals": [], "summary": "x" * 30})
+    assert [e["mood"] for e in store.tail(3)] == ["m47", "m48", "m49"]
+
+
+def test_checkin_rewrites_only_its_month(tmp_path) -> None:
+    store = _store(tmp_path)
+    store.append({"timestamp": "2025-10-31T09:00:00", "mood": "good", "goals": [], "summary": ""})
+    for day in range(1, 4):
+        store.append(_entry(day, "tired"))
+
+    months = tmp_path / "wellness_aggregates"
+    assert sorted(p.name for p in months.iterdir()) == ["2025-10.json", "2025-11.json"]
+    assert list(json.loads((months / "2025-10.json").read_text())) == ["2025-10-31"]
+
+    # A week that spans two months reads both month files
+    assert [d for d, _ in store.recent_days(4)] == ["2025-10-31", "2025-11-01", "2025-11-02", "2025-11-03"]
+
+
+def test_bootstrap_waits_for_other_writers(tmp_path) -> None:
+    writer, reader = _store(tmp_path), _store(tmp_path)
+    writer.append(_entry(1, "good"))
+    shutil.rmtree(tmp_path / "wellness_aggregates")
+
+    # A rebuild started while another worker holds the lock waits for it,
+    # so the check-in written under the lock is counted
+    result = []
+    with writer._aggregates_lock():
+        thread = threading.Thread(target=lambda: result.append(dict(reader.recent_days(7))))
+        thread.start()
+        thread.join(0.2)
+        assert thread.is_alive()
+        with open(writer.journal_path, "a") as f:
+            f.write(json.dumps(_entry(2, "sad")) + "\n")
+    thread.join()
+    assert sorted(result[0]) == ["2025-11-01", "2025-11-02"]